@@ -6,6 +6,7 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 from database import db
+from json_provider import init_json
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -43,6 +44,7 @@ app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hour
 
 # Initialize extensions
 db.init_app(app)
+init_json(app)  # orjson when installed (JSON_PROVIDER=stdlib to disable)
 CORS(app, resources={
     r"/*": {  # Allow CORS for all routes
         "origins": os.getenv('ALLOWED_ORIGINS', '*').split(','),
@@ -95,7 +97,15 @@ def load_user(user_id):
 
 # Import models and routes
 from models import Phrase, Alphabet, UserProgress, Dictionary, Resource, PDFResource, Video, Playlist, User
-from routes import phrases, alphabet, transliterator, dictionary, resources, auth
+from routes import phrases, alphabet, transliterator, dictionary, resources, auth, bulk_upload
+from search_fts import ensure_dictionary_fts
+from counters import counters
+from bulk_jobs import jobs
+
+# Buffered view/download counters (see counters.py)
+counters.init_app(app)
+# Worker pool for background bulk uploads (see bulk_jobs.py)
+jobs.init_app(app)
 
 # Register blueprints
 app.register_blueprint(phrases.bp)
@@ -104,6 +114,7 @@ app.register_blueprint(transliterator.bp)
 app.register_blueprint(dictionary.bp)  # V2: Dictionary system
 app.register_blueprint(resources.bp)   # V2: Resources, Videos, PDFs
 app.register_blueprint(auth.auth_bp)   # Authentication routes
+app.register_blueprint(bulk_upload.bp)  # CSV bulk upload
 
 # CSRF token injection for all responses
 @app.after_request
@@ -251,5 +262,6 @@ def create_default_admin():
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        ensure_dictionary_fts()
         initialize_data()
     app.run(debug=True)
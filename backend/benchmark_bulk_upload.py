@@ -0,0 +1,81 @@
+"""
+Benchmark dictionary CSV imports on a throwaway SQLite database
+
+Compares the old import loop (one ORM object per row, commit every 100
+rows) with the current chunked executemany path behind /api/bulk/dictionary.
+
+Usage: python benchmark_bulk_upload.py [rows]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+_db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'benchmark.db')}"
+
+from app import app
+from database import db
+from models import Dictionary
+from bulk_import import read_csv_chunks
+from routes.bulk_upload import upload_rows
+
+HEADER = 'nepali,romanized,english,part_of_speech,usage_example,category,difficulty\n'
+
+
+def make_csv(prefix):
+    return (HEADER + ''.join(
+        f'{prefix}शब्द{i},{prefix}shabda{i},word {i},noun,An example sentence for word {i}.,general,{i % 3 + 1}\n'
+        for i in range(ROWS)
+    )).encode('utf-8')
+
+
+def legacy_import(data):
+    """The previous upload_dictionary loop"""
+    import csv
+    stream = io.StringIO(data.decode('UTF8'), newline=None)
+    existing_words = {word.nepali.strip().lower() for word in Dictionary.query.all()}
+    added = 0
+    for row in csv.DictReader(stream):
+        nepali_word = row['nepali'].strip()
+        if nepali_word.lower() in existing_words:
+            continue
+        db.session.add(Dictionary(
+            nepali=nepali_word,
+            romanized=row['romanized'].strip(),
+            english=row['english'].strip(),
+            part_of_speech=row.get('part_of_speech', '').strip() or None,
+            usage_example=row.get('usage_example', '').strip() or None,
+            category=row.get('category', 'general').strip(),
+            difficulty=int(row.get('difficulty', 1)),
+        ))
+        existing_words.add(nepali_word.lower())
+        added += 1
+        if added % 100 == 0:
+            db.session.commit()
+    db.session.commit()
+    return added
+
+
+def main():
+    print(f"Importing {ROWS} dictionary rows into {_db_dir} ...")
+    with app.app_context():
+        db.create_all()
+
+        start = time.perf_counter()
+        added = legacy_import(make_csv('a'))
+        legacy = time.perf_counter() - start
+        print(f"{'ORM, commit per 100':<28} {added:>8} rows {legacy:>8.2f} s {added / legacy:>10.0f} rows/s")
+
+        start = time.perf_counter()
+        summary = upload_rows('dictionary', read_csv_chunks(io.BytesIO(make_csv('b'))))
+        current = time.perf_counter() - start
+        print(f"{'chunked executemany':<28} {summary['added']:>8} rows {current:>8.2f} s "
+              f"{summary['added'] / current:>10.0f} rows/s  ({legacy / current:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
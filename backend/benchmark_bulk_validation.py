@@ -0,0 +1,61 @@
+"""
+Benchmark /api/bulk/validate on a throwaway SQLite database
+
+Validates a dictionary CSV with the row checks run in the request
+process (1 worker) and spread over process pools of increasing size.
+The speedup is bounded by the cores available and by the duplicate
+checks, which stay in the request process.
+
+Usage: python benchmark_bulk_validation.py [rows] [max workers]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+MAX_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+_db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'benchmark.db')}"
+
+from app import app
+from database import db
+from bulk_import import read_csv_chunks
+from routes.bulk_upload import upload_rows, validate_rows
+
+HEADER = 'nepali,romanized,english,part_of_speech,usage_example,nepali_example,category,difficulty\n'
+
+
+def make_csv(rows, start=0):
+    return (HEADER + ''.join(
+        f'शब्द{i},,word {i},noun,An example sentence for word {i}.,शब्द{i} को उदाहरण वाक्य।,general,{i % 3 + 1}\n'
+        for i in range(start, start + rows)
+    )).encode('utf-8')
+
+
+def main():
+    print(f"Validating {ROWS} dictionary rows in {_db_dir} ({os.cpu_count()} CPUs) ...")
+    with app.app_context():
+        db.create_all()
+        # A tenth of the file already exists, so duplicate lookups find rows
+        upload_rows('dictionary', read_csv_chunks(io.BytesIO(make_csv(ROWS // 10))))
+        data = make_csv(ROWS)
+
+        baseline = None
+        workers = 1
+        while workers <= MAX_WORKERS:
+            # Warm-up run starts the pool, as the first request after startup would
+            validate_rows('dictionary', read_csv_chunks(io.BytesIO(data)), workers)
+            start = time.perf_counter()
+            report = validate_rows('dictionary', read_csv_chunks(io.BytesIO(data)), workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>3} worker(s) {report['total_rows']:>8} rows {elapsed:>8.2f} s "
+                  f"{report['total_rows'] / elapsed:>10.0f} rows/s  ({baseline / elapsed:.1f}x)")
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
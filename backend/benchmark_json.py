@@ -0,0 +1,133 @@
+"""
+Benchmark JSON serialization of the dictionary, phrases and videos lists
+
+Compares, on a throwaway SQLite database:
+  1. the old path: full ORM objects, hand-written dicts, stdlib json
+  2. the current path: projected rows, generated serializers, app.json
+  3. the list endpoints end to end with the stdlib and orjson providers
+
+Usage: python benchmark_json.py [rows] [repeats]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+PAGE_SIZE = 100
+
+_db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'benchmark.db')}"
+
+from app import app, limiter
+from database import db
+from models import Dictionary, Phrase, Video
+from json_provider import PROVIDERS, orjson
+from projection import project
+from routes.dictionary import LIST_COLUMNS as WORD_COLUMNS, serialize_list_word
+from routes.phrases import LIST_COLUMNS as PHRASE_COLUMNS, serialize_phrase
+from routes.resources import VIDEO_LIST_COLUMNS, serialize_list_video
+
+limiter.enabled = False
+
+
+def seed():
+    db.create_all()
+    db.session.add_all(Dictionary(
+        nepali=f'शब्द{i}', romanized=f'shabda{i}', english=f'word {i}', part_of_speech='noun',
+        usage_example='यो एउटा लामो उदाहरण वाक्य हो। ' * 20, difficulty=i % 3 + 1,
+        category='general', order_index=i
+    ) for i in range(ROWS))
+    db.session.add_all(Phrase(
+        nepali=f'वाक्यांश {i}', romanized=f'vakyansha {i}', english=f'phrase {i}',
+        category='greetings', context='travel', difficulty=i % 3 + 1
+    ) for i in range(ROWS))
+    db.session.add_all(Video(
+        title=f'Lesson {i}', youtube_id=f'yt{i:08d}', thumbnail_url='https://img.example/t.jpg',
+        duration=600, category='lessons', difficulty=1, order_index=i,
+        transcript='नमस्ते, आज हामी नेपाली सिक्छौं। ' * 400, notes='Notes ' * 200
+    ) for i in range(ROWS))
+    db.session.commit()
+
+
+def legacy_words():
+    return [{
+        'id': w.id, 'nepali': w.nepali, 'romanized': w.romanized, 'english': w.english,
+        'part_of_speech': w.part_of_speech, 'difficulty': w.difficulty, 'category': w.category,
+        'audio_url': w.audio_url, 'views': w.views
+    } for w in Dictionary.query.order_by(Dictionary.order_index).limit(PAGE_SIZE)]
+
+
+def legacy_phrases():
+    return [{
+        'id': p.id, 'nepali': p.nepali, 'romanized': p.romanized, 'english': p.english,
+        'category': p.category, 'audio_url': p.audio_url, 'context': p.context,
+        'formality_level': p.formality_level, 'difficulty': p.difficulty
+    } for p in Phrase.query.order_by(Phrase.id).limit(PAGE_SIZE)]
+
+
+def legacy_videos():
+    return [{
+        'id': v.id, 'title': v.title, 'youtube_id': v.youtube_id, 'thumbnail_url': v.thumbnail_url,
+        'duration': v.duration, 'category': v.category, 'difficulty': v.difficulty,
+        'view_count': v.view_count
+    } for v in Video.query.order_by(Video.order_index).limit(PAGE_SIZE)]
+
+
+def current(model, columns, serializer, order):
+    def build():
+        rows = project(model.query, model, columns).order_by(order).limit(PAGE_SIZE)
+        return [serializer(r) for r in rows]
+    return build
+
+
+def timed(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+        db.session.remove()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    print(f"Seeding {ROWS} rows per table in {_db_dir} ...")
+    with app.app_context():
+        seed()
+
+        print(f"\nBuild + serialize one {PAGE_SIZE}-row page (ms per page, {REPEATS} repeats)")
+        print(f"{'list':<10} {'old path':>10} {'current':>10} {'speedup':>8}")
+        fast = app.json if orjson else PROVIDERS['stdlib'](app)
+        for name, old, new in (
+            ('words', legacy_words, current(Dictionary, WORD_COLUMNS, serialize_list_word, Dictionary.order_index)),
+            ('phrases', legacy_phrases, current(Phrase, PHRASE_COLUMNS, serialize_phrase, Phrase.id)),
+            ('videos', legacy_videos, current(Video, VIDEO_LIST_COLUMNS, serialize_list_video, Video.order_index)),
+        ):
+            assert old() == new(), name
+            old_ms = timed(lambda: json.dumps(old(), separators=(',', ':'), sort_keys=True))
+            new_ms = timed(lambda: fast.dumps(new()))
+            print(f"{name:<10} {old_ms:>10.3f} {new_ms:>10.3f} {old_ms / new_ms:>7.2f}x")
+
+    print(f"\nEnd-to-end GET (ms per request, {REPEATS} repeats)")
+    print(f"{'endpoint':<42} " + ' '.join(f'{name:>8}' for name in PROVIDERS))
+    client = app.test_client()
+    for url in (f'/api/dictionary/?per_page={PAGE_SIZE}', f'/api/phrases/?per_page={PAGE_SIZE}',
+                f'/api/resources/videos?per_page={PAGE_SIZE}', '/api/phrases/?format=array'):
+        results = []
+        for name, provider in PROVIDERS.items():
+            if name == 'orjson' and orjson is None:
+                results.append('   n/a  ')
+                continue
+            app.json = provider(app)
+            assert client.get(url).status_code == 200, url
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                client.get(url)
+            results.append(f'{(time.perf_counter() - start) / REPEATS * 1000:>8.3f}')
+        print(f"{url:<42} " + ' '.join(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Microbenchmark: transliteration of long paragraphs
+
+Compares the compiled longest-match engine with the previous approach
+(one str.replace pass per rule, re-sorted on every call).
+
+Usage: python benchmark_transliteration.py [paragraph repeats]
+"""
+import sys
+import time
+from transliteration import transliterate, transliterate_many, transliterate_edit
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+PARAGRAPH = (
+    "namaste, mero naam raam ho. ma kaaThmaaDauM maa baschhu ra nepaalii bhaashaa "
+    "sikdai chhu. timro ghar kahaaM chha? aaja mausam dherai raamro chha, hijo paani "
+    "paryo. bajaar maa taajaa tarkaarii ra phalphuul kinna sakinchha. dhanyabaad! "
+)
+
+# Previous rule table and algorithm, kept here for comparison only
+LEGACY_RULES = {
+    'a': 'अ', 'aa': 'आ', 'i': 'इ', 'ii': 'ई', 'u': 'उ', 'uu': 'ऊ',
+    'e': 'ए', 'ai': 'ऐ', 'o': 'ओ', 'au': 'औ', 'am': 'अं', 'ah': 'अः',
+    'ka': 'क', 'kha': 'ख', 'ga': 'ग', 'gha': 'घ', 'nga': 'ङ',
+    'cha': 'च', 'chha': 'छ', 'ja': 'ज', 'jha': 'झ', 'nya': 'ञ',
+    'ta': 'त', 'tha': 'थ', 'da': 'द', 'dha': 'ध', 'na': 'न',
+    'pa': 'प', 'pha': 'फ', 'ba': 'ब', 'bha': 'भ', 'ma': 'म',
+    'ya': 'य', 'ra': 'र', 'la': 'ल', 'va': 'व',
+    'sha': 'ष', 'sa': 'स', 'ha': 'ह',
+    'ksha': 'क्ष', 'tra': 'त्र', 'gya': 'ज्ञ'
+}
+
+
+def legacy_transliterate(text):
+    devanagari = text.lower()
+    for roman, deva in sorted(LEGACY_RULES.items(), key=lambda x: -len(x[0])):
+        devanagari = devanagari.replace(roman, deva)
+    return devanagari
+
+
+def timed(fn, text, rounds):
+    fn(text)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    print(f"{'chars':>8} {'legacy ms':>10} {'engine ms':>10} {'engine µs/char':>15}")
+    for paragraphs in (1, 10, REPEATS, REPEATS * 10):
+        text = PARAGRAPH * paragraphs
+        rounds = max(3, 2000 // paragraphs)
+        legacy_ms = timed(legacy_transliterate, text, rounds)
+        engine_ms = timed(transliterate, text, rounds)
+        print(f"{len(text):>8} {legacy_ms:>10.3f} {engine_ms:>10.3f} {engine_ms * 1000 / len(text):>15.3f}")
+
+    # A batch of short strings, as sent to /convert-batch
+    sentences = [s.strip() + '.' for s in PARAGRAPH.split('.') if s.strip()] * 200
+    chars = sum(map(len, sentences))
+    each_ms = timed(lambda batch: [transliterate(s) for s in batch], sentences, 20)
+    batch_ms = timed(transliterate_many, sentences, 20)
+    print(f"\n{len(sentences)} sentences ({chars} chars): one call each {each_ms:.3f} ms, "
+          f"batch with word cache {batch_ms:.3f} ms ({each_ms / batch_ms:.1f}x)")
+
+    # Typing one character at the end of a long text
+    print(f"\n{'chars typed':>12} {'full ms/key':>12} {'incremental ms/key':>19}")
+    for paragraphs in (1, 10, REPEATS):
+        text = PARAGRAPH * paragraphs
+        pending = transliterate_edit('', 0, text)[0]
+        full_ms = timed(lambda t: transliterate(t + 'a'), text, 200)
+        edit_ms = timed(lambda p: transliterate_edit(p, 0, 'a'), pending, 200)
+        print(f"{len(text):>12} {full_ms:>12.4f} {edit_ms:>19.4f}")
+
+    print("\nSample:")
+    print(PARAGRAPH.strip())
+    print(transliterate(PARAGRAPH.strip()))
+
+
+if __name__ == '__main__':
+    main()
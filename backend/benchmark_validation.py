@@ -0,0 +1,69 @@
+"""
+Microbenchmark: content validation of dictionary rows
+
+Compares the previous checks (one re.search per dangerous pattern, per
+field) with validate_many(), which scans each field once with all
+patterns compiled into one regex.
+
+Usage: python benchmark_validation.py [rows]
+"""
+import re
+import sys
+import time
+from validation import DANGEROUS_PATTERNS, DICTIONARY_SCHEMA, validate_many
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+FIELDS = [
+    ('nepali', 'Nepali word', True, 200),
+    ('english', 'English translation', True, 200),
+    ('romanized', 'Romanized', False, 200),
+    ('usage_example', 'Usage example', False, 500),
+    ('nepali_example', 'Nepali example', False, 500),
+]
+
+
+# Previous implementation, kept here for comparison only
+def legacy_validate(data):
+    errors = []
+    for field, label, required, max_length in FIELDS:
+        text = data.get(field)
+        if not text or not text.strip():
+            if required:
+                errors.append(f"{label} is required")
+            continue
+        text = text.strip()
+        text_lower = text.lower()
+        if any(re.search(pattern, text_lower) for pattern in DANGEROUS_PATTERNS):
+            errors.append(f"{label} contains potentially dangerous content")
+        elif len(text) > max_length:
+            errors.append(f"{label} is too long (maximum {max_length} characters)")
+        elif len(text) > 50 and len(set(text)) < 3:
+            errors.append(f"{label} appears to be invalid (repetitive characters)")
+    return errors
+
+
+def main():
+    rows = [{
+        'nepali': f'शब्द{i}',
+        'english': f'word number {i}',
+        'romanized': f'shabda{i}',
+        'usage_example': f'An example sentence for word {i}.',
+        'nepali_example': f'शब्द{i} को उदाहरण वाक्य।' if i % 7 else '<script>alert(1)</script>',
+    } for i in range(ROWS)]
+
+    start = time.perf_counter()
+    legacy = [legacy_validate(row) for row in rows]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = validate_many(rows, DICTIONARY_SCHEMA)
+    current_s = time.perf_counter() - start
+
+    assert legacy == current
+    print(f"{ROWS} rows: per-pattern {legacy_s:.2f} s, validate_many {current_s:.2f} s "
+          f"({legacy_s / current_s:.1f}x, {ROWS / current_s:.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
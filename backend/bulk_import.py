@@ -0,0 +1,281 @@
+"""
+Streaming CSV ingestion for bulk uploads
+Uploads are decoded and parsed as they are read and handed out in
+fixed-size chunks, so memory use does not grow with the file size;
+each chunk is written with executemany INSERTs (or upserts) in its own
+transaction
+"""
+import atexit
+import codecs
+import csv
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from itertools import chain, islice
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from database import db
+
+CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+
+# Rows listed in a report; the counts always cover the whole file
+MAX_REPORTED_ROWS = int(os.getenv('BULK_MAX_REPORTED_ROWS', 100))
+
+# Processes checking CSV rows in parallel, per web worker; 1 (the default)
+# checks them in the calling thread. Under Gunicorn the pools add up, so
+# keep workers x this within the cores available.
+VALIDATION_WORKERS = int(os.getenv('BULK_VALIDATION_WORKERS', 1))
+
+# INSERT ... ON CONFLICT DO UPDATE constructs by database dialect
+UPSERT_DIALECTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def read_csv(stream, size=CHUNK_SIZE):
+    """
+    Read the header of a binary CSV stream.
+
+    Returns:
+        tuple: (header field names, read_csv_chunks() iterator over the rows)
+    """
+    reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+    return list(reader.fieldnames or ()), _chunks(enumerate(reader, start=2), size)
+
+
+def read_csv_chunks(stream, size=CHUNK_SIZE):
+    """
+    Yield lists of (row number, row dict) from a binary CSV stream.
+
+    Bytes are decoded line by line (a leading UTF-8 BOM is dropped), so
+    only the current chunk is held in memory. Row numbers match the
+    spreadsheet: the header is row 1.
+    """
+    return read_csv(stream, size)[1]
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Process pools by size, started on first use and shared by all requests
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(workers):
+    with _pools_lock:
+        if workers not in _pools:
+            # Never fork the web process: its other threads (counter flusher,
+            # bulk jobs, requests) may hold locks the children would inherit
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            atexit.register(_pools[workers].shutdown, cancel_futures=True)
+        return _pools[workers]
+
+
+def map_chunks(fn, chunks, workers=None):
+    """
+    Yield (chunk, fn(chunk)) for every chunk, in order.
+
+    With more than one worker (default VALIDATION_WORKERS) the chunks are
+    spread over a process pool, at most two per worker in flight so a
+    streamed file is still read as it is consumed. fn and the chunks must
+    be picklable, i.e. fn is a module-level function or a partial of one;
+    a worker gets a copy of the chunk, so changes it makes are not seen
+    here. A file of a single chunk is handled in the calling thread.
+    """
+    workers = VALIDATION_WORKERS if workers is None else workers
+    chunks = iter(chunks)
+    head = list(islice(chunks, 2))
+    if workers <= 1 or len(head) < 2:
+        for chunk in chain(head, chunks):
+            yield chunk, fn(chunk)
+        return
+
+    pool = _pool(workers)
+    pending = deque()
+    try:
+        for chunk in chain(head, chunks):
+            pending.append((chunk, pool.submit(fn, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next request
+        with _pools_lock:
+            _pools.pop(workers, None)
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def insert_rows(model, rows):
+    """
+    Insert a chunk of column dicts and commit it as one transaction.
+
+    Goes through Core (executemany, batched into multi-row VALUES by
+    SQLAlchemy) instead of one ORM object per row. Every dict must have
+    the same keys. Commit listeners see a single 'bulk' change.
+    """
+    if rows:
+        db.session.execute(insert(model), rows)
+    db.session.commit()
+
+
+def normalized_key(model, columns, fold_case):
+    """SQL expressions of a duplicate key, matching the models' *_dedupe_key indexes"""
+    expressions = [func.trim(getattr(model, column)) for column in columns]
+    return [func.lower(e) for e in expressions] if fold_case else expressions
+
+
+def existing_rows(model, key_columns, fold_case, keys, columns=()):
+    """
+    Stored rows whose normalized key is in keys, as {key tuple: row}.
+
+    keys are one chunk's worth of tuples normalized like the index
+    (stripped, lowercased when fold_case), so this is a single indexed
+    IN query and memory grows with the chunk, not the table. Rows carry
+    the key expressions followed by columns.
+    """
+    if not keys:
+        return {}
+    expressions = normalized_key(model, key_columns, fold_case)
+    # Filter on the leading key expression, which every database can match
+    # against the index (SQLite scans for row-value IN), then on the whole key
+    query = (db.session.query(*expressions, *(getattr(model, c) for c in columns))
+             .filter(expressions[0].in_(list({key[0] for key in keys}))))
+    width = len(expressions)
+    found = ((tuple(row[:width]), row) for row in query)
+    return {key: row for key, row in found if key in keys}
+
+
+def supports_upsert():
+    return db.session.get_bind().dialect.name in UPSERT_DIALECTS
+
+
+def row_hash(values):
+    """Stable digest of a sequence of column values"""
+    return hashlib.blake2b(repr(tuple(values)).encode(), digest_size=16).digest()
+
+
+def upsert_rows(model, key, rows, columns=None):
+    """
+    Insert or update a chunk of column dicts on the unique column key and
+    commit it as one transaction.
+
+    Existing rows are compared and updated on columns only (default: all).
+    They are looked up with one IN query; rows whose values hash the same
+    as the stored ones are not written at all. The rest go out as one
+    executemany INSERT ... ON CONFLICT (key) DO UPDATE.
+    Returns (inserted, updated, unchanged).
+    """
+    inserted = updated = unchanged = 0
+    if rows:
+        columns = list(columns or rows[0])
+        key_column = getattr(model, key)
+        stored = {found[0]: row_hash(found[1:]) for found in
+                  db.session.query(key_column, *(getattr(model, c) for c in columns))
+                  .filter(key_column.in_([values[key] for values in rows]))}
+
+        changed = []
+        for values in rows:
+            digest = stored.get(values[key])
+            if digest is None:
+                inserted += 1
+            elif digest != row_hash(values[c] for c in columns):
+                updated += 1
+            else:
+                unchanged += 1
+                continue
+            changed.append(values)
+
+        if changed:
+            statement = UPSERT_DIALECTS[db.session.get_bind().dialect.name](model)
+            assignments = {c: statement.excluded[c] for c in columns if c != key}
+            if hasattr(model, 'updated_at'):
+                assignments['updated_at'] = datetime.utcnow()
+            db.session.execute(statement.on_conflict_do_update(index_elements=[key], set_=assignments), changed)
+    db.session.commit()
+    return inserted, updated, unchanged
+
+
+class ImportProgress:
+    """Rows processed by an import and its throughput"""
+
+    def __init__(self, bytes_total=None):
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_total = bytes_total
+        self.started = time.perf_counter()
+
+    def track(self, stream):
+        """Pass the lines of a binary stream through, counting bytes read"""
+        for line in stream:
+            self.bytes_read += len(line)
+            yield line
+
+    def add(self, rows, summary=None):
+        """Called after each chunk is written, with the upload summary so far"""
+        self.rows += rows
+
+    def cancelled(self):
+        """True to stop the import after the current chunk"""
+        return False
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows_processed': self.rows,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed) if elapsed > 0 else None
+        }
+
+
+def new_report():
+    """Empty validation report, as returned by /api/bulk/validate"""
+    return {
+        'valid': [],
+        'duplicates': [],
+        'errors': [],
+        'total_rows': 0,
+        'valid_count': 0,
+        'duplicate_count': 0,
+        'error_count': 0
+    }
+
+
+_COUNT_KEYS = {'valid': 'valid_count', 'duplicates': 'duplicate_count', 'errors': 'error_count'}
+
+
+def report_row(report, kind, row_num, row, reason=None, existing=None):
+    """Count a row as 'valid', 'duplicates' or 'errors', listing only the first MAX_REPORTED_ROWS"""
+    report[_COUNT_KEYS[kind]] += 1
+    if len(report[kind]) < MAX_REPORTED_ROWS:
+        item = {'row': row_num, 'data': row}
+        if existing is not None:
+            item['existing'] = existing
+        if reason is not None:
+            item['reason'] = reason
+        report[kind].append(item)
+
+
+def report_error(errors, message):
+    """Append an upload error message unless MAX_REPORTED_ROWS are already listed"""
+    if len(errors) < MAX_REPORTED_ROWS:
+        errors.append(message)
@@ -0,0 +1,294 @@
+"""
+Background runner for bulk uploads
+A submitted upload is saved to a temporary file and imported by a few
+worker threads, so the request returns at once; status and progress live
+in the bulk_job table, where any web worker can read them
+"""
+import atexit
+import glob
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import inspect, select, update
+from database import db
+from models import BulkJob
+from bulk_import import ImportProgress
+
+# Imports running at the same time; more are queued
+WORKERS = int(os.getenv('BULK_JOB_WORKERS', 2))
+
+# Where uploads wait until their job has read them
+UPLOAD_DIR = os.getenv('BULK_JOB_DIR') or tempfile.gettempdir()
+
+# Seconds shutdown waits for running imports to stop after their current chunk
+SHUTDOWN_TIMEOUT = float(os.getenv('BULK_JOB_SHUTDOWN_TIMEOUT', 10))
+
+UNFINISHED = ('queued', 'running')
+FINISHED = ('done', 'failed', 'cancelled')
+
+UPLOAD_PREFIX = 'bulk-upload-'
+
+_HOST = socket.gethostname()
+
+
+def _owner():
+    """Identifies the process running a job (host:pid)"""
+    return f'{_HOST}:{os.getpid()}'
+
+
+def _process_gone(pid):
+    """True if no process pid exists on this host (this process counts as gone: it has no jobs yet)"""
+    if pid == os.getpid():
+        return True
+    if os.name != 'posix':
+        return False  # no safe liveness check; leave the job alone
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def _owner_gone(owner):
+    host, _, pid = (owner or '').rpartition(':')
+    if not pid.isdigit():
+        return True
+    return host == _HOST and _process_gone(int(pid))
+
+
+def _remove_upload(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _update_job(job_id, condition=None, **values):
+    """Update a job row outside the ORM session; returns the number of rows changed"""
+    statement = update(BulkJob).where(BulkJob.id == job_id)
+    if condition is not None:
+        statement = statement.where(condition)
+    with db.engine.begin() as conn:
+        return conn.execute(statement.values(**values)).rowcount
+
+
+def _fail_job(job_id, error):
+    """Mark a job that has not finished as failed"""
+    return _update_job(job_id, BulkJob.status.in_(UNFINISHED), status='failed', error=error,
+                       finished_at=datetime.utcnow())
+
+
+def recover_jobs():
+    """
+    Fail queued or running jobs left by processes on this host that are
+    gone (crashed or killed), and delete the uploads they left behind.
+    Must run before this process submits jobs of its own.
+    """
+    if inspect(db.engine).has_table(BulkJob.__tablename__):
+        with db.engine.connect() as conn:
+            leftovers = conn.execute(select(BulkJob.id, BulkJob.owner)
+                                     .where(BulkJob.status.in_(UNFINISHED))).all()
+        for job_id, owner in leftovers:
+            if _owner_gone(owner):
+                _fail_job(job_id, 'Interrupted: the server stopped before the import finished')
+
+    # Uploads are named bulk-upload-<pid>-*.csv after the process that saved them
+    for path in glob.glob(os.path.join(UPLOAD_DIR, f'{UPLOAD_PREFIX}*.csv')):
+        pid = os.path.basename(path)[len(UPLOAD_PREFIX):].split('-', 1)[0]
+        if not pid.isdigit() or _process_gone(int(pid)):
+            _remove_upload(path)
+
+
+class JobProgress(ImportProgress):
+    """ImportProgress that saves each chunk's counts to the job row and picks up cancel requests"""
+
+    def __init__(self, job_id, bytes_total, stopping):
+        super().__init__(bytes_total)
+        self.job_id = job_id
+        self.stopping = stopping
+        self.cancel = False
+
+    def add(self, rows, summary=None):
+        super().add(rows, summary)
+        values = {'rows_processed': self.rows, 'bytes_read': self.bytes_read}
+        if summary is not None:
+            values.update(error_count=summary['error_count'], errors=json.dumps(summary['errors']))
+        _update_job(self.job_id, **values)
+        with db.engine.connect() as conn:
+            self.cancel = bool(conn.execute(
+                select(BulkJob.cancel_requested).where(BulkJob.id == self.job_id)).scalar())
+
+    def cancelled(self):
+        return self.cancel or self.stopping.is_set()
+
+
+class JobRunner:
+    """Worker threads running bulk upload jobs from an in-process queue"""
+
+    def __init__(self):
+        self.app = None
+        self.queue = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.active = {}  # job id -> upload path, for jobs of this process not finished yet
+
+    def init_app(self, app):
+        """Clean up after dead processes; the workers start with the first job"""
+        self.app = app
+        with app.app_context():
+            try:
+                recover_jobs()
+            except Exception as e:
+                print(f"⚠ Bulk job recovery failed: {e}")
+
+    def submit(self, file, work, **fields):
+        """
+        Queue an uploaded file for import and return its BulkJob.
+
+        work(stream, progress) runs in a worker thread with an app context:
+        it reads the binary stream, reports to progress and returns the
+        upload summary stored as the job result. fields are BulkJob columns.
+        """
+        fd, path = tempfile.mkstemp(prefix=f'{UPLOAD_PREFIX}{os.getpid()}-', suffix='.csv', dir=UPLOAD_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as saved:
+                file.save(saved)
+            job = BulkJob(filename=file.filename, bytes_total=os.path.getsize(path), owner=_owner(), **fields)
+            db.session.add(job)
+            db.session.commit()
+        except Exception:
+            _remove_upload(path)
+            raise
+        with self.lock:
+            self.active[job.id] = path
+            self._start()
+        self.queue.put((job.id, path, work))
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job never starts, a running one stops after
+        the chunk it is writing. Returns False if the job already finished.
+        """
+        if _update_job(job_id, BulkJob.status == 'queued', status='cancelled', finished_at=datetime.utcnow()):
+            return True
+        return bool(_update_job(job_id, BulkJob.status == 'running', cancel_requested=True))
+
+    def shutdown(self, timeout=SHUTDOWN_TIMEOUT):
+        """
+        Stop the workers. Running imports stop after their current chunk
+        (up to timeout seconds); every job of this process that did not
+        finish is then marked failed and its upload deleted.
+        """
+        self.stopping.set()
+        for _ in self.threads:
+            self.queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()))
+
+        with self.lock:
+            leftovers, self.active = self.active, {}
+        if leftovers:
+            with self.app.app_context():
+                for job_id, path in leftovers.items():
+                    try:
+                        _fail_job(job_id, 'Interrupted: the server shut down before the import finished')
+                    except Exception as e:
+                        print(f"⚠ Could not mark bulk job {job_id} failed: {e}")
+                    _remove_upload(path)
+
+    def _start(self):
+        """Start the worker threads once (called with the lock held)"""
+        if self.threads:
+            return
+        self.threads = [threading.Thread(target=self._work, name=f'bulk-job-{n}', daemon=True)
+                        for n in range(WORKERS)]
+        for thread in self.threads:
+            thread.start()
+        atexit.register(self.shutdown)
+
+    def _work(self):
+        while not self.stopping.is_set():
+            item = self.queue.get()
+            if item is None or self.stopping.is_set():
+                return
+            self._run(*item)
+
+    def _run(self, job_id, path, work):
+        try:
+            with self.app.app_context():
+                if not _update_job(job_id, BulkJob.status == 'queued', status='running', started_at=datetime.utcnow()):
+                    return  # cancelled while queued
+                progress = JobProgress(job_id, os.path.getsize(path), self.stopping)
+                try:
+                    with open(path, 'rb') as stream:
+                        summary = work(progress.track(stream), progress)
+                except Exception as e:
+                    db.session.rollback()
+                    _fail_job(job_id, str(e))
+                    return
+                if summary.get('cancelled') and not progress.cancel:
+                    # Stopped by shutdown(), not by the user
+                    _update_job(job_id, BulkJob.status == 'running', result=json.dumps(summary))
+                    _fail_job(job_id, 'Interrupted: the server shut down before the import finished')
+                    return
+                # shutdown() may have failed the job already if this ran past its timeout
+                _update_job(job_id, BulkJob.status == 'running',
+                            status='cancelled' if summary.get('cancelled') else 'done',
+                            result=json.dumps(summary), finished_at=datetime.utcnow())
+        except Exception as e:
+            print(f"⚠ Bulk job {job_id} failed: {e}")
+        finally:
+            with self.lock:
+                self.active.pop(job_id, None)
+            _remove_upload(path)
+
+
+def job_status(job):
+    """Status of a job as returned by GET /api/bulk/jobs/<id>, with throughput and ETA"""
+    status = {
+        'job_id': job.id,
+        'resource_type': job.resource_type,
+        'mode': job.mode,
+        'filename': job.filename,
+        'status': job.status,
+        'cancel_requested': bool(job.cancel_requested),
+        'rows_processed': job.rows_processed or 0,
+        'bytes_read': job.bytes_read or 0,
+        'bytes_total': job.bytes_total,
+        'percent': None,
+        'elapsed_seconds': None,
+        'rows_per_second': None,
+        'eta_seconds': None,
+        'error_count': job.error_count or 0,
+        'errors': json.loads(job.errors) if job.errors else [],
+        'error': job.error,
+        'result': json.loads(job.result) if job.result else None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.bytes_total:
+        status['percent'] = 100.0 if job.status == 'done' else round(100 * status['bytes_read'] / job.bytes_total, 1)
+    if job.started_at:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        status['elapsed_seconds'] = round(elapsed, 3)
+        if elapsed > 0:
+            status['rows_per_second'] = round(status['rows_processed'] / elapsed)
+            # Rows per file are unknown up front, so the ETA follows bytes read
+            if job.status == 'running' and status['bytes_read'] and job.bytes_total:
+                remaining = job.bytes_total - status['bytes_read']
+                status['eta_seconds'] = round(remaining * elapsed / status['bytes_read'], 1)
+    return status
+
+
+jobs = JobRunner()
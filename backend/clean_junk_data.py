@@ -4,89 +4,55 @@ Removes XSS payloads, test data, and empty entries
 """
 from app import app, db
 from models import Dictionary, Phrase, Alphabet, Video
+from validation import Schema, validate_many
+
+# Rows read (and deleted) per batch
+BATCH_SIZE = 1000
+
+# What counts as junk in each table: an empty required field, an XSS
+# payload, test data or a long run of repeated characters
+CLEANUP_SCHEMAS = [
+    ('Dictionary', 'word', Dictionary, Schema([
+        ('nepali', 'Nepali', True, None),
+        ('english', 'English', True, None),
+    ], junk=True)),
+    ('Phrases', 'phrase', Phrase, Schema([
+        ('nepali', 'Nepali', True, None),
+        ('english', 'English', False, None),
+        ('romanized', 'Romanized', False, None),
+    ], junk=True)),
+    # Less likely to have junk, but check
+    ('Alphabet', 'letter', Alphabet, Schema([
+        ('devanagari', 'Devanagari', True, None),
+    ])),
+]
+
+def junk_ids(model, noun, schema):
+    """IDs of rows that fail schema, read in batches of plain column values"""
+    columns = [getattr(model, field) for field, *_ in schema.fields]
+    result = db.session.execute(db.select(model.id, *columns).execution_options(yield_per=BATCH_SIZE))
+    ids = []
+    for batch in result.partitions():
+        rows = [row._mapping for row in batch]
+        for row, errors in zip(rows, validate_many(rows, schema)):
+            if errors:
+                preview = ' / '.join(str(row[field])[:50] for field, *_ in schema.fields if row[field])
+                print(f"  ❌ Removing {noun} ID {row['id']}: '{preview}' ({errors[0]})")
+                ids.append(row['id'])
+    return ids
 
 def clean_database():
     """Remove junk test data and XSS payloads"""
     with app.app_context():
-        # Junk patterns to remove
-        junk_patterns = [
-            'AAAA',  # Long repeated characters
-            'test',
-            'Test',
-            'TEST',
-            '\'">',  # XSS payloads
-            '<script',
-            'javascript:',
-            'onerror=',
-            'onclick=',
-        ]
-        
         removed_count = 0
         
-        # Clean Dictionary
-        print("\n🔍 Checking Dictionary...")
-        dict_words = Dictionary.query.all()
-        for word in dict_words:
-            # Check if empty or whitespace only
-            if not word.nepali or not word.nepali.strip():
-                print(f"  ❌ Removing empty word ID {word.id}")
-                db.session.delete(word)
-                removed_count += 1
-                continue
-            
-            # Check if english is empty
-            if not word.english or not word.english.strip():
-                print(f"  ❌ Removing word with empty English ID {word.id}: '{word.nepali}'")
-                db.session.delete(word)
-                removed_count += 1
-                continue
-            
-            # Check for junk patterns
-            for pattern in junk_patterns:
-                if (pattern.lower() in word.nepali.lower() or 
-                    pattern.lower() in word.english.lower()):
-                    print(f"  ❌ Removing junk word ID {word.id}: '{word.nepali}' / '{word.english}'")
-                    db.session.delete(word)
-                    removed_count += 1
-                    break
-            
-            # Check for suspiciously long strings (over 100 chars of same letter)
-            if len(word.nepali) > 50:
-                unique_chars = len(set(word.nepali))
-                if unique_chars < 3:  # Only 1-2 unique characters
-                    print(f"  ❌ Removing suspicious long string ID {word.id}: '{word.nepali[:50]}...'")
-                    db.session.delete(word)
-                    removed_count += 1
-        
-        # Clean Phrases
-        print("\n🔍 Checking Phrases...")
-        phrase_list = Phrase.query.all()
-        for phrase in phrase_list:
-            # Check if empty
-            if not phrase.nepali or not phrase.nepali.strip():
-                print(f"  ❌ Removing empty phrase ID {phrase.id}")
-                db.session.delete(phrase)
-                removed_count += 1
-                continue
-            
-            # Check for XSS payloads
-            for pattern in junk_patterns:
-                if (pattern in phrase.nepali or 
-                    pattern in phrase.english or 
-                    (phrase.romanized and pattern in phrase.romanized)):
-                    print(f"  ❌ Removing junk/XSS phrase ID {phrase.id}: '{phrase.nepali}' / '{phrase.english}'")
-                    db.session.delete(phrase)
-                    removed_count += 1
-                    break
-        
-        # Clean Alphabet (less likely to have junk, but check)
-        print("\n🔍 Checking Alphabet...")
-        alphabet_list = Alphabet.query.all()
-        for letter in alphabet_list:
-            if not letter.devanagari or not letter.devanagari.strip():
-                print(f"  ❌ Removing empty letter ID {letter.id}")
-                db.session.delete(letter)
-                removed_count += 1
+        for title, noun, model, schema in CLEANUP_SCHEMAS:
+            print(f"\n🔍 Checking {title}...")
+            ids = junk_ids(model, noun, schema)
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start:start + BATCH_SIZE]
+                model.query.filter(model.id.in_(batch)).delete(synchronize_session=False)
+            removed_count += len(ids)
         
         # Commit changes
         if removed_count > 0:
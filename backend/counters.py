@@ -0,0 +1,113 @@
+"""
+Write-behind buffer for view and download counters
+Read endpoints record increments in memory; a background thread, started
+with the first increment, applies them to the database in one batched
+UPDATE per counter column
+"""
+import atexit
+import os
+import threading
+from sqlalchemy import case, update
+
+# Seconds between background flushes
+FLUSH_INTERVAL = float(os.getenv('COUNTER_FLUSH_INTERVAL', 5))
+
+# Flush early once this many rows have pending increments
+FLUSH_THRESHOLD = int(os.getenv('COUNTER_FLUSH_THRESHOLD', 500))
+
+
+class CounterBuffer:
+    """Aggregates counter increments per row until the next flush"""
+
+    def __init__(self):
+        self.app = None
+        self.pending = {}   # (model, column name) -> {row id: delta}
+        self.size = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.listeners = []
+
+    def init_app(self, app):
+        """
+        Bind the app whose database the counters are flushed to. The flusher
+        starts with the first increment, so scripts that import the app
+        (migrations, clean_junk_data) never run it.
+        """
+        self.app = app
+
+    def on_increment(self, callback):
+        """Register callback(model, row_id, column, amount) for every recorded view event"""
+        self.listeners.append(callback)
+        return callback
+
+    def increment(self, model, row_id, column, amount=1, notify=True):
+        if notify:
+            for callback in self.listeners:
+                try:
+                    callback(model, row_id, column, amount)
+                except Exception as e:
+                    print(f"⚠ Counter listener failed: {e}")
+        with self.lock:
+            self._start()
+            deltas = self.pending.setdefault((model, column), {})
+            if row_id not in deltas:
+                deltas[row_id] = 0
+                self.size += 1
+            deltas[row_id] += amount
+            full = self.size >= FLUSH_THRESHOLD
+        if full:
+            self.wakeup.set()
+
+    def pending_for(self, model, row_id, column):
+        """Increments recorded for a row but not yet written"""
+        with self.lock:
+            return self.pending.get((model, column), {}).get(row_id, 0)
+
+    def flush(self):
+        """Write all pending increments; failed batches are kept for the next try"""
+        with self.lock:
+            batches, self.pending, self.size = self.pending, {}, 0
+        if not batches:
+            return
+
+        from database import db
+
+        with self.app.app_context():
+            for (model, column), deltas in batches.items():
+                counter = getattr(model, column)
+                statement = update(model).where(model.id.in_(list(deltas))).values({
+                    column: db.func.coalesce(counter, 0) + case(deltas, value=model.id, else_=0)
+                })
+                try:
+                    with db.engine.begin() as conn:
+                        conn.execute(statement)
+                except Exception as e:
+                    print(f"⚠ Counter flush for {model.__name__}.{column} failed: {e}")
+                    for row_id, delta in deltas.items():
+                        self.increment(model, row_id, column, delta, notify=False)
+
+    def shutdown(self):
+        self.stopped.set()
+        self.wakeup.set()
+        self.flush()
+
+    def _start(self):
+        """Start the flusher once and flush again at exit (called with the lock held)"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='counter-flush', daemon=True)
+            self.thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self.stopped.is_set():
+            self.wakeup.wait(FLUSH_INTERVAL)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠ Counter flush failed: {e}")
+
+
+counters = CounterBuffer()
@@ -0,0 +1,72 @@
+"""
+Pluggable JSON provider for API responses
+Uses orjson when it is installed and falls back to Flask's stdlib provider
+"""
+import os
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Output is UTF-8 (not ASCII-escaped) and keys keep insertion order.
+    Datetimes and dataclasses are handed to Flask's default() so they
+    serialize exactly as with the stdlib provider.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+
+    def _dumps_bytes(self, obj, indent=False):
+        options = self.options
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=options)
+        except TypeError:
+            # Non-string dict keys, integers beyond 64 bits, ...
+            return super().dumps(obj, indent=2 if indent else None).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    'orjson': OrjsonProvider,
+    'stdlib': DefaultJSONProvider,
+}
+
+
+def init_json(app):
+    """
+    Install the JSON provider named by JSON_PROVIDER (default: orjson
+    when importable, otherwise stdlib).
+    """
+    name = os.getenv('JSON_PROVIDER', 'orjson' if orjson else 'stdlib')
+    if name == 'orjson' and orjson is None:
+        print("⚠ JSON_PROVIDER=orjson but orjson is not installed; using stdlib json")
+        name = 'stdlib'
+    app.json = PROVIDERS[name](app)
+    return app.json
@@ -0,0 +1,17 @@
+"""
+Migration script to add the bulk_job table used by background bulk uploads
+"""
+from app import app, db
+from models import BulkJob
+
+def migrate():
+    with app.app_context():
+        print("🔄 Adding bulk_job table...")
+
+        BulkJob.__table__.create(db.engine, checkfirst=True)
+        print("✅ bulk_job ready")
+
+        print("\n🎉 Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
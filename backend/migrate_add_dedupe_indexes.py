@@ -0,0 +1,27 @@
+"""
+Migration script to add the normalized-key indexes used by bulk upload duplicate checks
+"""
+from app import app, db
+
+INDEXES = [
+    ('ix_dictionary_dedupe_key', 'dictionary', 'lower(trim(nepali))'),
+    ('ix_phrase_dedupe_key', 'phrase', 'lower(trim(nepali)), lower(trim(english))'),
+    ('ix_alphabet_dedupe_key', 'alphabet', 'trim(devanagari)'),
+    ('ix_video_dedupe_key', 'video', 'trim(youtube_id)'),
+]
+
+def migrate():
+    with app.app_context():
+        print("🔄 Adding duplicate check indexes...")
+        
+        for index_name, table, expressions in INDEXES:
+            db.session.execute(db.text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({expressions})"
+            ))
+            print(f"✅ {index_name} ready")
+        
+        db.session.commit()
+        print("\n🎉 Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
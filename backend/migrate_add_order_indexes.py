@@ -0,0 +1,26 @@
+"""
+Migration script to add (order_index, id) indexes used by cursor pagination
+"""
+from app import app, db
+
+INDEXES = [
+    ('ix_dictionary_order_index_id', 'dictionary'),
+    ('ix_resource_order_index_id', 'resource'),
+    ('ix_video_order_index_id', 'video'),
+]
+
+def migrate():
+    with app.app_context():
+        print("🔄 Adding keyset pagination indexes...")
+        
+        for index_name, table in INDEXES:
+            db.session.execute(db.text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} (order_index, id)"
+            ))
+            print(f"✅ {index_name} ready")
+        
+        db.session.commit()
+        print("\n🎉 Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
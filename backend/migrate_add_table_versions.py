@@ -0,0 +1,17 @@
+"""
+Migration script to add the table_version table used for ETags
+"""
+from app import app, db
+from models import TableVersion
+
+def migrate():
+    with app.app_context():
+        print("🔄 Adding table_version table...")
+
+        TableVersion.__table__.create(db.engine, checkfirst=True)
+        print("✅ table_version ready")
+
+        print("\n🎉 Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,118 @@
+"""
+Commit-time change notifications for database models
+Lets in-memory indexes stay in sync with writes made through the ORM
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_listeners = []
+_flush_listeners = []
+
+
+def on_commit(callback):
+    """
+    Register callback(changes) to run after every successful commit.
+
+    Each change is a dict with:
+        op: 'insert', 'update', 'delete' or 'bulk'
+        table: Table name of the affected model
+        id: Primary key (None for 'bulk')
+        values: Column values loaded at flush time (empty for 'bulk')
+        changed: Column names modified by an 'update'
+
+    'bulk' is reported for query.update()/query.delete() and ORM bulk
+    inserts, whose affected rows are not known to the session.
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def on_flush(callback):
+    """
+    Register callback(session, changes) to run inside the transaction after
+    every flush (and before every ORM bulk statement), with the same change
+    dicts on_commit later receives. Writes must go through session.connection().
+    """
+    _flush_listeners.append(callback)
+    return callback
+
+
+def _change(op, obj, changed=()):
+    """Describe a flushed object, copying only already-loaded column values"""
+    state = inspect(obj)
+    mapper = state.mapper
+    values = {attr.key: state.dict[attr.key]
+              for attr in mapper.column_attrs if attr.key in state.dict}
+    return {
+        'op': op,
+        'table': mapper.local_table.name,
+        'id': mapper.primary_key_from_instance(obj)[0],
+        'values': values,
+        'changed': set(changed)
+    }
+
+
+def _pending(session):
+    return session.info.setdefault('pending_model_changes', [])
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_changes(session, flush_context):
+    if not _listeners and not _flush_listeners:
+        return
+    changes = []
+
+    for obj in session.new:
+        changes.append(_change('insert', obj))
+
+    for obj in session.dirty:
+        state = inspect(obj)
+        changed = [attr.key for attr in state.mapper.column_attrs
+                   if state.attrs[attr.key].history.has_changes()]
+        if changed:
+            changes.append(_change('update', obj, changed))
+
+    for obj in session.deleted:
+        changes.append(_change('delete', obj))
+
+    _record(session, changes)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_changes(orm_execute_state):
+    if not _listeners and not _flush_listeners:
+        return
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _record(orm_execute_state.session, [{
+                'op': 'bulk', 'table': mapper.local_table.name, 'id': None,
+                'values': {}, 'changed': set()
+            }])
+
+
+def _record(session, changes):
+    if not changes:
+        return
+    for callback in _flush_listeners:
+        callback(session, changes)
+    if _listeners:
+        _pending(session).extend(changes)
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_changes(session):
+    changes = session.info.pop('pending_model_changes', None)
+    if not changes:
+        return
+    for callback in _listeners:
+        try:
+            callback(changes)
+        except Exception as e:
+            # A broken listener must never fail the request that committed
+            print(f"⚠ Commit listener {callback.__name__} failed: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('pending_model_changes', None)
@@ -119,6 +119,10 @@ class Phrase(db.Model):
     context = db.Column(db.String(200))  # Conversation context: restaurant, travel, shopping, etc.
     formality_level = db.Column(db.String(20), default='casual')  # formal, casual, neutral
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Bulk upload duplicate checks look up normalized keys (see bulk_import.py)
+    __table_args__ = (db.Index('ix_phrase_dedupe_key', db.func.lower(db.func.trim(nepali)),
+                               db.func.lower(db.func.trim(english))),)
 
 class Alphabet(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -129,6 +133,8 @@ class Alphabet(db.Model):
     pronunciation = db.Column(db.String(200))
     audio_url = db.Column(db.String(500))
     order_index = db.Column(db.Integer)
+    
+    __table_args__ = (db.Index('ix_alphabet_dedupe_key', db.func.trim(devanagari)),)
 
 class UserProgress(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -161,6 +167,10 @@ class Dictionary(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Keyset pagination walks (order_index, id); bulk uploads look up normalized keys
+    __table_args__ = (db.Index('ix_dictionary_order_index_id', 'order_index', 'id'),
+                      db.Index('ix_dictionary_dedupe_key', db.func.lower(db.func.trim(nepali))))
+    
     def __repr__(self):
         return f'<Dictionary {self.nepali}>'
 
@@ -178,6 +188,8 @@ class Resource(db.Model):
     downloads = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.String(100))
+    
+    __table_args__ = (db.Index('ix_resource_order_index_id', 'order_index', 'id'),)
 
 # Phase 2: Video System
 class Playlist(db.Model):
@@ -212,6 +224,9 @@ class Video(db.Model):
     order_index = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (db.Index('ix_video_order_index_id', 'order_index', 'id'),
+                      db.Index('ix_video_dedupe_key', db.func.trim(youtube_id)))
+    
     def __repr__(self):
         return f'<Video {self.title}>'
 
@@ -233,4 +248,41 @@ class PDFResource(db.Model):
     created_by = db.Column(db.String(100))
     
     def __repr__(self):
-        return f'<PDFResource {self.title}>'
\ No newline at end of file
+        return f'<PDFResource {self.title}>'
+
+class TableVersion(db.Model):
+    """Per-table change counter behind ETags (see table_versions.py)"""
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}={self.version}>'
+
+class BulkJob(db.Model):
+    """Bulk upload running in the background (see bulk_jobs.py)"""
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    resource_type = db.Column(db.String(50), nullable=False)
+    mode = db.Column(db.String(20), nullable=False, default='insert')
+    skip_duplicates = db.Column(db.Boolean, default=True)
+    filename = db.Column(db.String(255))
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, done, failed, cancelled
+    cancel_requested = db.Column(db.Boolean, default=False)
+    
+    # Progress, updated after every chunk
+    rows_processed = db.Column(db.Integer, default=0)
+    bytes_read = db.Column(db.Integer, default=0)
+    bytes_total = db.Column(db.Integer)
+    error_count = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Text)  # JSON list of the first reported row errors
+    
+    result = db.Column(db.Text)  # JSON upload summary once finished
+    error = db.Column(db.Text)  # why a failed job stopped
+    
+    owner = db.Column(db.String(100))  # host:pid of the process running it
+    created_by = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<BulkJob {self.id} {self.resource_type} {self.status}>'
@@ -0,0 +1,158 @@
+"""
+Keyset (cursor) pagination helpers
+Every page costs the same: no OFFSET scan and no COUNT(*) per request
+"""
+import base64
+import json
+import os
+import threading
+import time
+from model_events import on_commit
+
+MAX_PER_PAGE = 100
+
+# Totals from other workers' writes are picked up after this many seconds
+COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 60))
+
+_count_cache = {}   # (table, filters) -> (total, cached_at)
+_count_lock = threading.Lock()
+
+
+def encode_cursor(order_value, row_id):
+    """Opaque cursor pointing just after the row (order_value, row_id)"""
+    raw = json.dumps([order_value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        order_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(row_id, int) or not (order_value is None or isinstance(order_value, int)):
+        raise ValueError('Invalid cursor')
+    return order_value, row_id
+
+
+def keyset_paginate(query, model, cursor, per_page):
+    """
+    Return one page of query ordered by (order_index, id), NULLs first,
+    or by id alone for models without an order_index column.
+
+    Args:
+        query: Filtered query without ORDER BY
+        model: Model with an id column (and optionally order_index)
+        cursor: Cursor from a previous page, or '' for the first page
+        per_page: Page size (capped at MAX_PER_PAGE)
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    from database import db
+
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    order_column = getattr(model, 'order_index', None)
+
+    if order_column is None:
+        if cursor:
+            query = query.filter(model.id > decode_cursor(cursor)[1])
+        rows = query.order_by(model.id.asc()).limit(per_page + 1).all()
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor(None, rows[-1].id)
+        return rows, next_cursor
+
+    if cursor:
+        last_order, last_id = decode_cursor(cursor)
+        if last_order is None:
+            query = query.filter(db.or_(
+                db.and_(order_column.is_(None), model.id > last_id),
+                order_column.isnot(None)
+            ))
+        else:
+            query = query.filter(db.or_(
+                order_column > last_order,
+                db.and_(order_column == last_order, model.id > last_id)
+            ))
+
+    rows = query.order_by(order_column.asc().nullsfirst(), model.id.asc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1].order_index, rows[-1].id)
+    return rows, next_cursor
+
+
+def paginate_query(query, model, filters, page, per_page, cursor=None, order_by=None):
+    """
+    Paginate a list endpoint, in cursor mode when a cursor argument was sent.
+
+    Cursor mode (?cursor=, empty for the first page) orders by
+    (order_index, id) and reports a cached total plus next_cursor.
+    Otherwise this is the classic page/per_page paginate(). Both modes
+    cap per_page at MAX_PER_PAGE.
+
+    Returns:
+        tuple: (rows, page_info dict to merge into the response)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor is not None:
+        rows, next_cursor = keyset_paginate(query, model, cursor, per_page)
+        return rows, {
+            'total': cached_count(query, model, filters),
+            'next_cursor': next_cursor
+        }
+
+    if order_by is not None:
+        query = query.order_by(order_by)
+    paginated = query.paginate(page=page, per_page=per_page, max_per_page=MAX_PER_PAGE)
+    return paginated.items, {'total': paginated.total, 'pages': paginated.pages}
+
+
+def cached_count(query, model, filters):
+    """
+    COUNT(*) for query, cached per table and filter set.
+
+    Entries are dropped when the table changes (via model_events) and
+    expire after COUNT_CACHE_TTL seconds.
+    """
+    key = (model.__table__.name, tuple(sorted(filters.items())))
+    now = time.monotonic()
+    with _count_lock:
+        cached = _count_cache.get(key)
+    if cached is not None and now - cached[1] < COUNT_CACHE_TTL:
+        return cached[0]
+
+    total = query.order_by(None).count()
+    with _count_lock:
+        _count_cache[key] = (total, now)
+    return total
+
+
+# Columns whose updates never move a row between filtered totals
+_COUNTER_COLUMNS = {'views', 'view_count', 'downloads', 'updated_at'}
+
+
+@on_commit
+def _invalidate_counts(changes):
+    tables = {c['table'] for c in changes
+              if c['op'] != 'update' or c['changed'] - _COUNTER_COLUMNS}
+    if not tables:
+        return
+    with _count_lock:
+        for key in [k for k in _count_cache if k[0] in tables]:
+            del _count_cache[key]
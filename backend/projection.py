@@ -0,0 +1,43 @@
+"""
+Column projection for read-only list and search queries
+Rows come back as lightweight named tuples: only the listed columns are
+selected and nothing is added to the session's identity map
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+
+def project(query, model, columns):
+    """
+    Restrict query to model's id (and order_index, if any) plus columns.
+
+    Apply after all filters. The result rows support attribute access
+    (row.nepali) like model instances but are read-only.
+    """
+    names = ['id']
+    if hasattr(model, 'order_index'):
+        names.append('order_index')
+    names += [c for c in columns if c not in names]
+    return query.with_entities(*(getattr(model, name) for name in names))
+
+
+def fetch_rows(model, ids, columns=None):
+    """Load rows of model by primary key as {id: row}, projected when columns are given"""
+    if not ids:
+        return {}
+    query = model.query.filter(model.id.in_(list(ids)))
+    if columns:
+        query = project(query, model, columns)
+    return {row.id: row for row in query}
+
+
+@lru_cache(maxsize=None)
+def row_serializer(columns):
+    """
+    Build (once per column tuple) a function turning a row or model
+    instance into a dict of those columns, in order.
+    """
+    getter = attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda row: {columns[0]: getter(row)}
+    return lambda row: dict(zip(columns, getter(row)))
@@ -0,0 +1,157 @@
+"""
+Response cache for read-mostly GET endpoints
+Entries are keyed by endpoint plus normalized query args and dropped when
+a commit touches the tables (and columns) an endpoint reads
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request
+from model_events import on_commit
+
+# Entries kept by the default in-process backend
+CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+
+# Writes made by other worker processes are picked up after this many seconds
+CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+
+
+class LRUBackend:
+    """In-process least-recently-used store (the default backend)"""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class NullBackend:
+    """Caches nothing; select with RESPONSE_CACHE_BACKEND=none"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+
+BACKENDS = {
+    'lru': LRUBackend,
+    'none': NullBackend,
+}
+
+
+class ResponseCache:
+    """
+    Caches successful GET responses of decorated views.
+
+    Any object with get(key), set(key, value) and clear() can serve as
+    backend; keys are strings and values are (body, status, mimetype,
+    stored_at) tuples. Invalidation bumps a per-endpoint generation that
+    is part of the key, so backends never need to enumerate keys.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or BACKENDS[os.getenv('RESPONSE_CACHE_BACKEND', 'lru')]()
+        self.dependencies = {}   # view name -> {table: columns or None}
+        self.generations = {}    # view name -> generation
+        self.lock = threading.Lock()
+
+    def set_backend(self, backend):
+        self.backend = backend
+
+    def cached(self, depends_on=None):
+        """
+        Decorator caching a view's GET responses.
+
+        Args:
+            depends_on: {table name: column names or None for any column};
+                inserts, deletes and bulk writes on a table always invalidate,
+                updates only when they touch one of the listed columns
+        """
+        def decorator(view):
+            endpoint = f'{view.__module__}.{view.__qualname__}'
+            self.dependencies[endpoint] = {table: set(columns) if columns else None
+                                           for table, columns in (depends_on or {}).items()}
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                key = self.key(endpoint, kwargs)
+                entry = self.backend.get(key)
+                if entry is not None and time.monotonic() - entry[3] < CACHE_TTL:
+                    body, status, mimetype, _ = entry
+                    return current_app.response_class(body, status=status, mimetype=mimetype)
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    self.backend.set(key, (response.get_data(), response.status_code,
+                                           response.mimetype, time.monotonic()))
+                return response
+            return wrapper
+        return decorator
+
+    def key(self, endpoint, view_args):
+        """
+        View name, generation, URL arguments and the sorted query args.
+
+        Args are used exactly as sent: views see the raw values, so
+        ?type=%20 must not share an entry with no type at all.
+        """
+        args = sorted(request.args.items(multi=True))
+        with self.lock:
+            generation = self.generations.get(endpoint, 0)
+        return f'{endpoint}:{generation}:{urlencode(sorted(view_args.items()))}?{urlencode(args)}'
+
+    def invalidate(self, endpoint):
+        with self.lock:
+            self.generations[endpoint] = self.generations.get(endpoint, 0) + 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def apply(self, changes):
+        """Invalidate the endpoints whose tables/columns a commit touched"""
+        for endpoint, tables in self.dependencies.items():
+            for change in changes:
+                if change['table'] not in tables:
+                    continue
+                columns = tables[change['table']]
+                if change['op'] != 'update' or columns is None or change['changed'] & columns:
+                    self.invalidate(endpoint)
+                    break
+
+
+response_cache = ResponseCache()
+cached = response_cache.cached
+
+
+@on_commit
+def _invalidate(changes):
+    response_cache.apply(changes)
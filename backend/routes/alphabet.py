@@ -2,10 +2,12 @@ from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from models import Alphabet
 from database import db
+from response_cache import cached
 
 bp = Blueprint('alphabet', __name__, url_prefix='/api/alphabet')
 
 @bp.route('/', methods=['GET', 'POST'])
+@cached({'alphabet': None})
 def get_or_create_alphabet():
     if request.method == 'GET':
         letter_type = request.args.get('type')
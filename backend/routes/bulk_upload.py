@@ -1,10 +1,14 @@
-from flask import Blueprint, request, jsonify
+from functools import partial
+from flask import Blueprint, request, jsonify, url_for
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-import csv
-import io
-from models import Dictionary, Phrase, Video, PDFResource, Playlist, Alphabet
+from models import Dictionary, Phrase, Video, PDFResource, Playlist, Alphabet, BulkJob
 from database import db
+from transliteration import romanize_many
+from validation import validate_many, DICTIONARY_SCHEMA, PHRASE_SCHEMA, ALPHABET_SCHEMA, VIDEO_SCHEMA
+from bulk_import import (read_csv, read_csv_chunks, map_chunks, insert_rows, upsert_rows, supports_upsert, existing_rows,
+                         ImportProgress, new_report, report_row, report_error)
+from bulk_jobs import jobs, job_status, FINISHED
 
 bp = Blueprint('bulk_upload', __name__, url_prefix='/api/bulk')
 
@@ -13,6 +17,14 @@ ALLOWED_EXTENSIONS = {'csv'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def fill_romanized(chunk):
+    """Fill empty 'romanized' values of a chunk from 'nepali' in one batch; returns the indexes filled"""
+    missing = [index for index, (_, row) in enumerate(chunk)
+               if not (row.get('romanized') or '').strip() and (row.get('nepali') or '').strip()]
+    for index, romanized in zip(missing, romanize_many([chunk[index][1]['nepali'].strip() for index in missing])):
+        chunk[index][1]['romanized'] = romanized
+    return missing
+
 # ===== VALIDATION ENDPOINT (Check before upload) =====
 @bp.route('/validate/<resource_type>', methods=['POST'])
 def validate_csv(resource_type):
@@ -28,505 +40,320 @@ def validate_csv(resource_type):
     if not allowed_file(file.filename):
         return jsonify({'error': 'Only CSV files allowed'}), 400
     
+    if resource_type not in UPLOADS:
+        return jsonify({'error': 'Invalid resource type'}), 400
+    
     try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        # Validate based on resource type
-        if resource_type == 'dictionary':
-            validation_result = validate_dictionary(csv_reader)
-        elif resource_type == 'phrases':
-            validation_result = validate_phrases(csv_reader)
-        elif resource_type == 'alphabet':
-            validation_result = validate_alphabet(csv_reader)
-        elif resource_type == 'videos':
-            validation_result = validate_videos(csv_reader)
-        else:
-            return jsonify({'error': 'Invalid resource type'}), 400
-        
-        return jsonify(validation_result), 200
-        
+        return jsonify(validate_rows(resource_type, read_csv_chunks(file.stream))), 200
+    
     except Exception as e:
         return jsonify({'error': f'Validation failed: {str(e)}'}), 500
 
-def validate_dictionary(csv_reader):
-    """Validate dictionary CSV"""
-    result = {
-        'valid': [],
-        'duplicates': [],
-        'errors': [],
-        'total_rows': 0,
-        'valid_count': 0,
-        'duplicate_count': 0,
-        'error_count': 0
-    }
-    
-    # Get all existing words for fast lookup
-    existing_words = {word.nepali.strip().lower(): word for word in Dictionary.query.all()}
+def validate_rows(resource_type, chunks, workers=None):
+    """
+    Validation report for CSV chunks of a resource.
+
+    The row checks run in parallel across chunks (see check_chunk); the
+    duplicate checks need the database and the rows seen so far, so they
+    run here as the checked chunks come back in row order.
+    """
+    spec = UPLOADS[resource_type]
+    result = new_report()
+    if spec['romanize']:
+        result['romanized_filled'] = 0
     seen_in_csv = set()
     
-    for row_num, row in enumerate(csv_reader, start=2):
-        result['total_rows'] += 1
+    # Workers get a copy of each chunk and send back only what they found
+    for chunk, (romanized, checks) in map_chunks(partial(check_chunk, resource_type), chunks, workers):
+        for index, value in romanized:
+            chunk[index][1]['romanized'] = value
+        if spec['romanize']:
+            result['romanized_filled'] += len(romanized)
+        # Existing rows for this chunk only (indexed lookup)
+        stored = existing_in_chunk(resource_type, chunk, spec['shown'])
         
-        try:
-            # Required fields validation
-            required_fields = ['nepali', 'romanized', 'english']
-            missing_fields = [field for field in required_fields if not row.get(field, '').strip()]
+        for (row_num, row), (error, late_error) in zip(chunk, checks):
+            result['total_rows'] += 1
             
-            if missing_fields:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': f"Missing required fields: {', '.join(missing_fields)}"
-                })
-                result['error_count'] += 1
+            if error:
+                report_row(result, 'errors', row_num, row, error)
                 continue
             
-            nepali_word = row['nepali'].strip().lower()
+            key = duplicate_key(spec, [row[column] for column in spec['key']])
             
             # Check database duplicates
-            if nepali_word in existing_words:
-                existing = existing_words[nepali_word]
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'existing': {
-                        'nepali': existing.nepali,
-                        'romanized': existing.romanized,
-                        'english': existing.english,
-                        'id': existing.id
-                    },
-                    'reason': 'Already exists in database'
-                })
-                result['duplicate_count'] += 1
+            if key in stored:
+                existing = stored[key]
+                report_row(result, 'duplicates', row_num, row, 'Already exists in database',
+                           existing={column: getattr(existing, column) for column in spec['shown']})
                 continue
             
             # Check CSV internal duplicates
-            if nepali_word in seen_in_csv:
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Duplicate within CSV file'
-                })
-                result['duplicate_count'] += 1
+            if key in seen_in_csv:
+                report_row(result, 'duplicates', row_num, row, 'Duplicate within CSV file')
                 continue
             
-            # Validate difficulty level
-            try:
-                difficulty = int(row.get('difficulty', 1))
-                if difficulty not in [1, 2, 3]:
-                    result['errors'].append({
-                        'row': row_num,
-                        'data': row,
-                        'reason': 'Difficulty must be 1, 2, or 3'
-                    })
-                    result['error_count'] += 1
-                    continue
-            except ValueError:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Difficulty must be a number (1, 2, or 3)'
-                })
-                result['error_count'] += 1
+            if late_error:
+                report_row(result, 'errors', row_num, row, late_error)
                 continue
             
             # Valid entry
-            seen_in_csv.add(nepali_word)
-            result['valid'].append({
-                'row': row_num,
-                'data': row
-            })
-            result['valid_count'] += 1
-            
-        except Exception as e:
-            result['errors'].append({
-                'row': row_num,
-                'data': row,
-                'reason': str(e)
-            })
-            result['error_count'] += 1
+            seen_in_csv.add(key)
+            report_row(result, 'valid', row_num, row)
     
     return result
 
-def validate_phrases(csv_reader):
-    """Validate phrases CSV"""
-    result = {
-        'valid': [],
-        'duplicates': [],
-        'errors': [],
-        'total_rows': 0,
-        'valid_count': 0,
-        'duplicate_count': 0,
-        'error_count': 0
-    }
-    
-    # Get existing phrases
-    existing_phrases = {(p.nepali.strip().lower(), p.english.strip().lower()): p 
-                       for p in Phrase.query.all()}
-    seen_in_csv = set()
-    
-    for row_num, row in enumerate(csv_reader, start=2):
-        result['total_rows'] += 1
-        
+# ===== ROW CHECKS =====
+# Checks that need no database, run on a process pool by check_chunk().
+# Each gets a row and its validate_many() content errors and returns
+# (error, late_error): error is reported before the duplicate checks,
+# late_error only when the row is not a duplicate.
+def missing_fields(row, fields):
+    missing = [field for field in fields if not row.get(field, '').strip()]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+
+def difficulty_error(value, not_a_number='Difficulty must be a number'):
+    try:
+        if int(value) not in [1, 2, 3]:
+            return 'Difficulty must be 1, 2, or 3'
+    except ValueError:
+        return not_a_number
+
+def check_dictionary_row(row, content_errors):
+    error = missing_fields(row, ['nepali', 'romanized', 'english']) or '; '.join(content_errors)
+    if error:
+        return error, None
+    return None, difficulty_error(row.get('difficulty', 1), 'Difficulty must be a number (1, 2, or 3)')
+
+def check_phrase_row(row, content_errors):
+    error = missing_fields(row, ['nepali', 'romanized', 'english']) or '; '.join(content_errors)
+    if error:
+        return error, None
+    return None, difficulty_error(row.get('difficulty', 1))
+
+def check_alphabet_row(row, content_errors):
+    error = missing_fields(row, ['devanagari', 'romanized', 'sound', 'type']) or '; '.join(content_errors)
+    if not error and row['type'].strip().lower() not in ['vowel', 'consonant']:
+        error = 'Type must be "vowel" or "consonant"'
+    return error or None, None
+
+def check_video_row(row, content_errors):
+    error = missing_fields(row, ['title', 'youtube_id']) or '; '.join(content_errors)
+    # Validate YouTube ID format (basic check)
+    if not error and len(row['youtube_id'].strip()) != 11:
+        error = 'YouTube ID must be 11 characters'
+    if error:
+        return error, None
+    return None, difficulty_error(row['difficulty']) if row.get('difficulty') else None
+
+def check_chunk(resource_type, chunk):
+    """
+    Fill in romanized values and run the row checks of one chunk.
+    Returns ([(row index, romanized value filled)], [(error, late_error) per row]).
+    """
+    spec = UPLOADS[resource_type]
+    romanized = []
+    if spec['romanize']:
+        romanized = [(index, chunk[index][1]['romanized']) for index in fill_romanized(chunk)]
+    # CSV values are strings (or None for short rows), which validate_many() accepts
+    rows = [row for _, row in chunk]
+    checks = []
+    for row, content_errors in zip(rows, validate_many(rows, spec['schema'])):
         try:
-            required_fields = ['nepali', 'romanized', 'english']
-            missing_fields = [field for field in required_fields if not row.get(field, '').strip()]
-            
-            if missing_fields:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': f"Missing required fields: {', '.join(missing_fields)}"
-                })
-                result['error_count'] += 1
-                continue
-            
-            phrase_key = (row['nepali'].strip().lower(), row['english'].strip().lower())
-            
-            # Check database duplicates
-            if phrase_key in existing_phrases:
-                existing = existing_phrases[phrase_key]
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'existing': {
-                        'nepali': existing.nepali,
-                        'romanized': existing.romanized,
-                        'english': existing.english,
-                        'id': existing.id
-                    },
-                    'reason': 'Already exists in database'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            # Check CSV internal duplicates
-            if phrase_key in seen_in_csv:
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Duplicate within CSV file'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            # Validate difficulty
-            try:
-                difficulty = int(row.get('difficulty', 1))
-                if difficulty not in [1, 2, 3]:
-                    result['errors'].append({
-                        'row': row_num,
-                        'data': row,
-                        'reason': 'Difficulty must be 1, 2, or 3'
-                    })
-                    result['error_count'] += 1
-                    continue
-            except ValueError:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Difficulty must be a number'
-                })
-                result['error_count'] += 1
-                continue
-            
-            seen_in_csv.add(phrase_key)
-            result['valid'].append({
-                'row': row_num,
-                'data': row
-            })
-            result['valid_count'] += 1
-            
+            checks.append(spec['check'](row, content_errors))
         except Exception as e:
-            result['errors'].append({
-                'row': row_num,
-                'data': row,
-                'reason': str(e)
-            })
-            result['error_count'] += 1
-    
-    return result
+            checks.append((str(e), None))
+    return romanized, checks
 
-def validate_alphabet(csv_reader):
-    """Validate alphabet CSV"""
-    result = {
-        'valid': [],
-        'duplicates': [],
-        'errors': [],
-        'total_rows': 0,
-        'valid_count': 0,
-        'duplicate_count': 0,
-        'error_count': 0
+# ===== UPLOAD ENDPOINTS =====
+# Row -> column values for each resource (a missing required column raises KeyError)
+def dictionary_values(row):
+    return {
+        'nepali': row['nepali'].strip(),
+        'romanized': row['romanized'].strip(),
+        'english': row['english'].strip(),
+        'part_of_speech': row.get('part_of_speech', '').strip() or None,
+        'usage_example': row.get('usage_example', '').strip() or None,
+        'nepali_example': row.get('nepali_example', '').strip() or None,
+        'category': row.get('category', 'general').strip(),
+        'difficulty': int(row.get('difficulty', 1)),
+        'synonyms': row.get('synonyms', '').strip() or None,
+        'antonyms': row.get('antonyms', '').strip() or None,
     }
-    
-    existing_letters = {letter.devanagari.strip(): letter for letter in Alphabet.query.all()}
-    seen_in_csv = set()
-    
-    for row_num, row in enumerate(csv_reader, start=2):
-        result['total_rows'] += 1
-        
-        try:
-            required_fields = ['devanagari', 'romanized', 'sound', 'type']
-            missing_fields = [field for field in required_fields if not row.get(field, '').strip()]
-            
-            if missing_fields:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': f"Missing required fields: {', '.join(missing_fields)}"
-                })
-                result['error_count'] += 1
-                continue
-            
-            devanagari = row['devanagari'].strip()
-            letter_type = row['type'].strip().lower()
-            
-            # Validate type
-            if letter_type not in ['vowel', 'consonant']:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Type must be "vowel" or "consonant"'
-                })
-                result['error_count'] += 1
-                continue
-            
-            # Check database duplicates
-            if devanagari in existing_letters:
-                existing = existing_letters[devanagari]
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'existing': {
-                        'devanagari': existing.devanagari,
-                        'romanized': existing.romanized,
-                        'type': existing.type,
-                        'id': existing.id
-                    },
-                    'reason': 'Already exists in database'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            # Check CSV internal duplicates
-            if devanagari in seen_in_csv:
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Duplicate within CSV file'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            seen_in_csv.add(devanagari)
-            result['valid'].append({
-                'row': row_num,
-                'data': row
-            })
-            result['valid_count'] += 1
-            
-        except Exception as e:
-            result['errors'].append({
-                'row': row_num,
-                'data': row,
-                'reason': str(e)
-            })
-            result['error_count'] += 1
-    
-    return result
 
-def validate_videos(csv_reader):
-    """Validate videos CSV"""
-    result = {
-        'valid': [],
-        'duplicates': [],
-        'errors': [],
-        'total_rows': 0,
-        'valid_count': 0,
-        'duplicate_count': 0,
-        'error_count': 0
+def phrase_values(row):
+    return {
+        'nepali': row['nepali'].strip(),
+        'romanized': row['romanized'].strip(),
+        'english': row['english'].strip(),
+        'category': row.get('category', 'general').strip(),
+        'difficulty': int(row.get('difficulty', 1)),
+        'audio_url': row.get('audio_url', '').strip() or None
     }
-    
-    existing_videos = {video.youtube_id.strip(): video for video in Video.query.all()}
-    seen_in_csv = set()
-    
-    for row_num, row in enumerate(csv_reader, start=2):
-        result['total_rows'] += 1
-        
+
+def alphabet_values(row):
+    return {
+        'devanagari': row['devanagari'].strip(),
+        'romanized': row['romanized'].strip(),
+        'sound': row['sound'].strip(),
+        'type': row['type'].strip(),
+        'pronunciation': row.get('pronunciation', '').strip() or None,
+        'audio_url': row.get('audio_url', '').strip() or None,
+        'order_index': int(row.get('order_index', 0)) if row.get('order_index') else None
+    }
+
+def video_values(row):
+    return {
+        'title': row['title'].strip(),
+        'youtube_id': row['youtube_id'].strip(),
+        'description': row.get('description', '').strip() or None,
+        'category': row.get('category', 'general').strip(),
+        'difficulty': int(row.get('difficulty', 1)) if row.get('difficulty') else 1,
+        'duration': int(row.get('duration', 0)) if row.get('duration') else None,
+        'thumbnail_url': row.get('thumbnail_url', '').strip() or None,
+    }
+
+# model: target table
+# key: columns identifying a duplicate; fold_case: compare them case-insensitively
+# values: row -> column values; romanize: fill an empty 'romanized' from 'nepali'
+# upsert: key is a single unique column, so mode=upsert can update rows in place
+# check, schema: row checks and validation.py content rules for /validate
+# shown: columns of an existing duplicate that /validate reports
+UPLOADS = {
+    'dictionary': {'model': Dictionary, 'key': ('nepali',), 'fold_case': True,
+                   'values': dictionary_values, 'romanize': True, 'noun': 'word', 'upsert': True,
+                   'check': check_dictionary_row, 'schema': DICTIONARY_SCHEMA, 'shown': ('nepali', 'romanized', 'english', 'id')},
+    'phrases': {'model': Phrase, 'key': ('nepali', 'english'), 'fold_case': True,
+                'values': phrase_values, 'romanize': True, 'noun': 'phrase', 'upsert': False,
+                'check': check_phrase_row, 'schema': PHRASE_SCHEMA, 'shown': ('nepali', 'romanized', 'english', 'id')},
+    'alphabet': {'model': Alphabet, 'key': ('devanagari',), 'fold_case': False,
+                 'values': alphabet_values, 'romanize': False, 'noun': 'letter', 'upsert': True,
+                 'check': check_alphabet_row, 'schema': ALPHABET_SCHEMA, 'shown': ('devanagari', 'romanized', 'type', 'id')},
+    'videos': {'model': Video, 'key': ('youtube_id',), 'fold_case': False,
+               'values': video_values, 'romanize': False, 'noun': 'video', 'upsert': True,
+               'check': check_video_row, 'schema': VIDEO_SCHEMA, 'shown': ('title', 'youtube_id', 'id')},
+}
+
+UPLOAD_MODES = ('insert', 'upsert')
+
+def duplicate_key(spec, values, fold_case=None):
+    """Normalized duplicate key of a row's column values (or of a key column tuple)"""
+    if isinstance(values, dict):
+        values = [values[column] for column in spec['key']]
+    if spec['fold_case'] if fold_case is None else fold_case:
+        return tuple(value.strip().lower() for value in values)
+    return tuple(value.strip() for value in values)
+
+def existing_in_chunk(resource_type, chunk, columns=()):
+    """Stored rows matching the duplicate keys of a chunk, as {key tuple: row}"""
+    spec = UPLOADS[resource_type]
+    keys = set()
+    for _, row in chunk:
         try:
-            required_fields = ['title', 'youtube_id']
-            missing_fields = [field for field in required_fields if not row.get(field, '').strip()]
-            
-            if missing_fields:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': f"Missing required fields: {', '.join(missing_fields)}"
-                })
-                result['error_count'] += 1
-                continue
-            
-            youtube_id = row['youtube_id'].strip()
-            
-            # Validate YouTube ID format (basic check)
-            if len(youtube_id) != 11:
-                result['errors'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'YouTube ID must be 11 characters'
-                })
-                result['error_count'] += 1
-                continue
-            
-            # Check database duplicates
-            if youtube_id in existing_videos:
-                existing = existing_videos[youtube_id]
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'existing': {
-                        'title': existing.title,
-                        'youtube_id': existing.youtube_id,
-                        'id': existing.id
-                    },
-                    'reason': 'Already exists in database'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            # Check CSV internal duplicates
-            if youtube_id in seen_in_csv:
-                result['duplicates'].append({
-                    'row': row_num,
-                    'data': row,
-                    'reason': 'Duplicate within CSV file'
-                })
-                result['duplicate_count'] += 1
-                continue
-            
-            # Validate difficulty if provided
-            if row.get('difficulty'):
-                try:
-                    diff = int(row['difficulty'])
-                    if diff not in [1, 2, 3]:
-                        result['errors'].append({
-                            'row': row_num,
-                            'data': row,
-                            'reason': 'Difficulty must be 1, 2, or 3'
-                        })
-                        result['error_count'] += 1
-                        continue
-                except ValueError:
-                    result['errors'].append({
-                        'row': row_num,
-                        'data': row,
-                        'reason': 'Difficulty must be a number'
-                    })
-                    result['error_count'] += 1
-                    continue
-            
-            seen_in_csv.add(youtube_id)
-            result['valid'].append({
-                'row': row_num,
-                'data': row
-            })
-            result['valid_count'] += 1
-            
-        except Exception as e:
-            result['errors'].append({
-                'row': row_num,
-                'data': row,
-                'reason': str(e)
-            })
-            result['error_count'] += 1
-    
-    return result
+            keys.add(duplicate_key(spec, [row[column] for column in spec['key']]))
+        except (KeyError, AttributeError):
+            pass  # missing key fields are reported by the row checks
+    return existing_rows(spec['model'], spec['key'], spec['fold_case'], keys, columns)
 
-# ===== UPLOAD ENDPOINTS =====
-@bp.route('/dictionary', methods=['POST'])
-def upload_dictionary():
-    """Upload dictionary words from CSV"""
-    # Only admins can bulk upload
-    if not current_user.is_authenticated or not current_user.is_admin():
-        return jsonify({'error': 'Admin access required'}), 403
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
-    
-    file = request.files['file']
-    skip_duplicates = request.form.get('skip_duplicates', 'true').lower() == 'true'
+def upload_rows(resource_type, chunks, skip_duplicates=True, mode='insert', progress=None, header=None):
+    """
+    Validate and write CSV chunks of a resource, one transaction per chunk.
+
+    mode='insert' adds new rows and skips (or reports) existing ones.
+    mode='upsert' also updates existing rows matched on the unique key;
+    rows that would not change are left untouched; only the columns in
+    header (the CSV's field names; all columns if None) are compared and
+    written. Rows failing the validation.py content checks are reported
+    as errors and not written.
+
+    progress (an ImportProgress) is told about every written chunk and can
+    stop the upload between chunks; chunks already written stay.
+    Returns the upload summary: added/skipped/error counts plus throughput.
+    """
+    spec = UPLOADS[resource_type]
+    model = spec['model']
+    upsert = mode == 'upsert'
+    summary = {'success': True, 'added': 0, 'skipped': 0, 'errors': [], 'error_count': 0}
+    if upsert:
+        summary.update({'mode': mode, 'updated': 0, 'unchanged': 0})
+        # Columns missing from the file keep their stored values; romanized is
+        # filled from nepali when the file has none
+        file_columns = None if header is None else set(header) | ({'romanized'} if spec['romanize'] else set())
+    if spec['romanize']:
+        summary['romanized_filled'] = 0
     
-    if not allowed_file(file.filename):
-        return jsonify({'error': 'Only CSV files allowed'}), 400
+    # Keys seen earlier in the file. In upsert mode stored rows are matched by
+    # upsert_rows() on the exact key, like the unique constraint ON CONFLICT uses.
+    seen_keys = set()
+    progress = progress or ImportProgress()
     
-    try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
+    for chunk in chunks:
+        if spec['romanize']:
+            summary['romanized_filled'] += len(fill_romanized(chunk))
+        existing_keys = set() if upsert else existing_in_chunk(resource_type, chunk)
+        # Same content rules as /validate and the add/edit routes
+        content = validate_many([row for _, row in chunk], spec['schema'])
         
-        added = 0
-        errors = []
-        skipped = 0
-        
-        # Get existing words for fast lookup
-        existing_words = {word.nepali.strip().lower() for word in Dictionary.query.all()}
-        
-        for row_num, row in enumerate(csv_reader, start=2):
+        rows = []
+        for (row_num, row), content_errors in zip(chunk, content):
+            if content_errors:
+                summary['error_count'] += 1
+                report_error(summary['errors'], f"Row {row_num}: {'; '.join(content_errors)}")
+                continue
+            
             try:
-                nepali_word = row['nepali'].strip()
+                values = spec['values'](row)
+                key = duplicate_key(spec, values, fold_case=False if upsert else None)
                 
                 # Check for duplicates
-                if nepali_word.lower() in existing_words:
+                if key in existing_keys or key in seen_keys:
                     if skip_duplicates:
-                        skipped += 1
-                        continue
+                        summary['skipped'] += 1
                     else:
-                        errors.append(f"Row {row_num}: Duplicate word '{nepali_word}'")
-                        continue
-                
-                word = Dictionary(
-                    nepali=nepali_word,
-                    romanized=row['romanized'].strip(),
-                    english=row['english'].strip(),
-                    part_of_speech=row.get('part_of_speech', '').strip() or None,
-                    usage_example=row.get('usage_example', '').strip() or None,
-                    nepali_example=row.get('nepali_example', '').strip() or None,
-                    category=row.get('category', 'general').strip(),
-                    difficulty=int(row.get('difficulty', 1)),
-                    synonyms=row.get('synonyms', '').strip() or None,
-                    antonyms=row.get('antonyms', '').strip() or None,
-                )
+                        summary['error_count'] += 1
+                        report_error(summary['errors'], f"Row {row_num}: Duplicate {spec['noun']} '{values[spec['key'][0]]}'")
+                    continue
                 
-                db.session.add(word)
-                existing_words.add(nepali_word.lower())
-                added += 1
+                rows.append(values)
+                seen_keys.add(key)
                 
-                if added % 100 == 0:
-                    db.session.commit()
-                    
             except KeyError as e:
-                errors.append(f"Row {row_num}: Missing required field {str(e)}")
+                summary['error_count'] += 1
+                report_error(summary['errors'], f"Row {row_num}: Missing required field {str(e)}")
             except ValueError as e:
-                errors.append(f"Row {row_num}: Invalid value - {str(e)}")
+                summary['error_count'] += 1
+                report_error(summary['errors'], f"Row {row_num}: Invalid value - {str(e)}")
             except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-        
-        db.session.commit()
+                summary['error_count'] += 1
+                report_error(summary['errors'], f"Row {row_num}: {str(e)}")
         
-        return jsonify({
-            'success': True,
-            'added': added,
-            'skipped': skipped,
-            'errors': errors
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+        if upsert:
+            columns = None
+            if rows and file_columns is not None:
+                columns = [column for column in rows[0] if column in file_columns]
+            inserted, updated, unchanged = upsert_rows(model, spec['key'][0], rows, columns)
+            summary['added'] += inserted
+            summary['updated'] += updated
+            summary['unchanged'] += unchanged
+        else:
+            insert_rows(model, rows)
+            summary['added'] += len(rows)
+        progress.add(len(chunk), summary)
+        if progress.cancelled():
+            summary['cancelled'] = True
+            break
+    
+    summary.update(progress.summary())
+    return summary
 
-@bp.route('/phrases', methods=['POST'])
-def upload_phrases():
-    """Upload phrases from CSV"""
+def upload_csv(resource_type):
+    """
+    Shared handler of the upload endpoints.
+
+    With background=true the file is queued as a job (see bulk_jobs.py) and
+    the response is 202 with the job status; poll status_url for progress.
+    """
     # Only admins can bulk upload
     if not current_user.is_authenticated or not current_user.is_admin():
         return jsonify({'error': 'Admin access required'}), 403
@@ -535,186 +362,89 @@ def upload_phrases():
         return jsonify({'error': 'No file provided'}), 400
     
     file = request.files['file']
+    skip_duplicates = request.form.get('skip_duplicates', 'true').lower() == 'true'
+    mode = request.form.get('mode', 'insert').lower()
+    background = request.form.get('background', 'false').lower() == 'true'
+    
     if not allowed_file(file.filename):
         return jsonify({'error': 'Only CSV files allowed'}), 400
+    if mode not in UPLOAD_MODES:
+        return jsonify({'error': f"mode must be one of: {', '.join(UPLOAD_MODES)}"}), 400
+    if mode == 'upsert' and not UPLOADS[resource_type]['upsert']:
+        return jsonify({'error': f'Upsert is not supported for {resource_type} (no unique key)'}), 400
+    if mode == 'upsert' and not supports_upsert():
+        return jsonify({'error': 'Upsert is not supported by this database'}), 400
     
-    try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
+    if background:
+        def run_upload(stream, progress):
+            header, chunks = read_csv(stream)
+            return upload_rows(resource_type, chunks, skip_duplicates, mode, progress, header)
         
-        added = 0
-        errors = []
-        skipped = 0
-        
-        existing_phrases = {(p.nepali.strip().lower(), p.english.strip().lower()) 
-                           for p in Phrase.query.all()}
-        
-        for row_num, row in enumerate(csv_reader, start=2):
-            try:
-                phrase_key = (row['nepali'].strip().lower(), row['english'].strip().lower())
-                
-                if phrase_key in existing_phrases:
-                    skipped += 1
-                    continue
-                
-                phrase = Phrase(
-                    nepali=row['nepali'].strip(),
-                    romanized=row['romanized'].strip(),
-                    english=row['english'].strip(),
-                    category=row.get('category', 'general').strip(),
-                    difficulty=int(row.get('difficulty', 1)),
-                    audio_url=row.get('audio_url', '').strip() or None
-                )
-                
-                db.session.add(phrase)
-                existing_phrases.add(phrase_key)
-                added += 1
-                
-                if added % 100 == 0:
-                    db.session.commit()
-                    
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-        
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'added': added,
-            'skipped': skipped,
-            'errors': errors
-        }), 200
+        try:
+            job = jobs.submit(file, run_upload, resource_type=resource_type, mode=mode,
+                              skip_duplicates=skip_duplicates, created_by=current_user.username)
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': f'Could not queue upload: {str(e)}'}), 500
         
+        status_url = url_for('bulk_upload.get_job', job_id=job.id)
+        return jsonify({**job_status(job), 'status_url': status_url}), 202, {'Location': status_url}
+    
+    try:
+        header, chunks = read_csv(file.stream)
+        return jsonify(upload_rows(resource_type, chunks, skip_duplicates, mode, header=header)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+@bp.route('/dictionary', methods=['POST'])
+def upload_dictionary():
+    """Upload dictionary words from CSV"""
+    return upload_csv('dictionary')
+
+@bp.route('/phrases', methods=['POST'])
+def upload_phrases():
+    """Upload phrases from CSV"""
+    return upload_csv('phrases')
+
 @bp.route('/alphabet', methods=['POST'])
 def upload_alphabet():
     """Upload alphabet letters from CSV"""
-    # Only admins can bulk upload
-    if not current_user.is_authenticated or not current_user.is_admin():
-        return jsonify({'error': 'Admin access required'}), 403
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
-    
-    file = request.files['file']
-    if not allowed_file(file.filename):
-        return jsonify({'error': 'Only CSV files allowed'}), 400
-    
-    try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        added = 0
-        errors = []
-        skipped = 0
-        
-        existing_letters = {letter.devanagari.strip() for letter in Alphabet.query.all()}
-        
-        for row_num, row in enumerate(csv_reader, start=2):
-            try:
-                devanagari = row['devanagari'].strip()
-                
-                if devanagari in existing_letters:
-                    skipped += 1
-                    continue
-                
-                letter = Alphabet(
-                    devanagari=devanagari,
-                    romanized=row['romanized'].strip(),
-                    sound=row['sound'].strip(),
-                    type=row['type'].strip(),
-                    pronunciation=row.get('pronunciation', '').strip() or None,
-                    audio_url=row.get('audio_url', '').strip() or None,
-                    order_index=int(row.get('order_index', 0)) if row.get('order_index') else None
-                )
-                
-                db.session.add(letter)
-                existing_letters.add(devanagari)
-                added += 1
-                
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-        
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'added': added,
-            'skipped': skipped,
-            'errors': errors
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+    return upload_csv('alphabet')
 
 @bp.route('/videos', methods=['POST'])
 def upload_videos():
     """Upload YouTube videos from CSV"""
-    # Only admins can bulk upload
+    return upload_csv('videos')
+
+# ===== BACKGROUND UPLOAD JOBS =====
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Progress of a background upload: rows processed, throughput, ETA and errors"""
     if not current_user.is_authenticated or not current_user.is_admin():
         return jsonify({'error': 'Admin access required'}), 403
     
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
+    job = BulkJob.query.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
     
-    file = request.files['file']
-    if not allowed_file(file.filename):
-        return jsonify({'error': 'Only CSV files allowed'}), 400
+    return jsonify(job_status(job)), 200
+
+@bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a background upload; rows written before it stops are kept"""
+    if not current_user.is_authenticated or not current_user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
     
-    try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        added = 0
-        errors = []
-        skipped = 0
-        
-        existing_videos = {video.youtube_id.strip() for video in Video.query.all()}
-        
-        for row_num, row in enumerate(csv_reader, start=2):
-            try:
-                youtube_id = row['youtube_id'].strip()
-                
-                if youtube_id in existing_videos:
-                    skipped += 1
-                    continue
-                
-                video = Video(
-                    title=row['title'].strip(),
-                    youtube_id=youtube_id,
-                    description=row.get('description', '').strip() or None,
-                    category=row.get('category', 'general').strip(),
-                    difficulty=int(row.get('difficulty', 1)) if row.get('difficulty') else 1,
-                    duration=int(row.get('duration', 0)) if row.get('duration') else None,
-                    thumbnail_url=row.get('thumbnail_url', '').strip() or None,
-                )
-                
-                db.session.add(video)
-                existing_videos.add(youtube_id)
-                added += 1
-                
-                if added % 50 == 0:
-                    db.session.commit()
-                    
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-        
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'added': added,
-            'skipped': skipped,
-            'errors': errors
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+    job = BulkJob.query.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status in FINISHED or not jobs.cancel(job_id):
+        db.session.refresh(job)
+        return jsonify({'error': f'Job already {job.status}'}), 409
+    
+    db.session.refresh(job)
+    return jsonify(job_status(job)), 200
 
 # ===== DOWNLOAD CSV TEMPLATES =====
 @bp.route('/template/<resource_type>', methods=['GET'])
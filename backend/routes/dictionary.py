@@ -3,11 +3,29 @@ from flask_login import login_required, current_user
 from models import Dictionary
 from database import db
 from validation import validate_dictionary_entry, validation_error_response
+from search_fts import match_ids
+from search_trigram import contains_ids
+from search_ranking import top_k, top_k_across, filter_ids, fetch_ranked, OTHER_FIELD_SCORE
+from search_trie import autocomplete, MAX_SUGGESTIONS
+from search_fuzzy import fuzzy_search, MAX_EDIT_DISTANCE
+from pagination import paginate_query
+from projection import project, row_serializer
+from counters import counters
+from trending import trending, DEFAULT_WINDOW
+from response_cache import cached
+from table_versions import conditional
 
 bp = Blueprint('dictionary', __name__, url_prefix='/api/dictionary')
 
+# Columns serialized by list and search endpoints (see projection.py)
+LIST_COLUMNS = ('nepali', 'romanized', 'english', 'part_of_speech', 'difficulty',
+                'category', 'audio_url', 'views')
+SEARCH_COLUMNS = ('nepali', 'romanized', 'english', 'category', 'difficulty')
+serialize_list_word = row_serializer(('id',) + LIST_COLUMNS)
+
 # Get all words with pagination
 @bp.route('/', methods=['GET', 'POST'])
+@conditional('dictionary')
 def get_or_create_words():
     if request.method == 'GET':
         # Pagination
@@ -15,6 +33,7 @@ def get_or_create_words():
         per_page = request.args.get('per_page', 20, type=int)
         difficulty = request.args.get('difficulty', type=int)
         category = request.args.get('category', type=str)
+        cursor = request.args.get('cursor')
         
         query = Dictionary.query
         
@@ -22,27 +41,23 @@ def get_or_create_words():
             query = query.filter_by(difficulty=difficulty)
         if category:
             query = query.filter_by(category=category)
+        query = project(query, Dictionary, LIST_COLUMNS)
         
         # Order by custom order_index (for drag-drop reordering)
-        query = query.order_by(Dictionary.order_index)
+        try:
+            words, page_info = paginate_query(
+                query, Dictionary, {'difficulty': difficulty, 'category': category},
+                page, per_page, cursor, order_by=Dictionary.order_index
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
         
-        paginated = query.paginate(page=page, per_page=per_page)
+        if cursor is None:
+            page_info['current_page'] = page
         
         return jsonify({
-            'words': [{
-                'id': w.id,
-                'nepali': w.nepali,
-                'romanized': w.romanized,
-                'english': w.english,
-                'part_of_speech': w.part_of_speech,
-                'difficulty': w.difficulty,
-                'category': w.category,
-                'audio_url': w.audio_url,
-                'views': w.views
-            } for w in paginated.items],
-            'total': paginated.total,
-            'pages': paginated.pages,
-            'current_page': page
+            'words': [serialize_list_word(w) for w in words],
+            **page_info
         })
     
     elif request.method == 'POST':
@@ -89,15 +104,21 @@ def get_or_create_words():
             db.session.rollback()
             return jsonify({'success': False, 'error': str(e)}), 400
 
+def count_unmodified_view(word_id):
+    """Count a view answered with 304; False for a missing word, so the view can 404"""
+    if db.session.query(Dictionary.id).filter_by(id=word_id).first() is None:
+        return False
+    counters.increment(Dictionary, word_id, 'views')
+
 # Get single word
 @bp.route('/<int:word_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional('dictionary', on_not_modified=count_unmodified_view)
 def manage_word(word_id):
     word = Dictionary.query.get_or_404(word_id)
     
     if request.method == 'GET':
-        # Increment view count
-        word.views += 1
-        db.session.commit()
+        # Increment view count (written in batches by the counter flusher)
+        counters.increment(Dictionary, word.id, 'views')
         
         return jsonify({
             'id': word.id,
@@ -112,7 +133,7 @@ def manage_word(word_id):
             'category': word.category,
             'synonyms': word.synonyms,
             'antonyms': word.antonyms,
-            'views': word.views
+            'views': (word.views or 0) + counters.pending_for(Dictionary, word.id, 'views')
         })
     
     elif request.method == 'PUT':
@@ -174,32 +195,78 @@ def search_words():
     if not q or len(q) < 2:
         return jsonify({'error': 'Query too short'}), 400
     
-    query = Dictionary.query.filter(
-        db.or_(
-            Dictionary.nepali.contains(q),
-            Dictionary.romanized.ilike(f'%{q}%'),
-            Dictionary.english.ilike(f'%{q}%')
-        )
-    )
-    
+    query = Dictionary.query
+
     if difficulty:
         query = query.filter_by(difficulty=difficulty)
     if category:
         query = query.filter_by(category=category)
-    
-    results = query.limit(50).all()
-    
+
+    # Candidates: FTS5 term-prefix matches (incl. usage examples) plus
+    # substring hits from the trigram index (e.g. suffixes like "हरू")
+    candidate_ids = set(contains_ids(Dictionary, q))
+    candidate_ids.update(match_ids(q) or [])
+    if difficulty or category:
+        candidate_ids = filter_ids(query, Dictionary, candidate_ids)
+
+    results = fetch_ranked(Dictionary, top_k(Dictionary, q, candidate_ids, 50), SEARCH_COLUMNS)
+
+    # Nothing matched literally: try romanization spelling variants
+    if not results:
+        results = [
+            (w, round(OTHER_FIELD_SCORE / (1 + distance), 4))
+            for w, distance in fuzzy_search(Dictionary, q, limit=50, columns=SEARCH_COLUMNS)
+            if (not difficulty or w.difficulty == difficulty)
+            and (not category or w.category == category)
+        ]
+
     return jsonify([{
         'id': w.id,
         'nepali': w.nepali,
         'romanized': w.romanized,
         'english': w.english,
         'category': w.category,
-        'difficulty': w.difficulty
-    } for w in results])
+        'difficulty': w.difficulty,
+        'score': score
+    } for w, score in results])
+
+# Spelling-tolerant search on romanized text
+@bp.route('/fuzzy', methods=['GET'])
+def fuzzy_search_words():
+    """Match romanized spelling variants (dhanyavad, dhanybaad, ...) by edit distance"""
+    q = request.args.get('q', '').strip()
+    max_distance = request.args.get('max_distance', MAX_EDIT_DISTANCE, type=int)
+
+    if not q or len(q) < 2:
+        return jsonify({'error': 'Query too short'}), 400
+
+    matches = fuzzy_search(Dictionary, q, max_distance, limit=20, columns=SEARCH_COLUMNS)
+
+    return jsonify([{
+        'id': w.id,
+        'nepali': w.nepali,
+        'romanized': w.romanized,
+        'english': w.english,
+        'category': w.category,
+        'difficulty': w.difficulty,
+        'distance': distance
+    } for w, distance in matches])
+
+# Type-ahead suggestions
+@bp.route('/autocomplete', methods=['GET'])
+def autocomplete_words():
+    """Prefix completions over romanized, Nepali and English, most viewed first"""
+    q = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 10, type=int)
+
+    if not q:
+        return jsonify([])
+
+    return jsonify(autocomplete.complete(q, max(1, min(limit, MAX_SUGGESTIONS))))
 
 # Get categories
 @bp.route('/categories', methods=['GET'])
+@cached({'dictionary': ('category',)})
 def get_categories():
     categories = db.session.query(Dictionary.category).distinct().filter(
         Dictionary.category != None
@@ -211,10 +278,15 @@ def get_categories():
 def get_by_category(category):
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    cursor = request.args.get('cursor')
     
-    paginated = Dictionary.query.filter_by(category=category).paginate(
-        page=page, per_page=per_page
-    )
+    try:
+        words, page_info = paginate_query(
+            project(Dictionary.query.filter_by(category=category), Dictionary, SEARCH_COLUMNS), Dictionary,
+            {'category': category}, page, per_page, cursor
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     return jsonify({
         'words': [{
@@ -224,9 +296,8 @@ def get_by_category(category):
             'english': w.english,
             'difficulty': w.difficulty,
             'category': w.category
-        } for w in paginated.items],
-        'total': paginated.total,
-        'pages': paginated.pages
+        } for w in words],
+        **page_info
     })
 
 # Get by difficulty
@@ -237,10 +308,15 @@ def get_by_difficulty(level):
     
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    cursor = request.args.get('cursor')
     
-    paginated = Dictionary.query.filter_by(difficulty=level).paginate(
-        page=page, per_page=per_page
-    )
+    try:
+        words, page_info = paginate_query(
+            project(Dictionary.query.filter_by(difficulty=level), Dictionary, SEARCH_COLUMNS), Dictionary,
+            {'difficulty': level}, page, per_page, cursor
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     return jsonify({
         'words': [{
@@ -249,23 +325,27 @@ def get_by_difficulty(level):
             'romanized': w.romanized,
             'english': w.english,
             'difficulty': w.difficulty
-        } for w in paginated.items],
-        'total': paginated.total,
-        'pages': paginated.pages
+        } for w in words],
+        **page_info
     })
 
 # Get trending/popular words
 @bp.route('/trending', methods=['GET'])
 def get_trending():
-    trending = Dictionary.query.order_by(Dictionary.views.desc()).limit(10).all()
+    window = request.args.get('window', DEFAULT_WINDOW)
+    try:
+        ranked = trending(Dictionary, window, columns=('nepali', 'romanized', 'english', 'views'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify([{
         'id': w.id,
         'nepali': w.nepali,
         'romanized': w.romanized,
         'english': w.english,
-        'views': w.views
-    } for w in trending])
+        'views': (w.views or 0) + counters.pending_for(Dictionary, w.id, 'views'),
+        'score': score
+    } for w, score in ranked])
 
 # Bulk import words from CSV
 @bp.route('/bulk-import', methods=['POST'])
@@ -356,67 +436,82 @@ def reorder_dictionary():
 # ========== ADVANCED FEATURES ==========
 
 # Global Search Across All Tables
+GLOBAL_SEARCH_LIMIT = 50
+
 @bp.route('/global-search', methods=['GET'])
 def global_search():
-    """Search across Dictionary, Alphabet, and Phrases tables"""
-    from models import Alphabet, Phrase
+    """Search across Dictionary, Alphabet, Phrase and Video tables"""
+    from models import Alphabet, Phrase, Video
     
     query = request.args.get('q', '').lower()
     if not query or len(query) < 2:
         return jsonify({'error': 'Query too short'}), 400
-    
-    # Search Dictionary
-    dict_results = Dictionary.query.filter(
-        db.or_(
-            Dictionary.nepali.contains(query),
-            Dictionary.romanized.ilike(f'%{query}%'),
-            Dictionary.english.ilike(f'%{query}%')
-        )
-    ).limit(20).all()
-    
-    # Search Alphabet
-    alphabet_results = Alphabet.query.filter(
-        db.or_(
-            Alphabet.devanagari.contains(query),
-            Alphabet.romanized.ilike(f'%{query}%'),
-            Alphabet.sound.ilike(f'%{query}%')
-        )
-    ).limit(10).all()
-    
-    # Search Phrases
-    phrase_results = Phrase.query.filter(
-        db.or_(
-            Phrase.nepali.contains(query),
-            Phrase.romanized.ilike(f'%{query}%'),
-            Phrase.english.ilike(f'%{query}%')
-        )
-    ).limit(20).all()
-    
-    return jsonify({
-        'dictionary': [{
+    limit = max(1, min(request.args.get('limit', GLOBAL_SEARCH_LIMIT, type=int), 100))
+    
+    # One ranking and one limit over every table's trigram index; only the
+    # winning rows are loaded, by primary key
+    models = (Dictionary, Alphabet, Phrase, Video)
+    columns = {
+        Dictionary: ('nepali', 'romanized', 'english', 'category'),
+        Alphabet: ('devanagari', 'romanized', 'sound'),
+        Phrase: ('nepali', 'romanized', 'english', 'category'),
+        Video: ('title', 'youtube_id', 'thumbnail_url', 'category'),
+    }
+    ranked, counts = top_k_across(models, query, limit)
+    rows = {}
+    for model in models:
+        ids = [(row_id, score) for m, row_id, score in ranked if m is model]
+        rows.update(((model, r.id), r) for r, _ in fetch_ranked(model, ids, columns[model]))
+    
+    serializers = {
+        Dictionary: lambda w: {
             'id': w.id,
             'nepali': w.nepali,
             'romanized': w.romanized,
             'english': w.english,
             'category': w.category,
             'type': 'dictionary'
-        } for w in dict_results],
-        'alphabet': [{
+        },
+        Alphabet: lambda l: {
             'id': l.id,
             'devanagari': l.devanagari,
             'romanized': l.romanized,
             'sound': l.sound,
             'type': 'alphabet'
-        } for l in alphabet_results],
-        'phrases': [{
+        },
+        Phrase: lambda p: {
             'id': p.id,
             'nepali': p.nepali,
             'romanized': p.romanized,
             'english': p.english,
             'category': p.category,
             'type': 'phrase'
-        } for p in phrase_results],
-        'total_results': len(dict_results) + len(alphabet_results) + len(phrase_results)
+        },
+        Video: lambda v: {
+            'id': v.id,
+            'title': v.title,
+            'youtube_id': v.youtube_id,
+            'thumbnail_url': v.thumbnail_url,
+            'category': v.category,
+            'type': 'video'
+        },
+    }
+    results = [{**serializers[model](rows[(model, row_id)]), 'score': score}
+               for model, row_id, score in ranked if (model, row_id) in rows]
+    
+    return jsonify({
+        'results': results,
+        'dictionary': [r for r in results if r['type'] == 'dictionary'],
+        'alphabet': [r for r in results if r['type'] == 'alphabet'],
+        'phrases': [r for r in results if r['type'] == 'phrase'],
+        'videos': [r for r in results if r['type'] == 'video'],
+        'counts': {
+            'dictionary': counts[Dictionary.__table__.name],
+            'alphabet': counts[Alphabet.__table__.name],
+            'phrases': counts[Phrase.__table__.name],
+            'videos': counts[Video.__table__.name]
+        },
+        'total_results': len(results)
     })
 
 # Statistics Dashboard
@@ -3,14 +3,31 @@ from flask_login import login_required, current_user
 from models import Phrase, UserProgress
 from database import db
 from validation import validate_phrase, validation_error_response
+from search_fuzzy import fuzzy_search, MAX_EDIT_DISTANCE
+from response_cache import cached
+from table_versions import conditional
+from search_trigram import contains_ids
+from search_ranking import top_k, filter_ids, fetch_ranked, MAX_RANKED_RESULTS
+from pagination import paginate_query, MAX_PER_PAGE
+from projection import project, row_serializer
 
 bp = Blueprint('phrases', __name__, url_prefix='/api/phrases')
 
+# Columns serialized by the list and search endpoints
+LIST_COLUMNS = ('nepali', 'romanized', 'english', 'category', 'audio_url',
+                'context', 'formality_level', 'difficulty')
+
+serialize_phrase = row_serializer(('id',) + LIST_COLUMNS)
+
 @bp.route('/', methods=['GET', 'POST'])
+@conditional('phrase')
 def get_or_create_phrases():
     if request.method == 'GET':
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
         category = request.args.get('category')
         difficulty = request.args.get('difficulty', type=int)
+        cursor = request.args.get('cursor')
         
         query = Phrase.query
         
@@ -18,19 +35,27 @@ def get_or_create_phrases():
             query = query.filter_by(category=category)
         if difficulty:
             query = query.filter_by(difficulty=difficulty)
+        query = project(query, Phrase, LIST_COLUMNS)
+        
+        # Compatibility: ?format=array returns every phrase as a bare list
+        if request.args.get('format') == 'array':
+            return jsonify([serialize_phrase(p) for p in query.order_by(Phrase.id)])
+        
+        try:
+            phrases, page_info = paginate_query(
+                query, Phrase, {'category': category, 'difficulty': difficulty},
+                page, per_page, cursor, order_by=Phrase.id
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
         
-        phrases = query.all()
-        return jsonify([{
-            'id': p.id,
-            'nepali': p.nepali,
-            'romanized': p.romanized,
-            'english': p.english,
-            'category': p.category,
-            'audio_url': p.audio_url,
-            'context': p.context,
-            'formality_level': p.formality_level,
-            'difficulty': p.difficulty
-        } for p in phrases])
+        if cursor is None:
+            page_info['current_page'] = page
+        
+        return jsonify({
+            'phrases': [serialize_phrase(p) for p in phrases],
+            **page_info
+        })
     
     elif request.method == 'POST':
         # Only admins can create phrases
@@ -58,6 +83,7 @@ def get_or_create_phrases():
         return jsonify({'id': new_phrase.id}), 201
 
 @bp.route('/<int:phrase_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional('phrase')
 def manage_phrase(phrase_id):
     phrase = Phrase.query.get_or_404(phrase_id)
     
@@ -100,25 +126,63 @@ def manage_phrase(phrase_id):
         return jsonify({'success': True}), 204
 
 @bp.route('/categories', methods=['GET'])
+@cached({'phrase': ('category',)})
 def get_categories():
     categories = db.session.query(Phrase.category).distinct().all()
     return jsonify([cat[0] for cat in categories])
 
 @bp.route('/search', methods=['GET'])
 def search_phrases():
-    query = request.args.get('q', '')
-    phrases = Phrase.query.filter(
-        db.or_(
-            Phrase.nepali.contains(query),
-            Phrase.romanized.contains(query),
-            Phrase.english.contains(query)
-        )
-    ).all()
+    q = request.args.get('q', '').strip()
+    page = max(1, request.args.get('page', 1, type=int))
+    per_page = max(1, min(request.args.get('per_page', 20, type=int), MAX_PER_PAGE))
+    category = request.args.get('category')
+    difficulty = request.args.get('difficulty', type=int)
     
+    if not q or len(q) < 2:
+        return jsonify({'error': 'Query too short'}), 400
+    
+    query = Phrase.query
+    if category:
+        query = query.filter_by(category=category)
+    if difficulty:
+        query = query.filter_by(difficulty=difficulty)
+    
+    # Substring matches from the trigram index, ranked; only the requested
+    # page is loaded from the database
+    candidate_ids = contains_ids(Phrase, q)
+    if category or difficulty:
+        candidate_ids = filter_ids(query, Phrase, candidate_ids)
+    # Only the first MAX_RANKED_RESULTS matches are paged; deeper pages are
+    # clamped to the last one, as per_page is to MAX_PER_PAGE
+    pages = -(-min(len(candidate_ids), MAX_RANKED_RESULTS) // per_page)
+    page = min(page, max(pages, 1))
+    ranked = top_k(Phrase, q, candidate_ids, page * per_page)[(page - 1) * per_page:]
+    
+    return jsonify({
+        'phrases': [{**serialize_phrase(p), 'score': score} for p, score in fetch_ranked(Phrase, ranked, LIST_COLUMNS)],
+        'total': len(candidate_ids),
+        'pages': pages,
+        'current_page': page
+    })
+
+@bp.route('/fuzzy', methods=['GET'])
+def fuzzy_search_phrases():
+    """Match romanized spelling variants of phrases by edit distance"""
+    query = request.args.get('q', '').strip()
+    max_distance = request.args.get('max_distance', MAX_EDIT_DISTANCE, type=int)
+
+    if not query or len(query) < 2:
+        return jsonify({'error': 'Query too short'}), 400
+
+    matches = fuzzy_search(Phrase, query, max_distance, limit=20,
+                           columns=('nepali', 'romanized', 'english', 'category'))
+
     return jsonify([{
         'id': p.id,
         'nepali': p.nepali,
         'romanized': p.romanized,
         'english': p.english,
-        'category': p.category
-    } for p in phrases])
\ No newline at end of file
+        'category': p.category,
+        'distance': distance
+    } for p, distance in matches])
@@ -3,10 +3,21 @@ from flask_login import login_required, current_user
 from models import Resource, PDFResource, Video, Playlist
 from database import db
 from werkzeug.utils import secure_filename
+from pagination import paginate_query, MAX_PER_PAGE
+from projection import project, row_serializer
+from counters import counters
+from trending import trending, DEFAULT_WINDOW
+from response_cache import cached
+from table_versions import conditional
 import os
 
 bp = Blueprint('resources', __name__, url_prefix='/api/resources')
 
+# Columns serialized by the video list (see projection.py)
+VIDEO_LIST_COLUMNS = ('title', 'youtube_id', 'thumbnail_url', 'duration',
+                      'category', 'difficulty', 'view_count')
+serialize_list_video = row_serializer(('id',) + VIDEO_LIST_COLUMNS)
+
 ALLOWED_EXTENSIONS = {'pdf', 'jpg', 'jpeg', 'png', 'gif'}
 UPLOAD_FOLDER = 'frontend/static/pdfs'
 
@@ -33,6 +44,7 @@ def get_or_create_resources():
         per_page = request.args.get('per_page', 12, type=int)
         resource_type = request.args.get('type', type=str)
         category = request.args.get('category', type=str)
+        cursor = request.args.get('cursor')
         
         query = Resource.query
         
@@ -40,8 +52,16 @@ def get_or_create_resources():
             query = query.filter_by(resource_type=resource_type)
         if category:
             query = query.filter_by(category=category)
+        query = project(query, Resource, ('title', 'description', 'resource_type', 'category',
+                                          'thumbnail_url', 'difficulty', 'downloads'))
         
-        paginated = query.paginate(page=page, per_page=per_page)
+        try:
+            resources, page_info = paginate_query(
+                query, Resource, {'type': resource_type, 'category': category},
+                page, per_page, cursor
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
         
         return jsonify({
             'resources': [{
@@ -53,9 +73,8 @@ def get_or_create_resources():
                 'thumbnail_url': r.thumbnail_url,
                 'difficulty': r.difficulty,
                 'downloads': r.downloads
-            } for r in paginated.items],
-            'total': paginated.total,
-            'pages': paginated.pages
+            } for r in resources],
+            **page_info
         })
     
     elif request.method == 'POST':
@@ -137,8 +156,10 @@ def get_or_create_pdfs():
             query = query.filter_by(category=category)
         if difficulty:
             query = query.filter_by(difficulty=difficulty)
+        query = project(query, PDFResource, ('title', 'description', 'category', 'preview_url', 'pages',
+                                             'file_size', 'difficulty', 'downloads', 'created_at'))
         
-        paginated = query.paginate(page=page, per_page=per_page)
+        paginated = query.paginate(page=page, per_page=per_page, max_per_page=MAX_PER_PAGE)
         
         return jsonify({
             'pdfs': [{
@@ -215,12 +236,11 @@ def manage_pdf(pdf_id):
 def download_pdf(pdf_id):
     """Track PDF download"""
     pdf = PDFResource.query.get_or_404(pdf_id)
-    pdf.downloads += 1
-    db.session.commit()
+    counters.increment(PDFResource, pdf.id, 'downloads')
     return jsonify({
         'file_path': pdf.file_path,
         'title': pdf.title,
-        'downloads': pdf.downloads
+        'downloads': (pdf.downloads or 0) + counters.pending_for(PDFResource, pdf.id, 'downloads')
     })
 
 @bp.route('/pdf/categories', methods=['GET'])
@@ -233,6 +253,7 @@ def get_pdf_categories():
 # ===== VIDEOS & PLAYLISTS =====
 
 @bp.route('/playlists', methods=['GET', 'POST'])
+@cached({'playlist': None})
 def get_or_create_playlists():
     if request.method == 'GET':
         playlists = Playlist.query.order_by(Playlist.created_at.desc()).all()
@@ -260,6 +281,7 @@ def get_or_create_playlists():
         return jsonify({'id': new_playlist.id}), 201
 
 @bp.route('/videos', methods=['GET', 'POST'])
+@conditional('video')
 def get_or_create_videos():
     if request.method == 'GET':
         # Public access for viewing videos
@@ -267,6 +289,7 @@ def get_or_create_videos():
         per_page = request.args.get('per_page', 12, type=int)
         category = request.args.get('category', type=str)
         playlist_id = request.args.get('playlist_id', type=int)
+        cursor = request.args.get('cursor')
         
         query = Video.query
         
@@ -274,22 +297,19 @@ def get_or_create_videos():
             query = query.filter_by(category=category)
         if playlist_id:
             query = query.filter_by(playlist_id=playlist_id)
+        query = project(query, Video, VIDEO_LIST_COLUMNS)
         
-        paginated = query.order_by(Video.order_index).paginate(page=page, per_page=per_page)
+        try:
+            videos, page_info = paginate_query(
+                query, Video, {'category': category, 'playlist_id': playlist_id},
+                page, per_page, cursor, order_by=Video.order_index
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
         
         return jsonify({
-            'videos': [{
-                'id': v.id,
-                'title': v.title,
-                'youtube_id': v.youtube_id,
-                'thumbnail_url': v.thumbnail_url,
-                'duration': v.duration,
-                'category': v.category,
-                'difficulty': v.difficulty,
-                'view_count': v.view_count
-            } for v in paginated.items],
-            'total': paginated.total,
-            'pages': paginated.pages
+            'videos': [serialize_list_video(v) for v in videos],
+            **page_info
         })
     
     elif request.method == 'POST':
@@ -314,14 +334,20 @@ def get_or_create_videos():
         db.session.commit()
         return jsonify({'id': new_video.id}), 201
 
+def count_unmodified_video_view(video_id):
+    """Count a view answered with 304; False for a missing video, so the view can 404"""
+    if db.session.query(Video.id).filter_by(id=video_id).first() is None:
+        return False
+    counters.increment(Video, video_id, 'view_count')
+
 @bp.route('/videos/<int:video_id>', methods=['GET', 'PUT', 'DELETE'])
 @require_admin
+@conditional('video', on_not_modified=count_unmodified_video_view)
 def manage_video(video_id):
     video = Video.query.get_or_404(video_id)
     
     if request.method == 'GET':
-        video.view_count += 1
-        db.session.commit()
+        counters.increment(Video, video.id, 'view_count')
         
         return jsonify({
             'id': video.id,
@@ -333,7 +359,7 @@ def manage_video(video_id):
             'difficulty': video.difficulty,
             'transcript': video.transcript,
             'notes': video.notes,
-            'view_count': video.view_count
+            'view_count': (video.view_count or 0) + counters.pending_for(Video, video.id, 'view_count')
         })
     
     elif request.method == 'PUT':
@@ -376,10 +402,15 @@ def bulk_delete_videos():
 
 @bp.route('/videos/trending', methods=['GET'])
 def get_trending_videos():
-    trending = Video.query.order_by(Video.view_count.desc()).limit(10).all()
+    window = request.args.get('window', DEFAULT_WINDOW)
+    try:
+        ranked = trending(Video, window, columns=('title', 'youtube_id', 'view_count'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     return jsonify([{
         'id': v.id,
         'title': v.title,
         'youtube_id': v.youtube_id,
-        'view_count': v.view_count
-    } for v in trending])
+        'view_count': (v.view_count or 0) + counters.pending_for(Video, v.id, 'view_count'),
+        'score': score
+    } for v, score in ranked])
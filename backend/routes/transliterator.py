@@ -1,45 +1,143 @@
+import os
+import json
+import base64
+import binascii
 from flask import Blueprint, jsonify, request
-import re
+from response_cache import cached
+from transliteration import transliterate, transliterate_many, transliterate_edit, romanize, romanize_many, rules
 
 bp = Blueprint('transliterator', __name__, url_prefix='/api/transliterator')
 
-# Roman to Devanagari mapping
-ROMAN_TO_DEVANAGARI = {
-    'a': 'अ', 'aa': 'आ', 'i': 'इ', 'ii': 'ई', 'u': 'उ', 'uu': 'ऊ',
-    'e': 'ए', 'ai': 'ऐ', 'o': 'ओ', 'au': 'औ', 'am': 'अं', 'ah': 'अः',
-    'ka': 'क', 'kha': 'ख', 'ga': 'ग', 'gha': 'घ', 'nga': 'ङ',
-    'cha': 'च', 'chha': 'छ', 'ja': 'ज', 'jha': 'झ', 'nya': 'ञ',
-    'ta': 'ट', 'tha': 'ठ', 'da': 'ड', 'dha': 'ढ', 'na': 'ण',
-    'ta': 'त', 'tha': 'थ', 'da': 'द', 'dha': 'ध', 'na': 'न',
-    'pa': 'प', 'pha': 'फ', 'ba': 'ब', 'bha': 'भ', 'ma': 'म',
-    'ya': 'य', 'ra': 'र', 'la': 'ल', 'va': 'व',
-    'sha': 'श', 'sha': 'ष', 'sa': 'स', 'ha': 'ह',
-    'ksha': 'क्ष', 'tra': 'त्र', 'gya': 'ज्ञ'
-}
+# Limits for /convert-batch
+BATCH_MAX_ITEMS = int(os.getenv('TRANSLITERATE_BATCH_MAX_ITEMS', 5000))
+BATCH_MAX_BYTES = int(os.getenv('TRANSLITERATE_BATCH_MAX_BYTES', 1024 * 1024))
+
+READ_CHUNK_BYTES = 64 * 1024
 
 @bp.route('/convert', methods=['POST'])
 def convert():
     data = request.get_json()
-    romanized = data.get('text', '').lower()
+    romanized = data.get('text', '')
     
     if not romanized:
         return jsonify({'error': 'No text provided'}), 400
     
-    # Simple conversion logic (can be improved)
-    devanagari = romanized
+    return jsonify({
+        'romanized': romanized,
+        'devanagari': transliterate(romanized)
+    })
+
+@bp.route('/convert-incremental', methods=['POST'])
+def convert_incremental():
+    """
+    As-you-type conversion. Start with {"text": ...}, then send
+    {"state": ..., "delete": n, "insert": "..."} for each edit at the end
+    of the text; apply the returned delete/insert to the previous output.
+    """
+    data = request.get_json(silent=True) or {}
+    
+    if 'text' in data:
+        pending, delete, insert = '', 0, data['text']
+    else:
+        try:
+            pending = base64.urlsafe_b64decode(data['state'].encode()).decode()
+        except (KeyError, AttributeError, binascii.Error, UnicodeDecodeError):
+            return jsonify({'error': 'Invalid or missing state'}), 400
+        delete, insert = data.get('delete', 0), data.get('insert', '')
+    
+    if not isinstance(insert, str):
+        return jsonify({'error': 'text and insert must be strings'}), 400
+    if not isinstance(delete, int) or isinstance(delete, bool) or delete < 0:
+        return jsonify({'error': 'delete must be a non-negative integer'}), 400
     
-    # Convert syllables
-    for roman, deva in sorted(ROMAN_TO_DEVANAGARI.items(), key=lambda x: -len(x[0])):
-        devanagari = devanagari.replace(roman, deva)
+    try:
+        pending, delete, insert = transliterate_edit(pending, delete, insert)
+    except ValueError:
+        # Edit reaches text the state no longer covers
+        return jsonify({'error': 'State out of date, resend the full text'}), 409
     
     return jsonify({
-        'romanized': romanized,
-        'devanagari': devanagari
+        'state': base64.urlsafe_b64encode(pending.encode()).decode(),
+        'delete': delete,
+        'insert': insert
+    })
+
+def read_body(limit):
+    """
+    Request body, or None if it is longer than limit bytes. Bodies without
+    a Content-Length (chunked uploads) are counted as they stream in, so
+    reading stops as soon as the limit is passed.
+    """
+    if request.content_length is not None and request.content_length > limit:
+        return None
+    body = bytearray()
+    while True:
+        chunk = request.stream.read(READ_CHUNK_BYTES)
+        if not chunk:
+            return bytes(body)
+        body += chunk
+        if len(body) > limit:
+            return None
+
+def batch_texts():
+    """Validated 'texts' array of a batch request, or (None, error response)"""
+    body = read_body(BATCH_MAX_BYTES)
+    if body is None:
+        return None, (jsonify({'error': f'Request body must be at most {BATCH_MAX_BYTES} bytes'}), 413)
+    
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    texts = data.get('texts') if isinstance(data, dict) else None
+    
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return None, (jsonify({'error': 'texts must be an array of strings'}), 400)
+    if not texts:
+        return None, (jsonify({'error': 'No texts provided'}), 400)
+    if len(texts) > BATCH_MAX_ITEMS:
+        return None, (jsonify({'error': f'At most {BATCH_MAX_ITEMS} texts per request'}), 413)
+    return texts, None
+
+@bp.route('/convert-batch', methods=['POST'])
+def convert_batch():
+    """Convert an array of strings in one request; outputs keep input order"""
+    texts, error = batch_texts()
+    if error:
+        return error
+    
+    return jsonify({
+        'devanagari': transliterate_many(texts),
+        'count': len(texts)
+    })
+
+@bp.route('/reverse', methods=['POST'])
+def reverse():
+    """Devanagari to romanized text"""
+    data = request.get_json()
+    devanagari = data.get('text', '')
+    
+    if not devanagari:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    return jsonify({
+        'devanagari': devanagari,
+        'romanized': romanize(devanagari)
+    })
+
+@bp.route('/reverse-batch', methods=['POST'])
+def reverse_batch():
+    """Romanize an array of Devanagari strings; outputs keep input order"""
+    texts, error = batch_texts()
+    if error:
+        return error
+    
+    return jsonify({
+        'romanized': romanize_many(texts),
+        'count': len(texts)
     })
 
 @bp.route('/rules', methods=['GET'])
+@cached()
 def get_rules():
-    return jsonify({
-        'vowels': {k: v for k, v in ROMAN_TO_DEVANAGARI.items() if len(k) <= 2 and k in ['a', 'aa', 'i', 'ii', 'u', 'uu', 'e', 'ai', 'o', 'au']},
-        'consonants': {k: v for k, v in ROMAN_TO_DEVANAGARI.items() if len(k) > 1 and k not in ['aa', 'ii', 'uu', 'ai', 'au', 'am', 'ah']}
-    })
\ No newline at end of file
+    return jsonify(rules())
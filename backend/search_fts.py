@@ -0,0 +1,123 @@
+"""
+SQLite FTS5 full-text index for the Dictionary table
+Replaces leading-wildcard LIKE scans in dictionary search
+"""
+import unicodedata
+from sqlalchemy import text
+from database import db
+
+FTS_TABLE = 'dictionary_fts'
+FTS_COLUMNS = ['nepali', 'romanized', 'english', 'usage_example']
+
+# unicode61 treats Devanagari matras, virama and anusvara as separators,
+# which would split "नमस्ते" into "नमस". Register them as token characters.
+DEVANAGARI_MARKS = ''.join(
+    chr(cp) for cp in range(0x0900, 0x0980)
+    if unicodedata.category(chr(cp)) in ('Mn', 'Mc')
+)
+
+_fts_ready = None
+
+
+def _ddl_statements():
+    """DDL for the external-content FTS table and its sync triggers"""
+    cols = ', '.join(FTS_COLUMNS)
+    new_cols = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+    old_cols = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {cols},
+            content='dictionary', content_rowid='id',
+            tokenize="unicode61 remove_diacritics 0 tokenchars '{DEVANAGARI_MARKS}'"
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON dictionary BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON dictionary BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END""",
+        # Only re-index when searchable columns change (not on every views += 1)
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON dictionary BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END""",
+    ]
+
+
+def ensure_dictionary_fts():
+    """
+    Create the FTS5 index and sync triggers if missing.
+
+    Triggers keep the index in sync on insert, update and delete, including
+    bulk query.update()/delete() calls that bypass ORM events. A freshly
+    created index is back-filled from the existing rows.
+
+    Returns:
+        bool: True if the FTS index is usable on this database
+    """
+    global _fts_ready
+    if _fts_ready is not None:
+        return _fts_ready
+
+    if db.engine.dialect.name != 'sqlite':
+        _fts_ready = False
+        return _fts_ready
+
+    try:
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first()
+            for statement in _ddl_statements():
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        _fts_ready = True
+    except Exception as e:
+        # SQLite built without FTS5, or dictionary table not created yet
+        print(f"⚠ Dictionary FTS index unavailable: {e}")
+        _fts_ready = False
+    return _fts_ready
+
+
+def rebuild_dictionary_fts():
+    """Rebuild the whole FTS index from the dictionary table"""
+    if ensure_dictionary_fts():
+        with db.engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def build_match_query(q):
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted (so FTS operators in user input
+    are treated literally) and prefix-matched, and all terms must match.
+    """
+    terms = [t.replace('"', '""') for t in q.split()]
+    terms = [t for t in terms if t.strip('"')]
+    if not terms:
+        return None
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+def match_ids(q):
+    """
+    Ids of dictionary rows matching q in the FTS index, best bm25 first.
+
+    Returns:
+        list of ids, or None if the FTS index is unavailable
+    """
+    if not ensure_dictionary_fts():
+        return None
+
+    match = build_match_query(q)
+    if match is None:
+        return []
+
+    rows = db.session.execute(
+        text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY rank"),
+        {'match': match}
+    )
+    return [row[0] for row in rows]
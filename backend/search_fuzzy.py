@@ -0,0 +1,225 @@
+"""
+Spelling-tolerant search over romanized Nepali
+SymSpell-style deletion index for Dictionary.romanized and Phrase.romanized
+"""
+import os
+import re
+import threading
+import time
+from database import db
+from model_events import on_commit
+from projection import fetch_rows
+
+MAX_EDIT_DISTANCE = 2
+
+# Deletes are only generated for the first PREFIX_LENGTH characters, which
+# bounds index size and lookup work regardless of word length
+PREFIX_LENGTH = 7
+
+# Upper bound on candidate terms verified per lookup
+MAX_CANDIDATES = 2000
+
+FUZZY_INDEX_MAX_AGE = int(os.getenv('FUZZY_INDEX_MAX_AGE', 300))
+
+# Common romanization variants folded to one spelling before matching,
+# so "dhanyavad", "dhanyabaad" and "dhanyabad" all normalize alike
+ROMANIZATION_RULES = [
+    ('chh', 'ch'),
+    ('aa', 'a'),
+    ('sh', 's'),
+    ('v', 'b'),
+]
+
+_rule_pattern = re.compile('|'.join(re.escape(src) for src, _ in ROMANIZATION_RULES))
+_rule_map = dict(ROMANIZATION_RULES)
+_non_letters = re.compile(r'[^a-z\s]+')
+
+
+def normalize_romanized(text):
+    """Lowercase, drop punctuation and fold romanization variants"""
+    if not text:
+        return ''
+    text = _non_letters.sub(' ', text.lower())
+    text = _rule_pattern.sub(lambda m: _rule_map[m.group(0)], text)
+    return ' '.join(text.split())
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (adjacent swaps count as one edit).
+
+    Returns max_distance + 1 as soon as the distance is known to exceed
+    max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(term, max_distance):
+    """All strings reachable from term's prefix by up to max_distance deletions"""
+    prefix = term[:PREFIX_LENGTH]
+    results = {prefix}
+    frontier = {prefix}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class FuzzyIndex:
+    """Deletion index over one romanized column, kept in sync on commit"""
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.deletes = {}     # delete variant -> set of terms
+        self.terms = {}       # term -> set of row ids
+        self.row_terms = {}   # row id -> set of terms
+        self.built_at = None
+        self.lock = threading.RLock()
+
+    @property
+    def table_name(self):
+        return self.model.__table__.name
+
+    @staticmethod
+    def terms_for(text):
+        """Index the whole normalized value plus each of its words"""
+        normalized = normalize_romanized(text)
+        if not normalized:
+            return set()
+        return {normalized} | set(normalized.split())
+
+    def build(self):
+        rows = db.session.query(self.model.id, getattr(self.model, self.field)).all()
+        with self.lock:
+            self.deletes, self.terms, self.row_terms = {}, {}, {}
+            for row_id, value in rows:
+                self._add(row_id, value)
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        with self.lock:
+            fresh = self.built_at is not None and time.monotonic() - self.built_at < FUZZY_INDEX_MAX_AGE
+        if not fresh:
+            self.build()
+
+    def _add(self, row_id, value):
+        terms = self.terms_for(value)
+        self.row_terms[row_id] = terms
+        for term in terms:
+            if term not in self.terms:
+                self.terms[term] = set()
+                for variant in _deletes(term, MAX_EDIT_DISTANCE):
+                    self.deletes.setdefault(variant, set()).add(term)
+            self.terms[term].add(row_id)
+
+    def _remove(self, row_id):
+        for term in self.row_terms.pop(row_id, ()):
+            ids = self.terms.get(term)
+            if ids is None:
+                continue
+            ids.discard(row_id)
+            if not ids:
+                del self.terms[term]
+                for variant in _deletes(term, MAX_EDIT_DISTANCE):
+                    bucket = self.deletes.get(variant)
+                    if bucket is not None:
+                        bucket.discard(term)
+                        if not bucket:
+                            del self.deletes[variant]
+
+    def apply(self, change):
+        with self.lock:
+            if self.built_at is None:
+                return
+            if change['op'] == 'bulk':
+                self.built_at = None
+            elif change['op'] == 'delete':
+                self._remove(change['id'])
+            elif change['op'] == 'insert' or self.field in change['changed']:
+                if self.field not in change['values']:
+                    self.built_at = None
+                    return
+                self._remove(change['id'])
+                self._add(change['id'], change['values'][self.field])
+
+    def lookup(self, q, max_distance=MAX_EDIT_DISTANCE, limit=20):
+        """
+        Return [(row_id, distance)] for rows within max_distance edits of q,
+        closest first. Work is bounded by the query's delete variants and
+        MAX_CANDIDATES, not by table size.
+        """
+        query = normalize_romanized(q)
+        max_distance = max(0, min(max_distance, MAX_EDIT_DISTANCE))
+        if not query:
+            return []
+        self.ensure_built()
+
+        with self.lock:
+            candidates = set()
+            for variant in _deletes(query, max_distance):
+                candidates |= self.deletes.get(variant, set())
+                if len(candidates) >= MAX_CANDIDATES:
+                    break
+
+            best = {}
+            for term in candidates:
+                distance = edit_distance(query, term, max_distance)
+                if distance > max_distance:
+                    continue
+                for row_id in self.terms.get(term, ()):
+                    if distance < best.get(row_id, max_distance + 1):
+                        best[row_id] = distance
+
+        ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))
+        return ranked[:limit]
+
+
+_indexes = {}
+
+
+def get_index(model):
+    """Return the shared fuzzy index for Dictionary or Phrase"""
+    from models import Dictionary, Phrase
+
+    if not _indexes:
+        for index in (FuzzyIndex(Dictionary, 'romanized'), FuzzyIndex(Phrase, 'romanized')):
+            _indexes[index.table_name] = index
+    return _indexes[model.__table__.name]
+
+
+def fuzzy_search(model, q, max_distance=MAX_EDIT_DISTANCE, limit=20, columns=None):
+    """
+    Load rows of model whose romanized text is within max_distance of q.
+
+    Args:
+        columns: Optional column names to load (see projection.project)
+
+    Returns:
+        list of (row, distance) tuples, closest first
+    """
+    matches = get_index(model).lookup(q, max_distance, limit)
+    rows = fetch_rows(model, [m[0] for m in matches], columns)
+    return [(rows[row_id], distance) for row_id, distance in matches if row_id in rows]
+
+
+@on_commit
+def _sync_indexes(changes):
+    for change in changes:
+        index = _indexes.get(change['table'])
+        if index is not None:
+            index.apply(change)
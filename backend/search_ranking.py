@@ -0,0 +1,157 @@
+"""
+Relevance ranking for search results
+BM25-style field scoring with a bounded top-k heap
+"""
+import heapq
+import math
+from projection import fetch_rows
+from search_trigram import get_index, contains_ids, unindexed_matches, normalize
+
+# How much a match in each field counts. Combined with MATCH_TIERS this
+# orders results: exact Nepali > Nepali prefix > romanized > English gloss.
+FIELD_WEIGHTS = {
+    'nepali': 4.0,
+    'devanagari': 4.0,
+    'romanized': 2.0,
+    'title': 3.0,
+    'sound': 1.5,
+    'english': 1.0,
+    'transcript': 0.5,
+}
+
+MATCH_TIERS = {'exact': 3.0, 'prefix': 2.0, 'contains': 1.0}
+
+# Rows found only through fields the in-memory index does not hold
+# (e.g. Dictionary.usage_example via FTS) rank below every direct match
+OTHER_FIELD_SCORE = 0.5
+
+# Deepest ranked result a search returns; pages past it are not served,
+# so one request never ranks more than this many candidates
+MAX_RANKED_RESULTS = 1000
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def bm25_term(tf, field_length, average_length):
+    """BM25 term-frequency saturation with field-length normalization, in [0, 1)"""
+    if not tf:
+        return 0.0
+    norm = 1 - B + B * field_length / (average_length or 1)
+    return tf / (tf + K1 * norm)
+
+
+def idf(doc_count, match_count):
+    """BM25 inverse document frequency, scaled to [0, 1] for this table"""
+    top = math.log(1 + (doc_count + 0.5) / 0.5)
+    return math.log(1 + (doc_count - match_count + 0.5) / (match_count + 0.5)) / top
+
+
+def score_document(needle, fields, average_lengths, idf_value, other_matches=()):
+    """
+    Score one document against a normalized query.
+
+    The best field/tier pair sets the integer part of the score; the BM25
+    component (weighted over all matching fields, < 1) orders ties.
+    other_matches names fields not held in memory that contain the query
+    (see search_trigram.UNINDEXED_FIELDS); they count as plain contains
+    matches.
+    """
+    best = 0.0
+    bm25 = 0.0
+    total_weight = 0.0
+    for name in other_matches:
+        weight = FIELD_WEIGHTS.get(name, 1.0)
+        total_weight += weight
+        best = max(best, weight * MATCH_TIERS['contains'])
+    for name, value in fields.items():
+        weight = FIELD_WEIGHTS.get(name, 1.0)
+        total_weight += weight
+        if not value or needle not in value:
+            continue
+        if value == needle:
+            tier = MATCH_TIERS['exact']
+        elif value.startswith(needle):
+            tier = MATCH_TIERS['prefix']
+        else:
+            tier = MATCH_TIERS['contains']
+        best = max(best, weight * tier)
+        bm25 += weight * bm25_term(value.count(needle), len(value), average_lengths.get(name))
+
+    if not best:
+        return OTHER_FIELD_SCORE
+    return round(best + idf_value * bm25 / total_weight, 4)
+
+
+def top_k(model, q, ids, k):
+    """
+    Rank candidate ids of model for q, keeping only the best k.
+
+    Scoring reads the normalized documents held by the trigram index, so
+    candidates are never loaded from the database; heapq.nlargest keeps
+    at most k of them at a time (k is capped at MAX_RANKED_RESULTS).
+
+    Returns:
+        list of (id, score), best first
+    """
+    k = min(k, MAX_RANKED_RESULTS)
+    return [(-neg_id, score) for score, neg_id in heapq.nlargest(k, _scored(model, q, ids))]
+
+
+def top_k_across(models, q, k):
+    """
+    Rank substring matches from several models together under one limit.
+
+    Every model's candidates come from its trigram index (plus database
+    matches on its unindexed fields) and share one bounded heap, so the
+    overall top k is found in a single pass.
+
+    Returns:
+        tuple: ([(model, id, score)] best first, {table name: match count})
+    """
+    counts = {}
+
+    def scored():
+        for position, model in enumerate(models):
+            others = unindexed_matches(model, q)
+            ids = set(contains_ids(model, q)).union(others)
+            counts[model.__table__.name] = len(ids)
+            for score, neg_id in _scored(model, q, ids, others):
+                yield score, -position, neg_id
+
+    best = heapq.nlargest(k, scored())
+    return [(models[-neg_position], -neg_id, score) for score, neg_position, neg_id in best], counts
+
+
+def _scored(model, q, ids, others=None):
+    """Yield (score, -id) for candidate ids of model; others is unindexed_matches() output"""
+    index = get_index(model)
+    index.ensure_built()
+    needle = normalize(q.strip())
+    if not needle:
+        return
+
+    average_lengths = index.average_lengths()
+    idf_value = idf(len(index.documents), len(ids))
+    for row_id in ids:
+        document = index.documents.get(row_id)
+        fields = dict(zip(index.fields, document)) if document else {}
+        other_matches = others.get(row_id, ()) if others else ()
+        yield score_document(needle, fields, average_lengths, idf_value, other_matches), -row_id
+
+
+def filter_ids(query, model, ids, chunk_size=500):
+    """Keep the ids that also satisfy query's filters, checked in chunks"""
+    ids = list(ids)
+    kept = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        kept.update(row[0] for row in query.filter(model.id.in_(chunk)).with_entities(model.id))
+    return kept
+
+
+def fetch_ranked(model, ranked, columns=None):
+    """Load the rows for ranked (id, score) pairs, in rank order (projected to columns, if given)"""
+    rows = fetch_rows(model, [r[0] for r in ranked], columns)
+    return [(rows[row_id], score) for row_id, score in ranked if row_id in rows]
@@ -0,0 +1,282 @@
+"""
+Compressed prefix trie for dictionary autocomplete
+Answers type-ahead lookups from memory, ranked by word views
+"""
+import heapq
+import os
+import threading
+import time
+from flask import current_app
+from database import db
+from model_events import on_commit
+from search_trigram import normalize
+
+# Largest number of suggestions a single request may ask for
+MAX_SUGGESTIONS = 10
+
+# Rebuild periodically to pick up view-count changes and other workers' writes
+TRIE_MAX_AGE = int(os.getenv('AUTOCOMPLETE_MAX_AGE', 300))
+
+INDEXED_FIELDS = ('romanized', 'nepali', 'english')
+
+
+class _Node:
+    __slots__ = ('edges', 'ids', 'top')
+
+    def __init__(self):
+        self.edges = {}   # first character -> [edge label, child node]
+        self.ids = set()  # words whose key ends exactly here
+        self.top = []     # best (-views, id) pairs in this subtree, best first
+
+
+class PrefixTrie:
+    """Radix tree mapping normalized keys to word ids with cached top-k"""
+
+    def __init__(self):
+        self.root = _Node()
+        self.words = {}   # word id -> suggestion payload
+        self.keys = {}    # word id -> set of keys indexed for it
+
+    def _rank(self, word_id):
+        return (-self.words[word_id]['views'], word_id)
+
+    def _refresh_top(self, node):
+        if not node.edges:
+            node.top = sorted(self._rank(word_id) for word_id in node.ids)[:MAX_SUGGESTIONS]
+            return
+        candidates = {word_id: self._rank(word_id) for word_id in node.ids}
+        for _, child in node.edges.values():
+            for rank in child.top:
+                candidates[rank[1]] = rank
+        node.top = heapq.nsmallest(MAX_SUGGESTIONS, candidates.values())
+
+    def _insert_key(self, key, word_id):
+        """Insert key and return the root-to-leaf path of touched nodes"""
+        node = self.root
+        path = [node]
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.edges[key[0]] = [key, child]
+                node = child
+                path.append(node)
+                break
+
+            label, child = edge
+            common = 0
+            limit = min(len(label), len(key))
+            while common < limit and label[common] == key[common]:
+                common += 1
+
+            if common < len(label):
+                # Split the edge at the divergence point
+                middle = _Node()
+                middle.edges[label[common]] = [label[common:], child]
+                middle.top = list(child.top)
+                edge[0], edge[1] = label[:common], middle
+                child = middle
+
+            node = child
+            path.append(node)
+            key = key[common:]
+
+        node.ids.add(word_id)
+        return path
+
+    def _remove_key(self, key, word_id):
+        """Remove key and return the touched path, pruning empty nodes"""
+        node = self.root
+        path = [(None, None, node)]
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None or not key.startswith(edge[0]):
+                return [n for _, _, n in path]
+            parent = node
+            node = edge[1]
+            path.append((parent, key[0], node))
+            key = key[len(edge[0]):]
+
+        node.ids.discard(word_id)
+
+        # Keep the tree compressed: drop empty leaves, merge single-child nodes
+        for i in range(len(path) - 1, 0, -1):
+            parent, first, current = path[i]
+            if current.ids:
+                break
+            if not current.edges:
+                del parent.edges[first]
+                path[i] = (parent, first, None)
+                continue
+            if len(current.edges) == 1:
+                (child_label, grandchild), = current.edges.values()
+                edge = parent.edges[first]
+                edge[0], edge[1] = edge[0] + child_label, grandchild
+                path[i] = (parent, first, grandchild)
+            break
+        return [n for _, _, n in path if n is not None]
+
+    def add(self, word_id, payload, refresh=True):
+        """Index a word under each of its normalized field values"""
+        self.remove(word_id, refresh=refresh)
+        self.words[word_id] = payload
+        keys = {normalize(payload.get(f)) for f in INDEXED_FIELDS} - {''}
+        self.keys[word_id] = keys
+        for key in keys:
+            path = self._insert_key(key, word_id)
+            if refresh:
+                for node in reversed(path):
+                    self._refresh_top(node)
+
+    def remove(self, word_id, refresh=True):
+        for key in self.keys.pop(word_id, ()):
+            path = self._remove_key(key, word_id)
+            if refresh:
+                for node in reversed(path):
+                    self._refresh_top(node)
+        self.words.pop(word_id, None)
+
+    def refresh_all(self):
+        """Recompute every cached top-k list bottom-up (after bulk loads)"""
+        stack = [(self.root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                self._refresh_top(node)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for _, child in node.edges.values())
+
+    def complete(self, prefix, limit):
+        """Return up to limit payloads whose keys start with prefix"""
+        key = normalize(prefix)
+        node = self.root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if key.startswith(label):
+                key = key[len(label):]
+            elif label.startswith(key):
+                key = ''
+            else:
+                return []
+            node = child
+        return [self.words[word_id] for _, word_id in node.top[:limit]]
+
+
+class DictionaryAutocomplete:
+    """Process-wide PrefixTrie over Dictionary words, kept in sync on commit"""
+
+    def __init__(self):
+        self.trie = None
+        self.built_at = None
+        self.rebuilding = False
+        self.pending = None   # changes committed while a build runs, replayed onto it
+        self.lock = threading.RLock()
+        self.build_lock = threading.RLock()   # one build at a time
+
+    @staticmethod
+    def _payload(word_id, nepali, romanized, english, views):
+        return {
+            'id': word_id,
+            'nepali': nepali,
+            'romanized': romanized,
+            'english': english,
+            'views': views or 0
+        }
+
+    def build(self):
+        """
+        Load every word into a new trie and return it.
+
+        Commits that land while the rows are read are recorded by apply()
+        and replayed onto the new trie before it replaces the old one. If
+        one of them cannot be replayed (a bulk write), the new trie only
+        answers the caller and the next request builds again.
+        """
+        from models import Dictionary
+
+        with self.build_lock:
+            with self.lock:
+                self.pending = []
+            try:
+                rows = db.session.query(
+                    Dictionary.id, Dictionary.nepali, Dictionary.romanized,
+                    Dictionary.english, Dictionary.views
+                ).all()
+                trie = PrefixTrie()
+                for row in rows:
+                    trie.add(row[0], self._payload(*row), refresh=False)
+                trie.refresh_all()
+                with self.lock:
+                    if all(self._apply(trie, change) for change in self.pending):
+                        self.trie = trie
+                        self.built_at = time.monotonic()
+                    return trie
+            finally:
+                with self.lock:
+                    self.pending = None
+
+    def _rebuild_in_background(self, app):
+        def run():
+            with app.app_context():
+                try:
+                    self.build()
+                finally:
+                    self.rebuilding = False
+
+        self.rebuilding = True
+        threading.Thread(target=run, daemon=True).start()
+
+    def complete(self, prefix, limit=MAX_SUGGESTIONS):
+        with self.lock:
+            trie = self.trie
+            stale = trie is not None and time.monotonic() - self.built_at >= TRIE_MAX_AGE
+            if stale and not self.rebuilding:
+                # Keep answering from the old trie while a fresh one loads
+                self._rebuild_in_background(current_app._get_current_object())
+        if trie is None:
+            with self.build_lock:
+                # Another request may have finished a build while this one waited
+                trie = self.trie or self.build()
+        with self.lock:
+            return trie.complete(prefix, min(limit, MAX_SUGGESTIONS))
+
+    def apply(self, change):
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append(change)
+            if self.trie is not None and not self._apply(self.trie, change):
+                # Rebuild lazily
+                self.trie = None
+
+    def _apply(self, trie, change):
+        """Apply one committed change to trie; False if trie can no longer be kept"""
+        if change['op'] == 'bulk':
+            return False
+        if change['op'] == 'delete':
+            trie.remove(change['id'])
+        elif change['op'] == 'insert' or set(INDEXED_FIELDS) & change['changed']:
+            old = trie.words.get(change['id'], {})
+            values = dict(old, **{k: v for k, v in change['values'].items()
+                                  if k in INDEXED_FIELDS or k == 'views'})
+            if any(f not in values for f in INDEXED_FIELDS):
+                # Partially loaded row we never indexed
+                return False
+            trie.add(change['id'], self._payload(
+                change['id'], values['nepali'], values['romanized'],
+                values['english'], values.get('views')
+            ))
+        return True
+
+
+autocomplete = DictionaryAutocomplete()
+
+
+@on_commit
+def _sync_autocomplete(changes):
+    for change in changes:
+        if change['table'] == 'dictionary':
+            autocomplete.apply(change)
@@ -0,0 +1,208 @@
+"""
+Character-trigram substring index for Dictionary, Phrase, Alphabet and video titles
+Serves contains() lookups (e.g. the suffix "हरू") without LIKE '%q%' scans;
+long text columns (video transcripts) are matched in the database instead
+"""
+import os
+import threading
+import time
+import unicodedata
+from database import db
+from model_events import on_commit
+
+# Each worker process keeps its own copy; rebuild periodically so writes
+# made by other workers become visible.
+INDEX_MAX_AGE = int(os.getenv('TRIGRAM_INDEX_MAX_AGE', 300))
+
+# Columns too long to index in every worker (table -> columns). They are
+# searched with a LIKE selecting only the id, stopping at
+# MAX_UNINDEXED_MATCHES rows.
+UNINDEXED_FIELDS = {'video': ('transcript',)}
+MAX_UNINDEXED_MATCHES = int(os.getenv('SEARCH_MAX_UNINDEXED_MATCHES', 200))
+
+# Zero-width (non-)joiners and soft hyphens only affect rendering
+_IGNORED_CHARS = dict.fromkeys(map(ord, '\u200c\u200d\u00ad'))
+
+
+def normalize(text):
+    """
+    Normalize text so equal-looking graphemes compare equal.
+
+    NFC-composes vowel signs and nukta forms, drops zero-width joiners and
+    case-folds the Latin fields.
+    """
+    if not text:
+        return ''
+    return unicodedata.normalize('NFC', text).translate(_IGNORED_CHARS).casefold()
+
+
+def trigrams(text):
+    """Distinct character trigrams of already-normalized text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """In-memory trigram posting lists for the text columns of one model"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.documents = {}   # row id -> tuple of normalized field values
+        self.postings = {}    # trigram -> set of row ids
+        self.length_totals = [0] * len(fields)
+        self.built_at = None
+        self.lock = threading.RLock()
+
+    @property
+    def table_name(self):
+        return self.model.__table__.name
+
+    def invalidate(self):
+        with self.lock:
+            self.built_at = None
+
+    def build(self):
+        """(Re)load every row's indexed columns from the database"""
+        columns = [self.model.id] + [getattr(self.model, f) for f in self.fields]
+        rows = db.session.query(*columns).all()
+        with self.lock:
+            self.documents = {}
+            self.postings = {}
+            self.length_totals = [0] * len(self.fields)
+            for row in rows:
+                self._add(row[0], row[1:])
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        with self.lock:
+            fresh = self.built_at is not None and time.monotonic() - self.built_at < INDEX_MAX_AGE
+        if not fresh:
+            self.build()
+
+    def _add(self, row_id, values):
+        document = tuple(normalize(v) for v in values)
+        self.documents[row_id] = document
+        for i, value in enumerate(document):
+            self.length_totals[i] += len(value)
+            for gram in trigrams(value):
+                self.postings.setdefault(gram, set()).add(row_id)
+
+    def _remove(self, row_id):
+        document = self.documents.pop(row_id, None)
+        if document is None:
+            return
+        for i, value in enumerate(document):
+            self.length_totals[i] -= len(value)
+            for gram in trigrams(value):
+                ids = self.postings.get(gram)
+                if ids is not None:
+                    ids.discard(row_id)
+                    if not ids:
+                        del self.postings[gram]
+
+    def average_lengths(self):
+        """Mean normalized length of each indexed field"""
+        count = len(self.documents) or 1
+        return {field: total / count for field, total in zip(self.fields, self.length_totals)}
+
+    def apply(self, change):
+        """Apply one model_events change to the posting lists"""
+        with self.lock:
+            if self.built_at is None:
+                return
+            if change['op'] == 'bulk':
+                self.built_at = None
+            elif change['op'] == 'delete':
+                self._remove(change['id'])
+            elif change['op'] == 'insert' or set(self.fields) & change['changed']:
+                old = self.documents.get(change['id'])
+                values = change['values']
+                if any(f not in values for f in self.fields) and old is None:
+                    # Partially loaded row we never indexed; resync lazily
+                    self.built_at = None
+                    return
+                merged = [values[f] if f in values else old[i] for i, f in enumerate(self.fields)]
+                self._remove(change['id'])
+                self._add(change['id'], merged)
+
+    def search(self, q):
+        """
+        Return ids of rows where any indexed field contains q, ascending.
+
+        Candidate rows come from intersecting the posting lists of the
+        query's trigrams (smallest first); a final substring check removes
+        rows whose trigrams match but not contiguously.
+        """
+        needle = normalize(q.strip())
+        if not needle:
+            return []
+        self.ensure_built()
+
+        with self.lock:
+            grams = trigrams(needle)
+            if grams:
+                posting_lists = sorted((self.postings.get(g, set()) for g in grams), key=len)
+                candidates = set(posting_lists[0])
+                for ids in posting_lists[1:]:
+                    if not candidates:
+                        break
+                    candidates &= ids
+            else:
+                # Queries shorter than a trigram are checked against every document
+                candidates = self.documents.keys()
+
+            return sorted(
+                row_id for row_id in candidates
+                if any(needle in value for value in self.documents[row_id])
+            )
+
+
+_indexes = {}
+
+
+def get_index(model):
+    """Return the shared trigram index for Dictionary, Phrase, Alphabet or Video"""
+    from models import Dictionary, Phrase, Alphabet, Video
+
+    if not _indexes:
+        for index in (TrigramIndex(Dictionary, ('nepali', 'romanized', 'english')),
+                      TrigramIndex(Phrase, ('nepali', 'romanized', 'english')),
+                      TrigramIndex(Alphabet, ('devanagari', 'romanized', 'sound')),
+                      # Transcripts are matched in the database (UNINDEXED_FIELDS)
+                      TrigramIndex(Video, ('title',))):
+            _indexes[index.table_name] = index
+    return _indexes[model.__table__.name]
+
+
+def contains_ids(model, q):
+    """Ids of model rows whose indexed text contains q"""
+    return get_index(model).search(q)
+
+
+def unindexed_matches(model, q):
+    """
+    {id: (field, ...)} for rows of model whose UNINDEXED_FIELDS contain q,
+    at most MAX_UNINDEXED_MATCHES rows
+    """
+    needle = normalize(q.strip())
+    fields = UNINDEXED_FIELDS.get(model.__table__.name, ())
+    if not needle or not fields:
+        return {}
+    pattern = '%' + needle.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    matches = {}
+    for field in fields:
+        column = getattr(model, field)
+        query = (db.session.query(model.id)
+                 .filter(db.func.lower(column).like(pattern, escape='\\'))
+                 .limit(MAX_UNINDEXED_MATCHES))
+        for (row_id,) in query:
+            matches[row_id] = matches.get(row_id, ()) + (field,)
+    return matches
+
+
+@on_commit
+def _sync_indexes(changes):
+    for change in changes:
+        index = _indexes.get(change['table'])
+        if index is not None:
+            index.apply(change)
@@ -0,0 +1,107 @@
+"""
+Per-table version counters and conditional GET (ETag / 304) support
+Versions live in the database so every worker process agrees on them
+"""
+import zlib
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import select, update
+from model_events import on_flush
+
+# Tables whose list/detail responses carry ETags
+VERSIONED_TABLES = {'dictionary', 'phrase', 'video'}
+
+# Updates touching only these columns keep the version (and ETags) unchanged;
+# counters are written in batches outside the ORM anyway (see counters.py)
+_COUNTER_COLUMNS = {'views', 'view_count', 'downloads', 'updated_at'}
+
+
+def current_version(table_name):
+    """One primary-key lookup; 0 for a table that was never written"""
+    from database import db
+    from models import TableVersion
+
+    version = db.session.execute(
+        select(TableVersion.version).where(TableVersion.table_name == table_name)
+    ).scalar()
+    return version or 0
+
+
+def make_etag(table_name, version):
+    """
+    ETag value for a table version, scoped to the request URL.
+
+    Sent as a weak ETag: view and download counts in the body change
+    without a version bump (see _COUNTER_COLUMNS), so the same tag does
+    not promise byte-identical content.
+    """
+    url = zlib.crc32(request.full_path.encode()) & 0xffffffff
+    return f'{table_name}-{version}-{url:08x}'
+
+
+def conditional(table_name, on_not_modified=None):
+    """
+    Decorator adding ETags to a view's GET responses.
+
+    The table version is read before the view runs; a matching
+    If-None-Match returns 304 without calling the view at all.
+
+    Args:
+        table_name: Table whose version the response depends on
+        on_not_modified: Optional callback(**view_args) run for 304s,
+            e.g. to still count a view; returning False (the row does
+            not exist) runs the view instead, so it can return a 404
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            etag = make_etag(table_name, current_version(table_name))
+            if request.if_none_match.contains_weak(etag) and (
+                    on_not_modified is None or on_not_modified(**kwargs) is not False):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def _insert_missing(conn, name):
+    """Create the version row for name unless another process just did"""
+    from models import TableVersion
+
+    row = {'table_name': name, 'version': 0}
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        conn.execute(insert(TableVersion).on_conflict_do_nothing(), row)
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        conn.execute(insert(TableVersion).on_conflict_do_nothing(), row)
+    else:
+        conn.execute(TableVersion.__table__.insert(), row)
+
+
+@on_flush
+def _bump_versions(session, changes):
+    """Increment the versions of changed tables inside the writing transaction"""
+    from models import TableVersion
+
+    names = {c['table'] for c in changes
+             if c['table'] in VERSIONED_TABLES
+             and (c['op'] != 'update' or c['changed'] - _COUNTER_COLUMNS)}
+    conn = session.connection() if names else None
+    for name in sorted(names):
+        bump = (update(TableVersion)
+                .where(TableVersion.table_name == name)
+                .values(version=TableVersion.version + 1))
+        if not conn.execute(bump).rowcount:
+            _insert_missing(conn, name)
+            conn.execute(bump)
@@ -0,0 +1,41 @@
+"""
+Shared pytest setup: run from backend/ with `python -m pytest tests`
+The app runs against a throwaway SQLite database with rate limits off
+"""
+import os
+import sys
+import tempfile
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read when app.py and bulk_jobs.py are imported, so set before any test imports them
+_TMP = tempfile.mkdtemp(prefix='nepali-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_TMP, 'test.db')
+os.environ['BULK_JOB_DIR'] = _TMP
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app, limiter, initialize_data
+    from database import db
+
+    app.config['TESTING'] = True
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+        initialize_data()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    response = client.post('/auth/login', json={'username': 'admin', 'password': 'Admin@123456789'})
+    assert response.status_code == 200, response.get_json()
+    return client
@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+from search_trie import autocomplete, PrefixTrie
+
+
+@pytest.fixture
+def paused_build(monkeypatch):
+    """Make the next build wait after reading rows until released"""
+    started, release = threading.Event(), threading.Event()
+    refresh_all = PrefixTrie.refresh_all
+
+    def slow_refresh_all(trie):
+        started.set()
+        assert release.wait(5)
+        refresh_all(trie)
+
+    monkeypatch.setattr(PrefixTrie, 'refresh_all', slow_refresh_all)
+    return started, release
+
+
+def build_in_thread(app):
+    def run():
+        with app.app_context():
+            autocomplete.build()
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def completions(app, prefix):
+    with app.app_context():
+        return [w['nepali'] for w in autocomplete.complete(prefix)]
+
+
+def test_commits_during_rebuild_are_replayed(app, paused_build):
+    from database import db
+    from models import Dictionary
+
+    started, release = paused_build
+    with app.app_context():
+        kept = Dictionary(nepali='स्वतःपूर्ति', romanized='acsyncrename', english='x', category='ac')
+        gone = Dictionary(nepali='स्वतःमेटाउ', romanized='acsyncdelete', english='x', category='ac')
+        db.session.add_all([kept, gone])
+        db.session.commit()
+        kept_id, gone_id = kept.id, gone.id
+
+    thread = build_in_thread(app)
+    assert started.wait(5)
+    with app.app_context():
+        db.session.add(Dictionary(nepali='स्वतःनयाँ', romanized='acsyncnew', english='x', category='ac'))
+        db.session.get(Dictionary, kept_id).romanized = 'acsyncrenamed'
+        db.session.delete(db.session.get(Dictionary, gone_id))
+        db.session.commit()
+    release.set()
+    thread.join(5)
+
+    assert completions(app, 'acsyncnew') == ['स्वतःनयाँ']
+    assert completions(app, 'acsyncrenamed') == ['स्वतःपूर्ति']
+    assert completions(app, 'acsyncdelete') == []
+
+
+def test_bulk_write_during_rebuild_discards_it(app, paused_build):
+    started, release = paused_build
+    completions(app, 'a')
+    thread = build_in_thread(app)
+    assert started.wait(5)
+    autocomplete.apply({'table': 'dictionary', 'op': 'bulk', 'id': None})
+    release.set()
+    thread.join(5)
+    assert autocomplete.trie is None
+
+
+def test_cold_start_builds_once(app, monkeypatch):
+    builds = []
+    refresh_all = PrefixTrie.refresh_all
+
+    def counted_refresh_all(trie):
+        builds.append(trie)
+        time.sleep(0.05)  # let the other requests arrive mid-build
+        refresh_all(trie)
+
+    monkeypatch.setattr(PrefixTrie, 'refresh_all', counted_refresh_all)
+    autocomplete.trie = None
+    threads = [threading.Thread(target=completions, args=(app, 'na')) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(builds) == 1
@@ -0,0 +1,215 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from werkzeug.datastructures import FileStorage
+from bulk_jobs import JobRunner, job_status, recover_jobs, UPLOAD_DIR, UPLOAD_PREFIX, WORKERS
+
+
+def upload(text='nepali\nघर\n'):
+    return FileStorage(io.BytesIO(text.encode()), filename='words.csv')
+
+
+def status_of(app, job_id):
+    from database import db
+    from models import BulkJob
+
+    with app.app_context():
+        return job_status(db.session.get(BulkJob, job_id))
+
+
+def wait_for(app, job_id, *statuses, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = status_of(app, job_id)
+        if status['status'] in statuses or time.monotonic() > deadline:
+            return status
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def runner(app):
+    runner = JobRunner()
+    runner.init_app(app)
+    yield runner
+    runner.shutdown(timeout=1)
+
+
+def submit(app, runner, work, text='nepali\nघर\n'):
+    with app.app_context():
+        job = runner.submit(upload(text), work, resource_type='dictionary', mode='insert')
+        return job.id, runner.active[job.id]
+
+
+def read_all(stream, progress):
+    rows = len(list(stream)) - 1
+    progress.add(rows, {'error_count': 0, 'errors': []})
+    return {'success': True, 'added': rows}
+
+
+def blocked_until(event):
+    """Work that waits for event, stopping early if cancelled or shut down"""
+    def work(stream, progress):
+        while not event.wait(0.01):
+            if progress.cancelled():
+                return {'cancelled': True}
+        progress.add(1, {'error_count': 0, 'errors': []})
+        return {'cancelled': True} if progress.cancelled() else {'success': True}
+    return work
+
+
+def test_job_runs_to_done(app, runner):
+    job_id, path = submit(app, runner, read_all, 'nepali\nघर\nपानी\n')
+    status = wait_for(app, job_id, 'done', 'failed')
+    assert status['status'] == 'done'
+    assert status['result'] == {'success': True, 'added': 2}
+    assert status['rows_processed'] == 2
+    assert status['bytes_read'] == status['bytes_total'] and status['percent'] == 100.0
+    assert status['started_at'] and status['finished_at']
+    assert not os.path.exists(path)
+    assert job_id not in runner.active
+
+
+def test_failing_job(app, runner):
+    def work(stream, progress):
+        raise RuntimeError('bad file')
+
+    job_id, path = submit(app, runner, work)
+    status = wait_for(app, job_id, 'done', 'failed')
+    assert (status['status'], status['error']) == ('failed', 'bad file')
+    assert not os.path.exists(path)
+
+
+def test_cancel_queued_job(app, runner):
+    release = threading.Event()
+    blockers = [submit(app, runner, blocked_until(release))[0] for _ in range(WORKERS)]
+    for job_id in blockers:
+        assert wait_for(app, job_id, 'running')['status'] == 'running'
+
+    ran = []
+    job_id, path = submit(app, runner, lambda stream, progress: ran.append(True) or {})
+    assert status_of(app, job_id)['status'] == 'queued'
+    with app.app_context():
+        assert runner.cancel(job_id)
+    release.set()
+
+    for blocker in blockers:
+        assert wait_for(app, blocker, 'done')['status'] == 'done'
+    assert status_of(app, job_id)['status'] == 'cancelled'
+    assert not ran
+    assert not os.path.exists(path)
+    with app.app_context():
+        assert not runner.cancel(job_id)
+
+
+def test_cancel_running_job(app, runner):
+    release = threading.Event()
+    job_id, _ = submit(app, runner, blocked_until(release))
+    assert wait_for(app, job_id, 'running')['status'] == 'running'
+    with app.app_context():
+        assert runner.cancel(job_id)
+    assert status_of(app, job_id)['cancel_requested']
+    release.set()
+
+    status = wait_for(app, job_id, 'cancelled', 'done', 'failed')
+    assert status['status'] == 'cancelled'
+    with app.app_context():
+        assert not runner.cancel(job_id)
+
+
+def test_shutdown_fails_unfinished_jobs(app, runner):
+    never = threading.Event()
+    running = [submit(app, runner, blocked_until(never)) for _ in range(WORKERS)]
+    for job_id, _ in running:
+        assert wait_for(app, job_id, 'running')['status'] == 'running'
+    queued = submit(app, runner, read_all)
+
+    runner.shutdown(timeout=5)
+    for job_id, path in running + [queued]:
+        status = status_of(app, job_id)
+        assert status['status'] == 'failed'
+        assert status['error'].startswith('Interrupted')
+        assert not os.path.exists(path)
+    assert runner.active == {}
+
+
+def test_shutdown_timeout_keeps_job_failed(app, runner):
+    release = threading.Event()
+
+    def stubborn(stream, progress):
+        release.wait(5)
+        return {'success': True}
+
+    job_id, path = submit(app, runner, stubborn)
+    assert wait_for(app, job_id, 'running')['status'] == 'running'
+    runner.shutdown(timeout=0.05)
+    assert status_of(app, job_id)['status'] == 'failed'
+    assert not os.path.exists(path)
+
+    # The import finishing late must not overwrite the failure
+    release.set()
+    for thread in runner.threads:
+        thread.join(5)
+    assert status_of(app, job_id)['status'] == 'failed'
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    return process.pid
+
+
+def test_recover_jobs(app):
+    from database import db
+    from models import BulkJob
+
+    host, dead = socket.gethostname(), dead_pid()
+    with app.app_context():
+        jobs = {
+            'crashed': BulkJob(resource_type='dictionary', status='running', owner=f'{host}:{dead}'),
+            'crashed_queued': BulkJob(resource_type='dictionary', status='queued', owner=f'{host}:{dead}'),
+            'other_host': BulkJob(resource_type='dictionary', status='running', owner=f'elsewhere-{host}:{dead}'),
+            'live': BulkJob(resource_type='dictionary', status='running', owner=f'{host}:{os.getppid()}'),
+            'finished': BulkJob(resource_type='dictionary', status='done', owner=f'{host}:{dead}'),
+        }
+        db.session.add_all(jobs.values())
+        db.session.commit()
+        ids = {name: job.id for name, job in jobs.items()}
+
+    orphan = os.path.join(UPLOAD_DIR, f'{UPLOAD_PREFIX}{dead}-orphan.csv')
+    kept = os.path.join(UPLOAD_DIR, f'{UPLOAD_PREFIX}{os.getppid()}-live.csv')
+    for path in (orphan, kept):
+        open(path, 'w').close()
+
+    with app.app_context():
+        recover_jobs()
+    statuses = {name: status_of(app, job_id)['status'] for name, job_id in ids.items()}
+    assert statuses == {'crashed': 'failed', 'crashed_queued': 'failed', 'other_host': 'running',
+                        'live': 'running', 'finished': 'done'}
+    assert not os.path.exists(orphan)
+    assert os.path.exists(kept)
+    os.remove(kept)
+
+
+def test_background_upload_api(app, admin_client):
+    response = admin_client.post('/api/bulk/dictionary', content_type='multipart/form-data', data={
+        'file': (io.BytesIO('nepali,romanized,english,category\nजङ्गल,jangal,forest,nature\n'.encode()), 'w.csv'),
+        'background': 'true'})
+    assert response.status_code == 202
+    job = response.get_json()
+    status_url = job['status_url']
+    assert response.headers['Location'] == status_url
+
+    deadline = time.monotonic() + 10
+    while job['status'] in ('queued', 'running') and time.monotonic() < deadline:
+        time.sleep(0.01)
+        job = admin_client.get(status_url).get_json()
+    assert job['status'] == 'done'
+    assert job['result']['added'] == 1
+
+    assert admin_client.post(f'{status_url}/cancel').status_code == 409
+    assert admin_client.get('/api/bulk/jobs/missing').status_code == 404
@@ -0,0 +1,54 @@
+import pytest
+from pagination import encode_cursor, decode_cursor
+
+ORDER_INDEXES = [None, 3, 1, None, 2, 2, 2, 5, None, 1, 4]
+
+
+@pytest.fixture(scope='module')
+def word_ids(app):
+    """Ids of words in category keyset, in (order_index NULLs first, id) order"""
+    from database import db
+    from models import Dictionary
+
+    with app.app_context():
+        words = [Dictionary(nepali=f'शब्द{n}', romanized=f'shabda{n}', english=f'word {n}',
+                            category='keyset', order_index=order_index)
+                 for n, order_index in enumerate(ORDER_INDEXES)]
+        db.session.add_all(words)
+        db.session.commit()
+        ordered = sorted(words, key=lambda w: (w.order_index is not None, w.order_index or 0, w.id))
+        return [w.id for w in ordered]
+
+
+@pytest.mark.parametrize('order_value, row_id', [(None, 1), (0, 7), (42, 123456), (-3, 2)])
+def test_cursor_round_trip(order_value, row_id):
+    cursor = encode_cursor(order_value, row_id)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (order_value, row_id)
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-a-cursor', encode_cursor('a', 1), encode_cursor(1, None),
+                                    encode_cursor(1.5, 2)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize('per_page', [1, 3, 4, len(ORDER_INDEXES), 50])
+def test_cursor_walk_visits_every_row_once(client, word_ids, per_page):
+    seen, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/api/dictionary/category/keyset',
+                              query_string={'cursor': cursor, 'per_page': per_page})
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body['words']) <= per_page
+        assert body['total'] == len(ORDER_INDEXES)
+        seen += [w['id'] for w in body['words']]
+        cursor = body['next_cursor']
+    assert seen == word_ids
+
+
+def test_invalid_cursor_is_a_bad_request(client):
+    response = client.get('/api/dictionary/category/keyset', query_string={'cursor': 'bogus'})
+    assert response.status_code == 400
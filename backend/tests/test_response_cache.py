@@ -0,0 +1,62 @@
+from response_cache import ResponseCache, LRUBackend
+
+
+def key_for(app, cache, query_string, view_args=None):
+    with app.test_request_context('/', query_string=query_string):
+        return cache.key('view', view_args or {})
+
+
+def test_key_ignores_argument_order(app):
+    cache = ResponseCache(LRUBackend())
+    assert key_for(app, cache, 'a=1&b=2') == key_for(app, cache, 'b=2&a=1')
+
+
+def test_key_uses_raw_values(app):
+    cache = ResponseCache(LRUBackend())
+    plain = key_for(app, cache, '')
+    assert key_for(app, cache, 'type=%20') != plain
+    assert key_for(app, cache, 'type=') != plain
+    assert key_for(app, cache, 'q=ghar') != key_for(app, cache, 'q=ghar%20')
+
+
+def test_key_keeps_repeated_arguments(app):
+    cache = ResponseCache(LRUBackend())
+    assert key_for(app, cache, 'tag=a&tag=b') != key_for(app, cache, 'tag=a')
+    assert key_for(app, cache, 'tag=a&tag=b') == key_for(app, cache, 'tag=b&tag=a')
+
+
+def test_key_includes_view_args_and_generation(app):
+    cache = ResponseCache(LRUBackend())
+    assert key_for(app, cache, '', {'id': 1}) != key_for(app, cache, '', {'id': 2})
+    before = key_for(app, cache, '')
+    cache.invalidate('view')
+    assert key_for(app, cache, '') != before
+
+
+def test_commit_invalidates_dependent_views(app):
+    cache = ResponseCache(LRUBackend())
+    cache.dependencies = {'words': {'dictionary': {'category'}}, 'letters': {'alphabet': None}}
+    cache.apply([{'table': 'dictionary', 'op': 'update', 'id': 1, 'changed': {'views'}}])
+    assert cache.generations == {}
+    cache.apply([{'table': 'dictionary', 'op': 'update', 'id': 1, 'changed': {'category'}}])
+    assert cache.generations == {'words': 1}
+    cache.apply([{'table': 'alphabet', 'op': 'insert', 'id': 2, 'changed': set()}])
+    assert cache.generations == {'words': 1, 'letters': 1}
+
+
+def test_cached_view_serves_raw_argument_variants_separately(app):
+    from flask import request
+
+    cache = ResponseCache(LRUBackend())
+    calls = []
+
+    @cache.cached()
+    def view():
+        calls.append(request.args.get('type'))
+        return {'type': request.args.get('type')}
+
+    for query_string in ('', 'type=%20', '', 'type=%20'):
+        with app.test_request_context('/', query_string=query_string):
+            response = view()
+    assert response.get_json() == {'type': ' '}
+    assert calls == [None, ' ']
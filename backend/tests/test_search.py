@@ -0,0 +1,46 @@
+import pytest
+
+
+@pytest.fixture(scope='module')
+def videos(app):
+    from database import db
+    from models import Video
+
+    with app.app_context():
+        rows = {
+            'title': Video(title='Zebracrossing lesson', youtube_id='srch-title'),
+            'transcript': Video(title='Street words', youtube_id='srch-transcript',
+                                transcript='Today we learn how to say ZEBRACROSSING in Nepali'),
+            'percent': Video(title='Numbers', youtube_id='srch-percent', transcript='fifty % off'),
+        }
+        db.session.add_all(rows.values())
+        db.session.commit()
+        return {name: video.id for name, video in rows.items()}
+
+
+def global_search(client, q):
+    response = client.get('/api/dictionary/global-search', query_string={'q': q})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_transcript_matches_rank_below_title_matches(client, videos):
+    body = global_search(client, 'zebracrossing')
+    assert [v['id'] for v in body['videos']] == [videos['title'], videos['transcript']]
+    assert body['counts']['videos'] == 2
+    assert body['videos'][0]['score'] > body['videos'][1]['score']
+
+
+def test_transcript_like_wildcards_are_literal(client, videos):
+    assert [v['id'] for v in global_search(client, '% o')['videos']] == [videos['percent']]
+    assert global_search(client, '_f')['videos'] == []
+
+
+def test_transcript_match_follows_updates(app, client, videos):
+    from database import db
+    from models import Video
+
+    with app.app_context():
+        db.session.get(Video, videos['transcript']).transcript = 'Nothing to see'
+        db.session.commit()
+    assert [v['id'] for v in global_search(client, 'zebracrossing')['videos']] == [videos['title']]
@@ -0,0 +1,76 @@
+import pytest
+from transliteration import romanize, transliterate
+
+# (nepali, romanized) pairs from resources/ and the seed data in app.py
+DICTIONARY_ENTRIES = [
+    ('नमस्ते', 'namaste'),
+    ('घर', 'ghar'),
+    ('कस्तो छ?', 'kasto chha?'),
+    ('म जानु पर्छ', 'ma jaanu parchha'),
+    ('घाम लागेको छ', 'ghaam laageko chha'),
+    ('फोटो खिच्न मिल्छ?', 'photo khichna milchha?'),
+    ('यहाँ रोक्नुहोस्', 'yahaa roknuhos'),
+]
+
+
+@pytest.mark.parametrize('nepali, romanized', DICTIONARY_ENTRIES)
+def test_romanize_dictionary_entries(nepali, romanized):
+    assert romanize(nepali) == romanized
+
+
+@pytest.mark.parametrize('nepali', ['नमस्ते', 'घर', 'म जानु पर्छ', 'घाम लागेको छ', 'तिम्रो नाम के हो?'])
+def test_round_trip(nepali):
+    assert transliterate(romanize(nepali)) == nepali
+
+
+def test_site_style_is_lowercase():
+    assert romanize('भाषा') == 'bhaashaa'
+    assert romanize('ठूलो') == 'thuulo'
+    assert romanize('कृपया') == 'kripayaa'
+    assert romanize('स्वागतम्') == 'swaagatam'
+    assert romanize('तपाईंको') == 'tapaaiiko'
+
+
+def test_unmapped_devanagari_is_folded_or_dropped():
+    assert romanize('ज़िन्दगी') == 'jindagii'
+    assert romanize('फ़ोन ०१२') == 'phon 012'
+    assert romanize('ॐ') == 'om'
+    assert romanize('सोऽहम्') == 'soham'
+    assert not any('ऀ' <= c <= 'ॿ' for c in romanize('क़ ख़ ग़ ड़ ढ़ य़ ॅ ॉ ॲ'))
+
+
+@pytest.mark.parametrize('romanized, nepali', [
+    ('Ram', 'रम'),
+    ('Hamro', 'हम्रो'),
+    ('Mero naam Raam ho', 'मेरो नाम राम हो'),
+    ('Dhanyabad', 'धन्यबद'),
+    ('Namaste, timro naam ke ho?', 'नमस्ते, तिम्रो नाम के हो?'),
+    ('Aama ra Buwa', 'आम र बुव'),
+    ('(Sita) Thamel', '(सित) थमेल'),
+])
+def test_sentence_case_reads_as_lowercase(romanized, nepali):
+    assert transliterate(romanized) == nepali
+    assert transliterate(romanized) == transliterate(romanized.lower())
+
+
+@pytest.mark.parametrize('romanized, nepali', [
+    ('ghaNTaa', 'घण्टा'),
+    ('bhaaShaa', 'भाषा'),
+    ('paDhnu', 'पढ्नु'),
+    ('Ghanta ghaNTaa', 'घन्त घण्टा'),
+    ('ṭhuulo', 'ठूलो'),
+])
+def test_capitals_inside_a_word_are_retroflex(romanized, nepali):
+    assert transliterate(romanized) == nepali
+
+
+def test_batch_and_incremental_match_sentence_case():
+    from transliteration import transliterate_many, transliterate_edit
+
+    assert transliterate_many(['Mero naam Raam ho']) == [transliterate('Mero naam Raam ho')]
+    assert transliterate_edit('', 0, 'Mero') == ('Mero', 0, 'मेरो')
+
+
+def test_convert_endpoint_sentence_case(client):
+    response = client.post('/api/transliterator/convert', json={'text': 'Hamro ghar Kathmandu ma chha'})
+    assert response.get_json()['devanagari'] == 'हम्रो घर कथ्मन्दु म छ'
@@ -0,0 +1,78 @@
+import io
+from bulk_import import upsert_rows
+
+
+def word(n, english=None, difficulty=1):
+    return {'nepali': f'अपसर्ट{n}', 'romanized': f'upsert{n}', 'english': english or f'upsert {n}',
+            'category': 'upsert', 'difficulty': difficulty}
+
+
+def test_upsert_rows_counts(app):
+    from models import Dictionary
+
+    with app.app_context():
+        rows = [word(n) for n in range(5)]
+        assert upsert_rows(Dictionary, 'nepali', rows) == (5, 0, 0)
+        assert upsert_rows(Dictionary, 'nepali', rows) == (0, 0, 5)
+
+        rows[1] = word(1, english='changed')
+        rows.append(word(5))
+        assert upsert_rows(Dictionary, 'nepali', rows) == (1, 1, 4)
+        assert Dictionary.query.filter_by(nepali='अपसर्ट1').one().english == 'changed'
+        assert Dictionary.query.filter_by(category='upsert').count() == 6
+
+
+def test_upsert_rows_compares_listed_columns_only(app):
+    from models import Dictionary
+
+    with app.app_context():
+        upsert_rows(Dictionary, 'nepali', [word(10, difficulty=1)])
+        # difficulty is not compared or written
+        assert upsert_rows(Dictionary, 'nepali', [word(10, difficulty=3)], ['nepali', 'english']) == (0, 0, 1)
+        assert upsert_rows(Dictionary, 'nepali', [word(10, english='new')], ['nepali', 'english']) == (0, 1, 0)
+        stored = Dictionary.query.filter_by(nepali='अपसर्ट10').one()
+        assert (stored.english, stored.difficulty) == ('new', 1)
+
+
+def test_upsert_rows_without_rows(app):
+    from models import Dictionary
+
+    with app.app_context():
+        assert upsert_rows(Dictionary, 'nepali', []) == (0, 0, 0)
+
+
+def test_upsert_upload_summary(admin_client):
+    def upload(csv_text):
+        return admin_client.post('/api/bulk/dictionary', content_type='multipart/form-data', data={
+            'file': (io.BytesIO(csv_text.encode()), 'words.csv'), 'mode': 'upsert'}).get_json()
+
+    header = 'nepali,romanized,english,category\n'
+    first = upload(header + 'पहाड,pahaad,hill,nature\nनदी,nadii,river,nature\n')
+    assert (first['added'], first['updated'], first['unchanged']) == (2, 0, 0)
+    second = upload(header + 'पहाड,pahaad,mountain,nature\nनदी,nadii,river,nature\nताल,taal,lake,nature\n')
+    assert (second['added'], second['updated'], second['unchanged']) == (1, 1, 1)
+    assert second['error_count'] == 0
+
+
+def test_upsert_without_romanized_column_fills_every_chunk(app):
+    from bulk_import import read_csv
+    from models import Dictionary
+    from routes.bulk_upload import upload_rows
+    from transliteration import romanize
+
+    with app.app_context():
+        upsert_rows(Dictionary, 'nepali', [
+            {'nepali': 'हिमाल', 'romanized': 'old', 'english': 'snow mountain', 'category': 'kept'},
+            {'nepali': 'खोला', 'romanized': 'old', 'english': 'stream', 'category': 'kept'},
+        ])
+        # Chunks of two rows: the first row of the first chunk has no nepali
+        csv_text = 'nepali,english\n,blank\nहिमाल,snow mountain\nखोला,stream\n'
+        header, chunks = read_csv(io.BytesIO(csv_text.encode()), size=2)
+        summary = upload_rows('dictionary', chunks, mode='upsert', header=header)
+
+        assert (summary['updated'], summary['error_count']) == (2, 1)
+        for nepali in ('हिमाल', 'खोला'):
+            stored = Dictionary.query.filter_by(nepali=nepali).one()
+            assert stored.romanized == romanize(nepali)
+            # Not in the header: stored value kept
+            assert stored.category == 'kept'
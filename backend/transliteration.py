@@ -0,0 +1,281 @@
+"""
+Roman <-> Devanagari transliteration
+Rules are compiled once into a syllable regex; conversion is a single
+left-to-right longest-match pass, linear in the input length
+"""
+import os
+import re
+from functools import lru_cache
+
+HALANT = '्'
+
+MAX_CACHED_SYLLABLES = 10000
+
+# Whole-word conversions kept for batch requests (most words repeat)
+WORD_CACHE_SIZE = int(os.getenv('TRANSLITERATION_WORD_CACHE_SIZE', 50000))
+
+# Consonants without the inherent vowel. Capitals (ITRANS style, inside a
+# word) and IAST letters select the retroflex series; plain t/th/d/dh/n
+# are dental.
+CONSONANTS = {
+    'k': 'क', 'kh': 'ख', 'g': 'ग', 'gh': 'घ', 'ng': 'ङ',
+    'ch': 'च', 'chh': 'छ', 'Ch': 'छ', 'j': 'ज', 'jh': 'झ', 'Ny': 'ञ', 'ñ': 'ञ',
+    'T': 'ट', 'Th': 'ठ', 'D': 'ड', 'Dh': 'ढ', 'N': 'ण',
+    'ṭ': 'ट', 'ṭh': 'ठ', 'ḍ': 'ड', 'ḍh': 'ढ', 'ṇ': 'ण',
+    't': 'त', 'th': 'थ', 'd': 'द', 'dh': 'ध', 'n': 'न',
+    'p': 'प', 'ph': 'फ', 'f': 'फ', 'b': 'ब', 'bh': 'भ', 'm': 'म',
+    'y': 'य', 'r': 'र', 'l': 'ल', 'v': 'व', 'w': 'व',
+    'sh': 'श', 'ś': 'श', 'Sh': 'ष', 'shh': 'ष', 'ṣ': 'ष', 's': 'स', 'h': 'ह',
+    'ksh': 'क्ष', 'x': 'क्ष', 'tr': 'त्र', 'gy': 'ज्ञ',
+}
+
+# Vowels: (independent letter, matra after a consonant)
+VOWELS = {
+    'a': ('अ', ''), 'aa': ('आ', 'ा'), 'A': ('आ', 'ा'),
+    'i': ('इ', 'ि'), 'ii': ('ई', 'ी'), 'ee': ('ई', 'ी'), 'I': ('ई', 'ी'),
+    'u': ('उ', 'ु'), 'uu': ('ऊ', 'ू'), 'oo': ('ऊ', 'ू'), 'U': ('ऊ', 'ू'),
+    'Ri': ('ऋ', 'ृ'), 'ṛ': ('ऋ', 'ृ'),
+    'e': ('ए', 'े'), 'ai': ('ऐ', 'ै'), 'o': ('ओ', 'ो'), 'au': ('औ', 'ौ'),
+}
+
+# Signs written after a syllable
+MODIFIERS = {
+    'M': 'ं',   # anusvara
+    'H': 'ः',   # visarga
+    '~': 'ँ',   # chandrabindu
+    '|': '।', '||': '॥',
+}
+
+# A capital starting a word is sentence or name case ("Mero naam Ram ho"),
+# not an ITRANS key; only capitals inside a word (kaThmaandu) are read as
+# retroflex letters or modifiers
+_WORD_INITIAL_CAPITAL = re.compile(r'\b[A-Z]')
+
+
+def _trie_pattern(keys):
+    """
+    Regex matching the longest of keys, factored by common prefix so each
+    input character is tested once (a compiled trie)
+    """
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def pattern(node):
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # At the end of a key, longer keys are optional and tried first (greedy)
+        return f'(?:{body})?' if '' in node else body
+
+    return pattern(trie)
+
+
+# One syllable per match: a consonant cluster with its optional vowel, an
+# independent vowel, or a modifier. Compiled once at import.
+_SYLLABLE = re.compile(
+    f'(?P<cluster>(?:{_trie_pattern(CONSONANTS)})+)(?P<matra>{_trie_pattern(VOWELS)})?'
+    f'|(?P<vowel>{_trie_pattern(VOWELS)})'
+    f'|(?P<modifier>{_trie_pattern(MODIFIERS)})'
+)
+_CONSONANT_KEY = re.compile(_trie_pattern(CONSONANTS))
+_WHITESPACE = re.compile(r'(\s+)')
+_PENDING_WORD = re.compile(r'\S*\Z')
+
+# Capitals that start no rule of their own read as lowercase
+_FOLD_CAPITALS = str.maketrans({
+    c: c.lower() for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    if not any(key.startswith(c) for key in (*CONSONANTS, *VOWELS, *MODIFIERS))
+})
+
+
+# Converted syllables by matched text; the set of distinct syllables is small
+_syllables = {}
+
+
+def _replace(match):
+    converted = _syllables.get(match.group())
+    if converted is None:
+        cluster, matra, vowel, modifier = match.group('cluster', 'matra', 'vowel', 'modifier')
+        if cluster:
+            converted = HALANT.join(CONSONANTS[k] for k in _CONSONANT_KEY.findall(cluster))
+            converted += VOWELS[matra][1] if matra else ''
+        elif vowel:
+            converted = VOWELS[vowel][0]
+        else:
+            converted = MODIFIERS[modifier]
+        if len(_syllables) < MAX_CACHED_SYLLABLES:
+            _syllables[match.group()] = converted
+    return converted
+
+
+def _lower(match):
+    return match.group().lower()
+
+
+def transliterate(text):
+    """
+    Convert romanized Nepali to Devanagari.
+
+    Consonant clusters are joined with a halant (namaste -> नमस्ते), vowels
+    after a consonant become matras, and a word-final consonant keeps its
+    inherent vowel (ghar -> घर). Anything without a rule passes through.
+    """
+    text = _WORD_INITIAL_CAPITAL.sub(_lower, text).translate(_FOLD_CAPITALS)
+    return _SYLLABLE.sub(_replace, text)
+
+
+# No rule spans whitespace, so a text converts word by word
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def transliterate_word(word):
+    """transliterate() for a single whitespace-free word, memoized (LRU)"""
+    return transliterate(word)
+
+
+def transliterate_many(texts):
+    """Convert each of texts, in order, through the word cache"""
+    results = []
+    for text in texts:
+        parts = _WHITESPACE.split(text)
+        parts[::2] = map(transliterate_word, parts[::2])
+        results.append(''.join(parts))
+    return results
+
+
+def transliterate_edit(pending, delete, insert):
+    """
+    Incremental transliterate() for as-you-type input.
+
+    pending is the text after the last whitespace, the only part whose
+    output can still change. The edit removes delete characters from the
+    end of the text and appends insert. Returns (new pending, number of
+    output characters to remove, output to append); the cost depends on
+    pending and insert only. Raises ValueError if delete reaches before
+    pending.
+    """
+    if delete > len(pending):
+        raise ValueError('Edit reaches before the pending word')
+    segment = pending[:len(pending) - delete] + insert
+    old = transliterate_word(pending)
+    new = transliterate_many([segment])[0]
+    common = len(os.path.commonprefix([old, new]))
+    return segment[_PENDING_WORD.search(segment).start():], len(old) - common, new[common:]
+
+
+# ===== Devanagari -> roman =====
+# Reverse tables derived from the ones above; the first key listed for a
+# letter is the one written (aa for ा, chh for छ), then overridden into the
+# site's own romanization style (resources/complete_alphabet.csv):
+# lowercase, retroflex letters written like dental ones, w for व
+
+def _first_keys(pairs):
+    keys = {}
+    for key, value in pairs:
+        keys.setdefault(value, key)
+    return keys
+
+
+_ROMAN_CONSONANTS = _first_keys(CONSONANTS.items())
+_ROMAN_VOWELS = _first_keys((k, v[0]) for k, v in VOWELS.items())
+_ROMAN_MATRAS = _first_keys((k, v[1]) for k, v in VOWELS.items() if v[1])
+_ROMAN_MODIFIERS = _first_keys(MODIFIERS.items())
+# Dandas read better as full stops in romanized text
+_ROMAN_MODIFIERS.update({'।': '.', '॥': '.'})
+
+_ROMAN_CONSONANTS.update({
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'ञ': 'ny', 'व': 'w', 'ष': 'sh',
+})
+_ROMAN_VOWELS['ऋ'] = _ROMAN_MATRAS['ृ'] = 'ri'
+# Chandrabindu only nasalizes the vowel and is not written (कहाँ -> kahaa);
+# neither is anusvara after a vowel other than a (भेटौंला -> bhetaulaa)
+_ROMAN_MODIFIERS.update({'ं': 'm', 'ः': 'h', 'ँ': ''})
+_ANUSVARA = 'ं'
+
+# Before matching: nukta letters (क़, ज़, ड़...) become their base letter,
+# digits become ASCII. Devanagari left unmatched afterwards is dropped.
+_ROMAN_FOLD = {ord('़'): None, ord('ऽ'): None, ord('ॐ'): 'om', ord('\u200c'): None, ord('\u200d'): None}
+_ROMAN_FOLD.update(zip(range(0x0958, 0x0960), 'कखगजडढफय'))
+_ROMAN_FOLD.update({0x0966 + n: str(n) for n in range(10)})
+_UNMAPPED_DEVANAGARI = re.compile('[\u0900-\u097f]')
+
+_DEVANAGARI_SYLLABLE = (
+    f'(?P<consonant>{_trie_pattern(_ROMAN_CONSONANTS)})'
+    f'(?P<sign>{HALANT}|{_trie_pattern(_ROMAN_MATRAS)})?'
+    f'|(?P<vowel>{_trie_pattern(_ROMAN_VOWELS)})'
+    f'|(?P<modifier>{_trie_pattern(_ROMAN_MODIFIERS)})'
+)
+_DEVANAGARI_LETTER = re.compile(_DEVANAGARI_SYLLABLE)
+# A run of letters, i.e. one word; punctuation and spaces pass through
+_DEVANAGARI_WORD = re.compile(f'(?:{_DEVANAGARI_SYLLABLE})+')
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def romanize_word(word):
+    """
+    Romanize one run of Devanagari letters, memoized (LRU).
+
+    The inherent a is written except at the end of a word of two or more
+    syllables that ends in a single consonant (घर -> ghar, म -> ma,
+    धन्य -> dhanya), matching how transliterate() reads it back.
+    """
+    parts = []
+    syllables = 0
+    bare = False    # last part is a consonant with its inherent a
+    joined = False  # previous consonant carried a halant
+    cluster = False
+    for letter in _DEVANAGARI_LETTER.finditer(word):
+        consonant, sign, vowel, modifier = letter.group('consonant', 'sign', 'vowel', 'modifier')
+        if consonant:
+            key = _ROMAN_CONSONANTS[consonant]
+            if sign == HALANT:
+                parts.append(key)
+                bare, joined = False, True
+                continue
+            cluster = joined or HALANT in consonant
+            parts.append(key + (_ROMAN_MATRAS[sign] if sign else 'a'))
+            bare = not sign
+            syllables += 1
+        elif vowel:
+            parts.append(_ROMAN_VOWELS[vowel])
+            bare = False
+            syllables += 1
+        else:
+            if modifier != _ANUSVARA or (parts and parts[-1][-1:] == 'a' and parts[-1][-2:] != 'aa'):
+                parts.append(_ROMAN_MODIFIERS[modifier])
+            bare = False
+        joined = False
+    if bare and syllables > 1 and not cluster:
+        parts[-1] = parts[-1][:-1]
+    return ''.join(parts)
+
+
+def _romanize_match(match):
+    return romanize_word(match.group())
+
+
+def romanize(text):
+    """
+    Convert Devanagari to the site's lowercase romanization (नमस्ते ->
+    namaste). transliterate() reads it back, except that retroflex letters
+    come back dental and chandrabindu is lost.
+    """
+    text = _DEVANAGARI_WORD.sub(_romanize_match, text.translate(_ROMAN_FOLD))
+    return _UNMAPPED_DEVANAGARI.sub('', text)
+
+
+def romanize_many(texts):
+    """Romanize each of texts, in order; repeated words hit the word cache"""
+    return [romanize(text) for text in texts]
+
+
+def rules():
+    """Rule tables for display: independent vowels and consonant + a syllables"""
+    return {
+        'vowels': {k: v[0] for k, v in VOWELS.items()},
+        'consonants': {k + 'a': v for k, v in CONSONANTS.items()},
+    }
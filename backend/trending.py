@@ -0,0 +1,216 @@
+"""
+Streaming trending rankings
+Time-decayed Space-Saving counters fed by view events, served from memory
+"""
+import heapq
+import math
+import os
+import threading
+import time
+from counters import counters
+from model_events import on_commit
+from projection import fetch_rows
+
+# Rows tracked per table and window; the top of each summary is accurate
+# as long as the requested limit is well below this
+CAPACITY = int(os.getenv('TRENDING_CAPACITY', 200))
+
+# Half-life of a view per window (None = lifetime counts, no decay)
+WINDOWS = {
+    '24h': 24 * 3600,
+    '7d': 7 * 24 * 3600,
+    'all': None,
+}
+DEFAULT_WINDOW = 'all'
+
+# Renormalize stored weights before 2 ** exponent gets large
+_MAX_EXPONENT = 64
+
+
+class DecayedSpaceSaving:
+    """
+    Space-Saving heavy hitters with forward exponential decay.
+
+    A view at time t adds 2 ** ((t - landmark) / half_life), so older
+    views weigh exponentially less without touching stored counts on
+    every tick. At most `capacity` keys are kept; a new key evicts the
+    smallest one and inherits its count as overestimation error.
+
+    The smallest key is found with a min-heap of (weight, key). Weights
+    only grow, so a changed key is pushed again and its older entries are
+    skipped when they reach the top; the heap is rebuilt once stale
+    entries outnumber live ones. Eviction is O(log capacity) amortized.
+    """
+
+    def __init__(self, capacity, half_life=None):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.landmark = time.time()
+        self.counts = {}   # key -> [weight, error]
+        self.heap = []     # (weight, key), including stale entries
+        self.lock = threading.Lock()
+
+    def _weight(self, now):
+        if self.half_life is None:
+            return 1.0
+        exponent = (now - self.landmark) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            scale = 2.0 ** -exponent
+            for entry in self.counts.values():
+                entry[0] *= scale
+                entry[1] *= scale
+            self._rebuild_heap()
+            self.landmark = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def add(self, key, amount=1, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            weight = self._weight(now) * amount
+            entry = self.counts.get(key)
+            if entry is not None:
+                entry[0] += weight
+            elif len(self.counts) < self.capacity:
+                entry = self.counts[key] = [weight, 0.0]
+            else:
+                floor = self.counts.pop(self._pop_smallest())[0]
+                entry = self.counts[key] = [floor + weight, floor]
+            heapq.heappush(self.heap, (entry[0], key))
+            if len(self.heap) > 2 * self.capacity:
+                self._rebuild_heap()
+
+    def _pop_smallest(self):
+        """Remove and return the key with the smallest weight from the heap"""
+        while True:
+            weight, key = heapq.heappop(self.heap)
+            entry = self.counts.get(key)
+            if entry is not None and entry[0] == weight:
+                return key
+
+    def _rebuild_heap(self):
+        self.heap = [(entry[0], key) for key, entry in self.counts.items()]
+        heapq.heapify(self.heap)
+
+    def discard(self, key):
+        with self.lock:
+            self.counts.pop(key, None)
+
+    def top(self, limit, now=None):
+        """Return [(key, decayed score)] for the heaviest keys, best first"""
+        now = time.time() if now is None else now
+        with self.lock:
+            items = sorted(self.counts.items(), key=lambda kv: (-kv[1][0], kv[0]))[:limit]
+            if self.half_life is None:
+                decay = 1.0
+            else:
+                decay = math.pow(2.0, -(now - self.landmark) / self.half_life)
+        return [(key, entry[0] * decay) for key, entry in items]
+
+
+class TrendingTracker:
+    """Decayed view summaries of one counter column, one per window"""
+
+    def __init__(self, model, column):
+        self.model = model
+        self.column = column
+        self.windows = {name: DecayedSpaceSaving(CAPACITY, half_life)
+                        for name, half_life in WINDOWS.items()}
+        self.seeded = False
+        self.lock = threading.Lock()
+
+    def ensure_seeded(self):
+        """Load lifetime counts of the most viewed rows once, for the 'all' window"""
+        if self.seeded:
+            return
+        with self.lock:
+            if self.seeded:
+                return
+            counter = getattr(self.model, self.column)
+            rows = (self.model.query.with_entities(self.model.id, counter)
+                    .filter(counter > 0)
+                    .order_by(counter.desc())
+                    .limit(CAPACITY)
+                    .all())
+            summary = self.windows['all']
+            for row_id, count in rows:
+                summary.add(row_id, count)
+            self.seeded = True
+
+    def record(self, row_id, amount=1):
+        for summary in self.windows.values():
+            summary.add(row_id, amount)
+
+    def discard(self, row_id):
+        for summary in self.windows.values():
+            summary.discard(row_id)
+
+    def top(self, window, limit):
+        """
+        Return [(id, score)] for window, best first.
+
+        Windows with fewer than `limit` recent views are topped up from the
+        lifetime ranking (score 0) so a fresh process still answers.
+        """
+        self.ensure_seeded()
+        ranked = self.windows[window].top(limit)
+        if len(ranked) < limit and window != 'all':
+            seen = {row_id for row_id, _ in ranked}
+            ranked += [(row_id, 0.0) for row_id, _ in self.windows['all'].top(limit * 2)
+                       if row_id not in seen][:limit - len(ranked)]
+        return ranked
+
+
+_trackers = {}
+
+
+def get_tracker(model):
+    return _trackers[model.__table__.name]
+
+
+def register(model, column):
+    _trackers[model.__table__.name] = TrendingTracker(model, column)
+
+
+def trending(model, window, limit=10, columns=None):
+    """
+    Rows of model trending in window, best first (projected to columns, if given).
+
+    Returns:
+        list of (row, score)
+
+    Raises:
+        ValueError: If window is not one of WINDOWS
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Invalid window. Must be one of: {', '.join(WINDOWS)}")
+
+    # A few spare candidates cover rows deleted behind the tracker's back
+    ranked = get_tracker(model).top(window, limit + 5)
+    rows = fetch_rows(model, [r[0] for r in ranked], columns)
+    return [(rows[row_id], round(score, 4)) for row_id, score in ranked if row_id in rows][:limit]
+
+
+def _setup():
+    from models import Dictionary, Video
+    register(Dictionary, 'views')
+    register(Video, 'view_count')
+
+
+_setup()
+
+
+@counters.on_increment
+def _record_view(model, row_id, column, amount):
+    tracker = _trackers.get(model.__table__.name)
+    if tracker is not None and tracker.column == column:
+        tracker.ensure_seeded()
+        tracker.record(row_id, amount)
+
+
+@on_commit
+def _drop_deleted(changes):
+    for change in changes:
+        tracker = _trackers.get(change['table'])
+        if tracker is not None and change['op'] == 'delete':
+            tracker.discard(change['id'])
@@ -19,16 +19,28 @@ DANGEROUS_PATTERNS = [
     r'expression\(',
 ]
 
+# Test data and leftovers of injection attempts. Only the cleanup script
+# rejects these; they are too broad for user input ("test" in "fastest").
+JUNK_PATTERNS = [
+    r'aaaa',
+    r'test',
+    r'\'">',
+]
+
+def _alternation(patterns):
+    return '|'.join(f'(?:{pattern})' for pattern in patterns)
+
+# Each pattern list compiled into one regex, so a string is scanned once
+_DANGEROUS = re.compile(_alternation(DANGEROUS_PATTERNS))
+_DANGEROUS_OR_JUNK = re.compile(
+    f'(?P<dangerous>{_alternation(DANGEROUS_PATTERNS)})|(?P<junk>{_alternation(JUNK_PATTERNS)})'
+)
+
 def contains_xss(text):
     """Check if text contains XSS attack patterns"""
     if not text:
         return False
-    
-    text_lower = text.lower()
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, text_lower):
-            return True
-    return False
+    return _DANGEROUS.search(text.lower()) is not None
 
 def is_suspiciously_long(text, max_length=1000):
     """Check if text is suspiciously long"""
@@ -48,6 +60,33 @@ def is_repetitive_junk(text, min_unique_chars=3):
     
     return False
 
+def _text_error(text, field_name, required, max_length, scanner):
+    """Error message for one field value, or None if it is valid"""
+    # Check if empty
+    if not text or not text.strip():
+        if required:
+            return f"{field_name} is required"
+        return None
+    
+    text = text.strip()
+    
+    # Check for XSS (and, for cleanup, junk) patterns
+    match = scanner.search(text.lower())
+    if match:
+        if match.lastgroup == 'junk':
+            return f"{field_name} looks like test or junk data"
+        return f"{field_name} contains potentially dangerous content"
+    
+    # Check length
+    if max_length is not None and len(text) > max_length:
+        return f"{field_name} is too long (maximum {max_length} characters)"
+    
+    # Check for repetitive junk
+    if len(text) > 50 and is_repetitive_junk(text):
+        return f"{field_name} appears to be invalid (repetitive characters)"
+    
+    return None
+
 def validate_text_input(text, field_name, required=True, max_length=500):
     """
     Validate text input for security and quality
@@ -61,98 +100,82 @@ def validate_text_input(text, field_name, required=True, max_length=500):
     Returns:
         tuple: (is_valid, error_message)
     """
-    # Check if empty
-    if not text or not text.strip():
-        if required:
-            return False, f"{field_name} is required"
-        return True, None
-    
-    text = text.strip()
-    
-    # Check for XSS patterns
-    if contains_xss(text):
-        return False, f"{field_name} contains potentially dangerous content"
+    error = _text_error(text, field_name, required, max_length, _DANGEROUS)
+    return error is None, error
+
+class Schema:
+    """
+    Field rules for validate_many()
     
-    # Check length
-    if len(text) > max_length:
-        return False, f"{field_name} is too long (maximum {max_length} characters)"
+    Args:
+        fields: (field, label, required, max_length) tuples, in the order
+            errors are reported; max_length None means no limit
+        junk: Also reject JUNK_PATTERNS (for cleaning stored data)
+    """
     
-    # Check for repetitive junk
-    if is_repetitive_junk(text):
-        return False, f"{field_name} appears to be invalid (repetitive characters)"
+    def __init__(self, fields, junk=False):
+        self.fields = tuple(fields)
+        self.scanner = _DANGEROUS_OR_JUNK if junk else _DANGEROUS
+
+def validate_many(rows, schema):
+    """
+    Validate a batch of rows (dicts or other mappings) against a Schema
     
-    return True, None
+    Returns:
+        list: one list of error messages per row, in order (empty if valid)
+    """
+    fields = schema.fields
+    scanner = schema.scanner
+    results = []
+    for row in rows:
+        errors = []
+        for field, label, required, max_length in fields:
+            error = _text_error(row.get(field), label, required, max_length, scanner)
+            if error:
+                errors.append(error)
+        results.append(errors)
+    return results
+
+DICTIONARY_SCHEMA = Schema([
+    ('nepali', 'Nepali word', True, 200),
+    ('english', 'English translation', True, 200),
+    ('romanized', 'Romanized', False, 200),
+    ('usage_example', 'Usage example', False, 500),
+    ('nepali_example', 'Nepali example', False, 500),
+])
+
+PHRASE_SCHEMA = Schema([
+    ('nepali', 'Nepali phrase', True, 300),
+    ('english', 'English translation', True, 300),
+    ('romanized', 'Romanized', False, 300),
+])
+
+ALPHABET_SCHEMA = Schema([
+    ('devanagari', 'Devanagari character', True, 10),
+    ('romanized', 'Romanization', True, 50),
+    ('sound', 'Sound', False, 50),
+])
+
+VIDEO_SCHEMA = Schema([
+    ('title', 'Title', True, 300),
+    ('description', 'Description', False, 2000),
+])
 
 def validate_dictionary_entry(data):
     """Validate dictionary entry data"""
-    errors = []
-    
-    # Validate nepali
-    valid, error = validate_text_input(data.get('nepali'), 'Nepali word', required=True, max_length=200)
-    if not valid:
-        errors.append(error)
-    
-    # Validate english
-    valid, error = validate_text_input(data.get('english'), 'English translation', required=True, max_length=200)
-    if not valid:
-        errors.append(error)
-    
-    # Validate romanized (optional)
-    if data.get('romanized'):
-        valid, error = validate_text_input(data.get('romanized'), 'Romanized', required=False, max_length=200)
-        if not valid:
-            errors.append(error)
-    
-    # Validate examples (optional)
-    if data.get('usage_example'):
-        valid, error = validate_text_input(data.get('usage_example'), 'Usage example', required=False, max_length=500)
-        if not valid:
-            errors.append(error)
-    
-    if data.get('nepali_example'):
-        valid, error = validate_text_input(data.get('nepali_example'), 'Nepali example', required=False, max_length=500)
-        if not valid:
-            errors.append(error)
-    
-    return errors
+    return validate_many([data], DICTIONARY_SCHEMA)[0]
 
 def validate_phrase(data):
     """Validate phrase data"""
-    errors = []
-    
-    valid, error = validate_text_input(data.get('nepali'), 'Nepali phrase', required=True, max_length=300)
-    if not valid:
-        errors.append(error)
-    
-    valid, error = validate_text_input(data.get('english'), 'English translation', required=True, max_length=300)
-    if not valid:
-        errors.append(error)
-    
-    if data.get('romanized'):
-        valid, error = validate_text_input(data.get('romanized'), 'Romanized', required=False, max_length=300)
-        if not valid:
-            errors.append(error)
-    
-    return errors
+    return validate_many([data], PHRASE_SCHEMA)[0]
 
 def validate_alphabet(data):
     """Validate alphabet/letter data"""
-    errors = []
-    
-    valid, error = validate_text_input(data.get('devanagari'), 'Devanagari character', required=True, max_length=10)
-    if not valid:
-        errors.append(error)
-    
-    valid, error = validate_text_input(data.get('romanized'), 'Romanization', required=True, max_length=50)
-    if not valid:
-        errors.append(error)
-    
-    if data.get('sound'):
-        valid, error = validate_text_input(data.get('sound'), 'Sound', required=False, max_length=50)
-        if not valid:
-            errors.append(error)
-    
-    return errors
+    return validate_many([data], ALPHABET_SCHEMA)[0]
+
+def validate_video(data):
+    """Validate video data"""
+    return validate_many([data], VIDEO_SCHEMA)[0]
 
 def validation_error_response(errors):
     """Create a standardized error response for validation errors"""
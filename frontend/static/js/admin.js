@@ -64,7 +64,7 @@ function setupNavigation() {
 // Load Phrases
 async function loadPhrases() {
     try {
-        const response = await fetch(`${API_BASE_URL}/phrases`);
+        const response = await fetch(`${API_BASE_URL}/phrases/?format=array`);
         phrases = await response.json();
         renderPhrasesTable();
         updatePhraseCategories();
@@ -711,8 +711,9 @@ async function validateBeforeUpload(type) {
         if (response.ok) {
             displayValidationResults(type, data, validationDiv);
             
-            // Enable upload button if there are valid entries
-            if (data.valid_count > 0) {
+            // Enable upload button if there are valid entries (or entries to update)
+            const upsert = document.getElementById(`${type}-upsert`)?.checked;
+            if (data.valid_count > 0 || (upsert && data.duplicate_count > 0)) {
                 uploadBtn.disabled = false;
             }
         } else {
@@ -749,7 +750,7 @@ function displayValidationResults(type, data, div) {
     // Show duplicates
     if (data.duplicates.length > 0) {
         html += '<div class="validation-details">';
-        html += `<h4>⚠️ Duplicates Found (${data.duplicates.length}):</h4>`;
+        html += `<h4>⚠️ Duplicates Found (${data.duplicate_count}):</h4>`;
         
         const showCount = Math.min(data.duplicates.length, 3);
         for (let i = 0; i < showCount; i++) {
@@ -762,8 +763,8 @@ function displayValidationResults(type, data, div) {
             }
             html += `</div>`;
         }
-        if (data.duplicates.length > showCount) {
-            html += `<p style="font-size: 12px; color: #666;">... and ${data.duplicates.length - showCount} more duplicates</p>`;
+        if (data.duplicate_count > showCount) {
+            html += `<p style="font-size: 12px; color: #666;">... and ${data.duplicate_count - showCount} more duplicates</p>`;
         }
         html += '</div>';
     }
@@ -771,7 +772,7 @@ function displayValidationResults(type, data, div) {
     // Show errors
     if (data.errors.length > 0) {
         html += '<div class="validation-details">';
-        html += `<h4>❌ Errors Found (${data.errors.length}):</h4>`;
+        html += `<h4>❌ Errors Found (${data.error_count}):</h4>`;
         
         const showCount = Math.min(data.errors.length, 3);
         for (let i = 0; i < showCount; i++) {
@@ -780,8 +781,8 @@ function displayValidationResults(type, data, div) {
             html += `<strong>Row ${err.row}:</strong> ${err.reason}`;
             html += `</div>`;
         }
-        if (data.errors.length > showCount) {
-            html += `<p style="font-size: 12px; color: #666;">... and ${data.errors.length - showCount} more errors</p>`;
+        if (data.error_count > showCount) {
+            html += `<p style="font-size: 12px; color: #666;">... and ${data.error_count - showCount} more errors</p>`;
         }
         html += '</div>';
     }
@@ -814,6 +815,10 @@ async function uploadCSV(type) {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('skip_duplicates', 'true');
+    formData.append('background', 'true');
+    if (document.getElementById(`${type}-upsert`)?.checked) {
+        formData.append('mode', 'upsert');
+    }
     
     try {
         const response = await fetch(`/api/bulk/${type}`, {
@@ -821,21 +826,28 @@ async function uploadCSV(type) {
             body: formData
         });
         
-        const data = await response.json();
+        let data = await response.json();
+        if (response.status === 202) {
+            // Imported by a background job; follow its progress
+            data = await waitForUploadJob(data.status_url, resultDiv);
+        }
         
         if (data.success) {
             let message = `<strong>✅ Upload Successful!</strong><br>`;
             message += `Added: <strong>${data.added}</strong> new entries<br>`;
+            if (data.mode === 'upsert') {
+                message += `Updated: <strong>${data.updated}</strong>, unchanged: <strong>${data.unchanged}</strong><br>`;
+            }
             if (data.skipped > 0) {
                 message += `Skipped: <strong>${data.skipped}</strong> duplicates<br>`;
             }
-            if (data.errors.length > 0) {
-                message += `<br><strong>⚠️ ${data.errors.length} errors occurred:</strong><br>`;
+            if (data.error_count > 0) {
+                message += `<br><strong>⚠️ ${data.error_count} errors occurred:</strong><br>`;
                 for (let i = 0; i < Math.min(data.errors.length, 3); i++) {
                     message += `• ${data.errors[i]}<br>`;
                 }
-                if (data.errors.length > 3) {
-                    message += `... and ${data.errors.length - 3} more`;
+                if (data.error_count > 3) {
+                    message += `... and ${data.error_count - 3} more`;
                 }
             }
             showUploadResult(resultDiv, message, 'success');
@@ -851,6 +863,39 @@ async function uploadCSV(type) {
     }
 }
 
+// Poll a background upload job until it finishes; resolves to the upload summary
+async function waitForUploadJob(statusUrl, resultDiv) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+        if (!response.ok) {
+            return { error: job.error };
+        }
+        if (job.status === 'done') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            return { error: job.error };
+        }
+        if (job.status === 'cancelled') {
+            return { error: `Upload cancelled after ${job.rows_processed} rows` };
+        }
+        
+        let message = `⏳ Importing... ${job.rows_processed} rows`;
+        if (job.percent !== null) {
+            message += ` (${job.percent}%)`;
+        }
+        if (job.rows_per_second) {
+            message += `, ${job.rows_per_second} rows/s`;
+        }
+        if (job.eta_seconds !== null) {
+            message += `, about ${Math.ceil(job.eta_seconds)}s left`;
+        }
+        resultDiv.innerHTML = message;
+    }
+}
+
 function showUploadResult(div, message, type) {
     div.className = `upload-result ${type}`;
     div.innerHTML = message;
@@ -1496,6 +1541,20 @@ document.getElementById('global-search-input')?.addEventListener('input', deboun
             html += '</div></div>';
         }
         
+        // Video results
+        if (data.videos && data.videos.length > 0) {
+            html += `<div style="margin-top: 1rem;">
+                <h4>🎬 Videos (${data.videos.length})</h4>
+                <div style="max-height: 200px; overflow-y: auto;">`;
+            data.videos.forEach(item => {
+                html += `<div style="padding: 0.5rem; border-bottom: 1px solid #eee;">
+                    <strong>${escapeHtml(item.title)}</strong>
+                    <span style="color: #888; font-size: 0.9rem;">${escapeHtml(item.category || '')}</span>
+                </div>`;
+            });
+            html += '</div></div>';
+        }
+        
         resultsDiv.innerHTML = html;
     } catch (error) {
         console.error('Error searching:', error);
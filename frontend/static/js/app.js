@@ -73,7 +73,7 @@ function setupEventListeners() {
     const romanInput = document.getElementById('roman-input');
     
     convertBtn.addEventListener('click', convertText);
-    romanInput.addEventListener('input', debounce(convertText, 500));
+    romanInput.addEventListener('input', debounce(convertText, 150));
 
     // Phrases
     document.getElementById('category-filter').addEventListener('change', function() {
@@ -135,7 +135,7 @@ async function loadAlphabet() {
 
 async function loadPhrases() {
     try {
-        const response = await fetch(`${API_BASE_URL}/phrases/`);
+        const response = await fetch(`${API_BASE_URL}/phrases/?format=array`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -167,26 +167,70 @@ async function loadTransliteratorRules() {
     }
 }
 
+// As-you-type conversion state: only the edit since the last request is sent
+// (see /transliterator/convert-incremental). Lengths are in code points.
+const transliteration = { state: null, roman: [], output: [], busy: false, queued: false };
+
+function postIncremental(body) {
+    return fetch(`${API_BASE_URL}/transliterator/convert-incremental`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(body),
+    });
+}
+
 async function convertText() {
-    const text = document.getElementById('roman-input').value;
-    if (!text) {
-        document.getElementById('devanagari-output').textContent = '';
+    // One request at a time; each state token follows from the previous one
+    if (transliteration.busy) {
+        transliteration.queued = true;
+        return;
+    }
+    const roman = Array.from(document.getElementById('roman-input').value);
+    const previous = transliteration.roman;
+
+    let common = 0;
+    while (common < previous.length && common < roman.length && previous[common] === roman[common]) {
+        common++;
+    }
+    if (transliteration.state !== null && common === previous.length && common === roman.length) {
         return;
     }
 
+    transliteration.busy = true;
     try {
-        const response = await fetch(`${API_BASE_URL}/transliterator/convert`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ text: text }),
-        });
-        
+        let output = transliteration.output;
+        let response = null;
+        if (transliteration.state !== null) {
+            response = await postIncremental({
+                state: transliteration.state,
+                delete: previous.length - common,
+                insert: roman.slice(common).join(''),
+            });
+        }
+        if (!response || response.status === 409) {
+            // First request, or the edit reaches text the state no longer covers
+            output = [];
+            response = await postIncremental({ text: roman.join('') });
+        }
         const result = await response.json();
-        document.getElementById('devanagari-output').textContent = result.devanagari;
+        if (!response.ok) {
+            throw new Error(result.error);
+        }
+
+        output = output.slice(0, output.length - result.delete).concat(Array.from(result.insert));
+        Object.assign(transliteration, { state: result.state, roman: roman, output: output });
+        document.getElementById('devanagari-output').textContent = output.join('');
     } catch (error) {
+        transliteration.state = null;
         console.error('Error converting text:', error);
+    } finally {
+        transliteration.busy = false;
+        if (transliteration.queued) {
+            transliteration.queued = false;
+            convertText();
+        }
     }
 }
 